@@ -1,7 +1,9 @@
 import operator
 import os
 import posixpath
+import threading
 import time
+from contextlib import contextmanager
 from subprocess import PIPE, Popen
 
 import paramiko
@@ -31,6 +33,46 @@ class DataAccess:
         """
         raise NotImplementedError
 
+    @contextmanager
+    def open_to(self, to_dir, file_name):
+        """Open a file for writing in the data store, without going through a local
+        copy. Data is written in a temporary file which is renamed once closed
+        without error.
+
+        :param str to_dir: data store directory to write the file in.
+        :param str file_name: name of the file in the data store.
+        :return: (*contextlib._GeneratorContextManager*) -- context manager
+            yielding a binary file handle.
+        :raises OSError: if the file already exists or cannot be renamed.
+        """
+        self._check_filename(file_name)
+        to_path = posixpath.join(self.root, to_dir, file_name)
+        tmp_path = to_path + ".tmp"
+        _, _, stderr = self.makedir(to_dir)
+        stderr.readlines()
+        self._check_file_exists(to_path, should_exist=False)
+
+        print(f"--> Writing {to_path}")
+        try:
+            with self._open(tmp_path) as f:
+                yield f
+            _, _, stderr = self.execute_command(f"mv {tmp_path} {to_path}")
+            if len(stderr.readlines()) != 0:
+                raise OSError(f"Failed to rename {tmp_path} to {to_path}")
+        except BaseException:
+            _, _, stderr = self.remove(tmp_path, force=True)
+            stderr.readlines()
+            raise
+
+    def _open(self, path):
+        """Open a file for writing in the data store.
+
+        :param str path: full path to the file.
+        :return: (*contextlib._GeneratorContextManager*) -- context manager
+            yielding a binary file handle.
+        """
+        raise NotImplementedError
+
     def copy(self, src, dest, recursive=False, update=False):
         """Wrapper around cp command which creates dest path if needed
 
@@ -39,7 +81,8 @@ class DataAccess:
         :param bool recursive: create directories recursively
         :param bool update: only copy if needed
         """
-        self.makedir(posixpath.dirname(dest))
+        _, _, stderr = self.makedir(posixpath.dirname(dest))
+        stderr.readlines()
         command = CommandBuilder.copy(src, dest, recursive, update)
         return self.execute_command(command)
 
@@ -53,6 +96,17 @@ class DataAccess:
         command = CommandBuilder.remove(target, recursive, force)
         return self.execute_command(command)
 
+    def file_exists(self, relative_path):
+        """Checks if a file exists in the data store, without any side effect on
+        the local machine.
+
+        :param str relative_path: path to the file, relative to the root.
+        :return: (*bool*) -- whether the file exists.
+        """
+        filepath = posixpath.join(self.root, relative_path)
+        _, _, stderr = self.execute_command(CommandBuilder.list(filepath))
+        return len(stderr.readlines()) == 0
+
     def _check_file_exists(self, filepath, should_exist=True):
         """Check that file exists (or not) at the given path
 
@@ -122,6 +176,7 @@ class LocalDataAccess(DataAccess):
         :param str file_name: file name to copy.
         :param str to_dir: data store directory to copy file to.
         :param str change_name_to: new name for file when copied to data store.
+        :raises IOError: if the file cannot be copied.
         """
         self._check_filename(file_name)
         src = posixpath.join(server_setup.LOCAL_DIR, file_name)
@@ -129,8 +184,20 @@ class LocalDataAccess(DataAccess):
         dest = posixpath.join(self.root, to_dir, file_name)
         print(f"--> Moving file {src} to {dest}")
         self._check_file_exists(dest, should_exist=False)
-        self.copy(src, dest)
-        self.remove(src)
+        # commands run asynchronously, wait for the copy before removing the source
+        _, _, stderr = self.copy(src, dest)
+        if len(stderr.readlines()) != 0:
+            raise IOError(f"Failed to copy {src} to {dest}")
+        _, _, stderr = self.remove(src)
+        stderr.readlines()
+
+    def _open(self, path):
+        """Open a file for writing in the data store.
+
+        :param str path: full path to the file.
+        :return: (*io.BufferedWriter*) -- binary file handle.
+        """
+        return open(path, "wb")
 
     def execute_command(self, command):
         """Execute a command locally at the data access.
@@ -162,30 +229,35 @@ class SSHDataAccess(DataAccess):
     def __init__(self, root=None):
         """Constructor"""
         self._ssh = None
+        self._lock = threading.Lock()
         self._retry_after = 5
         self.root = server_setup.DATA_ROOT_DIR if root is None else root
         self.local_root = server_setup.LOCAL_DIR
 
     @property
     def ssh(self):
-        """Get or create the ssh connection object, with attempts rate limited.
+        """Get or create the ssh connection object, with attempts rate limited. The
+        connection is shared by all the threads using this object.
 
         :raises IOError: if connection failed or still within retry window
         :return: (*paramiko.SSHClient*) -- the client instance
         """
-        should_attempt = time.time() - SSHDataAccess._last_attempt > self._retry_after
+        with self._lock:
+            should_attempt = (
+                time.time() - SSHDataAccess._last_attempt > self._retry_after
+            )
 
-        if self._ssh is None:
-            if should_attempt:
-                try:
-                    self._setup_server_connection()
-                    return self._ssh
-                except:  # noqa
-                    SSHDataAccess._last_attempt = time.time()
-            msg = f"Could not connect to server, will try again after {self._retry_after} seconds"
-            raise IOError(msg)
+            if self._ssh is None:
+                if should_attempt:
+                    try:
+                        self._setup_server_connection()
+                        return self._ssh
+                    except:  # noqa
+                        SSHDataAccess._last_attempt = time.time()
+                msg = f"Could not connect to server, will try again after {self._retry_after} seconds"
+                raise IOError(msg)
 
-        return self._ssh
+            return self._ssh
 
     def _setup_server_connection(self):
         """This function setup the connection to the server."""
@@ -264,6 +336,20 @@ class SSHDataAccess(DataAccess):
         print(f"--> Deleting {from_path} on local machine")
         os.remove(from_path)
 
+    @contextmanager
+    def _open(self, path):
+        """Open a file for writing in the data store, via SFTP.
+
+        :param str path: full path to the file.
+        :return: (*contextlib._GeneratorContextManager*) -- context manager
+            yielding a binary file handle.
+        """
+        with self.ssh.open_sftp() as sftp:
+            with sftp.open(path, "wb") as f:
+                # do not wait for the server to acknowledge each write
+                f.set_pipelined(True)
+                yield f
+
     def execute_command(self, command):
         """Execute a command locally at the data access.
 
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from powersimdata.data_access.data_access import LocalDataAccess
+
+
+def test_open_to(tmp_path):
+    data_access = LocalDataAccess(root=str(tmp_path))
+    with data_access.open_to("tmp/scenario_1", "demand.csv") as f:
+        f.write(b"UTC,301\n")
+    path = tmp_path / "tmp" / "scenario_1" / "demand.csv"
+    assert path.read_bytes() == b"UTC,301\n"
+
+    with pytest.raises(OSError, match="already exists"):
+        with data_access.open_to("tmp/scenario_1", "demand.csv") as f:
+            f.write(b"")
+
+
+def test_open_to_removes_partial_file(tmp_path):
+    data_access = LocalDataAccess(root=str(tmp_path))
+    with pytest.raises(ValueError):
+        with data_access.open_to("tmp", "wind.csv") as f:
+            f.write(b"UTC")
+            raise ValueError("Unable to format profile")
+    assert os.listdir(tmp_path / "tmp") == []
+
+
+def test_file_exists(tmp_path):
+    data_access = LocalDataAccess(root=str(tmp_path))
+    os.makedirs(tmp_path / "output")
+    (tmp_path / "output" / "header.pkl").write_bytes(b"")
+    assert data_access.file_exists("output/header.pkl")
+    assert not data_access.file_exists("output/chunked/header.pkl")
+    assert not os.path.exists(tmp_path / "output" / "chunked")
@@ -1,5 +1,3 @@
-import copy
-
 import numpy as np
 import pandas as pd
 
@@ -22,9 +20,8 @@ def linearize_gencost(input_grid, num_segments=1):
     """
 
     # Access the generator cost and plant information components
-    grid = copy.deepcopy(input_grid)
-    gencost_before = grid.gencost["before"]
-    plant = grid.plant
+    gencost_before = input_grid.gencost["before"]
+    plant = input_grid.plant
 
     # Raise errors if the provided cost curves are not in a form that can be handled
     if len(gencost_before[gencost_before.type != 2]):
@@ -58,7 +55,7 @@ def linearize_gencost(input_grid, num_segments=1):
             gencost_after.loc[dispatchable_gens, x_label] = x_data[dispatchable_gens]
             gencost_after.loc[dispatchable_gens, y_label] = y_data[dispatchable_gens]
     else:
-        grid.gencost["after"] = gencost_before.copy()
+        gencost_after = gencost_before.copy()
 
     # Convert non-dispatchable gens to fixed values
     nondispatchable_gens = ~dispatchable_gens
@@ -99,9 +96,6 @@ def get_supply_data(grid, num_segments=1, save=None):
     if not isinstance(grid, Grid):
         raise TypeError("A Grid object must be input.")
 
-    # Obtain a copy of the Grid object
-    grid = copy.deepcopy(grid)
-
     # Access the generator cost and plant information data
     gencost_df = linearize_gencost(grid, num_segments)
     plant_df = grid.plant
@@ -417,9 +411,6 @@ def plot_c1_vs_c2(
     if not isinstance(grid, Grid):
         raise TypeError("A Grid object must be input.")
 
-    # Obtain a copy of the Grid object
-    grid = copy.deepcopy(grid)
-
     # Access the generator cost and plant information data
     gencost_df = grid.gencost["before"]
     plant_df = grid.plant
@@ -30,10 +30,12 @@ def calculate_ac_inv_costs(scenario, sum_results=True, exclude_branches=None):
     grid = scenario.state.get_grid()
 
     # find upgraded AC lines
-    grid_new = cp.deepcopy(grid)
+    grid_new = cp.copy(grid)
     # Reindex so that we don't get NaN when calculating upgrades for new branches
     base_grid.branch = base_grid.branch.reindex(grid_new.branch.index).fillna(0)
-    grid_new.branch.rateA = grid.branch.rateA - base_grid.branch.rateA
+    grid_new.branch = grid.branch.assign(
+        rateA=grid.branch.rateA - base_grid.branch.rateA
+    )
     grid_new.branch = grid_new.branch[grid_new.branch.rateA != 0.0]
     if exclude_branches is not None:
         present_exclude_branches = set(exclude_branches) & set(grid_new.branch.index)
@@ -218,11 +220,11 @@ def calculate_dc_inv_costs(scenario, sum_results=True):
     base_grid = Grid(scenario.info["interconnect"].split("_"))
     grid = scenario.state.get_grid()
 
-    grid_new = cp.deepcopy(grid)
+    grid_new = cp.copy(grid)
     # Reindex so that we don't get NaN when calculating upgrades for new DC lines
     base_grid.dcline = base_grid.dcline.reindex(grid_new.dcline.index).fillna(0)
     # find upgraded DC lines
-    grid_new.dcline.Pmax = grid.dcline.Pmax - base_grid.dcline.Pmax
+    grid_new.dcline = grid.dcline.assign(Pmax=grid.dcline.Pmax - base_grid.dcline.Pmax)
     grid_new.dcline = grid_new.dcline[grid_new.dcline.Pmax != 0.0]
 
     costs = _calculate_dc_inv_costs(grid_new, sum_results)
@@ -295,19 +297,22 @@ def calculate_gen_inv_costs(scenario, year, cost_case, sum_results=True):
     grid = scenario.state.get_grid()
 
     # Find change in generation capacity
-    grid_new = cp.deepcopy(grid)
+    grid_new = cp.copy(grid)
     # Reindex so that we don't get NaN when calculating upgrades for new generators
     base_grid.plant = base_grid.plant.reindex(grid_new.plant.index).fillna(0)
-    grid_new.plant.Pmax = grid.plant.Pmax - base_grid.plant.Pmax
+    grid_new.plant = grid.plant.assign(Pmax=grid.plant.Pmax - base_grid.plant.Pmax)
     # Find change in storage capacity
     # Reindex so that we don't get NaN when calculating upgrades for new storage
     base_grid.storage["gen"] = base_grid.storage["gen"].reindex(
         grid_new.storage["gen"].index, fill_value=0
     )
-    grid_new.storage["gen"].Pmax = (
-        grid.storage["gen"].Pmax - base_grid.storage["gen"].Pmax
+    grid_new.storage = dict(
+        grid.storage,
+        gen=grid.storage["gen"].assign(
+            Pmax=grid.storage["gen"].Pmax - base_grid.storage["gen"].Pmax,
+            type="storage",
+        ),
     )
-    grid_new.storage["gen"]["type"] = "storage"
 
     # Drop small changes
     grid_new.plant = grid_new.plant[grid_new.plant.Pmax > 0.01]
@@ -9,6 +9,7 @@ from powersimdata.design.transmission.upgrade import (
     _find_capacity_at_bus,
     _find_first_degree_branches,
     _find_stub_degree,
+    _get_cong_quantile,
     _identify_mesh_branch_upgrades,
     _increment_branch_scaling,
     get_branches_by_area,
@@ -319,6 +320,25 @@ class TestIdentifyMesh(unittest.TestCase):
             )
 
 
+class TestIdentifyMeshSparse(TestIdentifyMesh):
+    def setUp(self):
+        # Same congestion, loaded as data frames with sparse columns
+        super().setUp()
+        state = self.mock_scenario.state
+        state.congu = state.congu.astype(pd.SparseDtype("float", 0))
+        state.congl = state.congl.astype(pd.SparseDtype("float", 0))
+
+    def test_cong_quantile_matches_dense(self):
+        state = self.mock_scenario.state
+        dense = state.congu.sparse.to_dense() + state.congl.sparse.to_dense()
+        for quantile in [0, 0.5, 0.87, 0.95, 1]:
+            pd.testing.assert_series_equal(
+                _get_cong_quantile(state.congu, state.congl, quantile),
+                dense.quantile(quantile),
+                check_names=False,
+            )
+
+
 class TestConstructCompositeAllowlist(unittest.TestCase):
     def test_none_none(self):
         branch_list = mock_branch["branch_id"].copy()
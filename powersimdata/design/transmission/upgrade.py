@@ -1,7 +1,12 @@
+import numpy as np
 import pandas as pd
 
 from powersimdata.input.grid import Grid
 from powersimdata.network.usa_tamu.usa_tamu_model import area_to_loadzone
+from powersimdata.output.chunked_store import (
+    has_single_sparse_dtype,
+    to_csc_matrix,
+)
 from powersimdata.utility.distance import haversine
 
 
@@ -231,6 +236,57 @@ def scale_congested_mesh_branches(
     )
 
 
+def _get_cong_quantile(congu, congl, quantile):
+    """Calculates quantile of the sum of upper and lower congestion duals of each
+    branch. Data frames with sparse columns are summed and ranked via a sparse
+    matrix, such that the duals are never densified.
+
+    :param pandas.DataFrame congu: upper congestion duals (hour x branch).
+    :param pandas.DataFrame congl: lower congestion duals (hour x branch).
+    :param float quantile: the quantile to calculate, between 0 and 1.
+    :return: (*pandas.Series*) -- quantile value, indexed by branch id.
+    """
+    is_sparse = [has_single_sparse_dtype(c) for c in [congu, congl]]
+    if len(congu.columns) == 0 or not all(is_sparse):
+        return (congu + congl).quantile(quantile)
+
+    if not congl.columns.equals(congu.columns):
+        congl = congl[congu.columns]
+    cong_abs = to_csc_matrix(congu) + to_csc_matrix(congl)
+    n_hour, n_branch = cong_abs.shape
+    n_value = np.diff(cong_abs.indptr)
+    cumulative_negative = np.concatenate([[0], np.cumsum(cong_abs.data < 0)])
+    n_negative = np.diff(cumulative_negative[cong_abs.indptr])
+    n_zero = n_hour - n_value
+
+    # the sorted values of a column are its negative values, its zeros, then its
+    # positive values. Only columns whose quantile is not zero are sorted.
+    rank = (n_hour - 1) * quantile
+    lower, upper = int(np.floor(rank)), int(np.ceil(rank))
+    sorted_columns = (lower < n_negative) | (upper >= n_negative + n_zero)
+    cong_sorted = cong_abs[:, sorted_columns]
+    column = np.repeat(np.arange(cong_sorted.shape[1]), np.diff(cong_sorted.indptr))
+    values = cong_sorted.data[np.lexsort((cong_sorted.data, column))]
+
+    n_negative, n_zero = n_negative[sorted_columns], n_zero[sorted_columns]
+
+    def get_ranked(r):
+        ranked = np.zeros(len(n_zero))
+        position = cong_sorted.indptr[:-1] + r
+        negative, positive = r < n_negative, r >= n_negative + n_zero
+        ranked[negative] = values[position[negative]]
+        ranked[positive] = values[position[positive] - n_zero[positive]]
+        return ranked
+
+    # linear interpolation between the closest ranks, as in pandas
+    lower_value, upper_value = get_ranked(lower), get_ranked(upper)
+    quantile_cong_abs = np.zeros(n_branch)
+    quantile_cong_abs[sorted_columns] = lower_value + (upper_value - lower_value) * (
+        rank - lower
+    )
+    return pd.Series(quantile_cong_abs, index=congu.columns)
+
+
 def _identify_mesh_branch_upgrades(
     ref_scenario,
     upgrade_n=100,
@@ -266,17 +322,17 @@ def _identify_mesh_branch_upgrades(
         allowed_list = ", ".join(allowed_methods)
         raise ValueError(f"method must be one of: {allowed_list}")
 
-    # Get raw congestion dual values, add them
+    # Get raw congestion dual values
     rss = ref_scenario.state
-    ref_cong_abs = rss.get_congu() + rss.get_congl()
-    all_branches = set(ref_cong_abs.columns.tolist())
+    congu, congl = rss.get_congu(), rss.get_congl()
+    all_branches = set(congu.columns.tolist())
     # Create validated composite allow list
     composite_allow_list = _construct_composite_allow_list(
         all_branches, allow_list, deny_list
     )
 
-    # Parse 2-D array to vector of quantile values
-    quantile_cong_abs = ref_cong_abs.quantile(quantile)
+    # Add congestion dual values, parse 2-D array to vector of quantile values
+    quantile_cong_abs = _get_cong_quantile(congu, congl, quantile)
     # Filter out insignificant values
     significance_bitmask = quantile_cong_abs > cong_significance_cutoff
     quantile_cong_abs = quantile_cong_abs.where(significance_bitmask).dropna()
@@ -19,6 +19,15 @@ class AbstractGrid(object):
         self.branch = pd.DataFrame()
         self.storage = storage_template()
 
+    def load(self, name):
+        """Returns a grid attribute. Builders supporting lazy loading read the
+        data backing the attribute on first call.
+
+        :param str name: attribute name.
+        :return: (*object*) -- attribute value.
+        """
+        return getattr(self, name)
+
 
 def storage_template():
     """Get storage
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+from powersimdata.input.helpers import get_bus_demand_operator
+from powersimdata.input.profile_store import check_chunk_size
+
+
+class BusDemand(object):
+    """Bus-level demand computed on demand from zone-level demand. Only the zone
+    demand and the sparse zone to bus allocation operator are stored, the values
+    of the selected hours and buses being calculated when accessed.
+
+    Buses in a zone whose total Pd is zero get no demand.
+
+    :param pandas.DataFrame bus: bus data frame.
+    :param pandas.DataFrame demand: demand data frame (hour, zone).
+    :raises ValueError: if zones of buses are missing from the demand profile.
+    """
+
+    def __init__(self, bus, demand):
+        """Constructor."""
+        zone_id, operator = get_bus_demand_operator(bus)
+        missing = zone_id.difference(demand.columns)
+        if len(missing) > 0:
+            raise ValueError(
+                "zones missing from demand profile: %s" % ", ".join(map(str, missing))
+            )
+        self._zone_demand = demand.reindex(columns=zone_id).astype(float)
+        self._zone_idx = operator.indices
+        self._share = operator.data
+        self._position = pd.Series(np.arange(len(bus)), index=bus.index)
+        self.loc = _LocIndexer(self)
+
+    @property
+    def index(self):
+        """Time steps.
+
+        :return: (*pandas.DatetimeIndex*) -- UTC timestamps.
+        """
+        return self._zone_demand.index
+
+    @property
+    def columns(self):
+        """Buses.
+
+        :return: (*pandas.Index*) -- bus ids.
+        """
+        return self._position.index
+
+    @property
+    def shape(self):
+        """Shape of the materialized data frame.
+
+        :return: (*tuple*) -- number of hours and number of buses.
+        """
+        return len(self.index), len(self.columns)
+
+    def _compute(self, zone_demand, position):
+        """Calculates demand of some buses.
+
+        :param pandas.DataFrame zone_demand: demand data frame (hour, zone).
+        :param pandas.Series position: position of the buses, indexed by bus id.
+        :return: (*pandas.DataFrame*) -- data frame of (hour, bus) demand.
+        """
+        position = position.to_numpy()
+        # each bus gets a share of the demand of a single zone
+        values = zone_demand.to_numpy().T[self._zone_idx[position]]
+        values *= self._share[position, np.newaxis]
+        return pd.DataFrame(
+            values.T, index=zone_demand.index, columns=self.columns[position]
+        )
+
+    def to_frame(self):
+        """Materializes bus demand.
+
+        :return: (*pandas.DataFrame*) -- data frame of (hour, bus) demand.
+        """
+        return self._compute(self._zone_demand, self._position)
+
+    def sum(self, axis=0):
+        """Sums bus demand over hours or buses.
+
+        :param int axis: 0 to sum over hours, 1 to sum over buses.
+        :return: (*pandas.Series*) -- total demand of each bus (axis=0) or total
+            demand at each hour (axis=1).
+        :raises ValueError: if axis is neither 0 nor 1.
+        """
+        if axis in [0, "index"]:
+            zone_total = self._zone_demand.sum().to_numpy()
+            return pd.Series(zone_total[self._zone_idx] * self._share, self.columns)
+        if axis in [1, "columns"]:
+            allocated = np.bincount(
+                self._zone_idx,
+                weights=self._share,
+                minlength=self._zone_demand.shape[1],
+            )
+            return self._zone_demand.dot(allocated)
+        raise ValueError("axis must be 0 or 1")
+
+    def iter_chunks(self, hours_per_chunk=168, columns=None):
+        """Iterates over bus demand by chunks of consecutive hours.
+
+        :param int hours_per_chunk: number of hours in each chunk.
+        :param list columns: bus ids. All buses if None.
+        :return: (*generator*) -- data frames of (hour, bus) demand.
+        """
+        check_chunk_size(hours_per_chunk)
+        position = self._position if columns is None else self._position[columns]
+        for start in range(0, len(self.index), hours_per_chunk):
+            zone_demand = self._zone_demand.iloc[start : start + hours_per_chunk]
+            yield self._compute(zone_demand, position)
+
+
+class _LocIndexer(object):
+    """Label based selection of bus demand, mimicking *pandas.DataFrame.loc*.
+
+    :param BusDemand bus_demand: bus demand.
+    """
+
+    def __init__(self, bus_demand):
+        """Constructor."""
+        self._bus_demand = bus_demand
+
+    def __getitem__(self, key):
+        """Selects hours and buses.
+
+        :param key: hours or tuple of hours and buses, as accepted by
+            *pandas.DataFrame.loc*.
+        :return: (*pandas.DataFrame*, *pandas.Series* or *float*) -- selection.
+        """
+        rows, columns = key if isinstance(key, tuple) else (key, slice(None))
+        zone_demand = self._bus_demand._zone_demand.loc[rows]
+        position = self._bus_demand._position.loc[columns]
+        single_row = isinstance(zone_demand, pd.Series)
+        single_column = not isinstance(position, pd.Series)
+        if single_row:
+            zone_demand = zone_demand.to_frame().T
+        if single_column:
+            position = pd.Series([position], index=[columns])
+
+        selection = self._bus_demand._compute(zone_demand, position)
+        if single_row and single_column:
+            return selection.iat[0, 0]
+        if single_row:
+            return selection.iloc[0]
+        if single_column:
+            return selection.iloc[:, 0]
+        return selection
@@ -9,6 +9,7 @@ from powersimdata.design.transmission.upgrade import (
 from powersimdata.input.transform_grid import TransformGrid
 from powersimdata.utility import server_setup
 from powersimdata.utility.distance import find_closest_neighbor
+from powersimdata.utility.helpers import hash_object
 
 _resources = (
     "coal",
@@ -761,6 +762,13 @@ class ChangeTable(object):
             self.new_bus_cache[new_bus_tuple] = bus
             return bus
 
+    def fingerprint(self):
+        """Computes a content hash of the change table.
+
+        :return: (*str*) -- hexadecimal digest.
+        """
+        return hash_object(self.ct)
+
     def write(self, scenario_id):
         """Saves change table to disk.
 
@@ -1,11 +1,58 @@
+import hashlib
 import os
 
+import pandas as pd
+
+from powersimdata.input.grid_diff import grid_diff
 from powersimdata.input.scenario_grid import FromREISE, FromREISEjl
 from powersimdata.network.usa_tamu.constants import storage as tamu_storage
 from powersimdata.network.usa_tamu.usa_tamu_model import TAMU
-from powersimdata.utility.helpers import MemoryCache, cache_key
-
-_cache = MemoryCache()
+from powersimdata.utility.helpers import MemoryCache, cache_key, hash_object
+
+_cache = MemoryCache(max_entries=10)
+_lazy_attributes = {
+    "interconnect",
+    "zone2id",
+    "id2zone",
+    "sub",
+    "plant",
+    "gencost",
+    "dcline",
+    "bus2sub",
+    "bus",
+    "branch",
+    "storage",
+}
+
+
+_fingerprint_attributes = [
+    "interconnect",
+    "id2zone",
+    "sub",
+    "bus2sub",
+    "bus",
+    "plant",
+    "branch",
+    "dcline",
+    "gencost",
+    "storage",
+]
+
+
+# Tables and columns ignored when comparing grids
+_eq_exclusions = {
+    # Comparing gencost['after'] will fail if one Grid was linearized
+    "gencost_after": None,
+    "interconnect": None,
+    "storage_gencost": None,
+    "storage": list(tamu_storage.defaults.keys()),
+    # REISE will modify some gen columns
+    "storage_gen": ["ramp_10", "ramp_30"],
+    # MOST changes BUS_TYPE for buses with DC Lines attached
+    "bus": ["type"],
+    # REISE does some modifications to Plant data
+    "plant": ["status", "Pmin", "ramp_10", "ramp_30"],
+}
 
 
 class Grid(object):
@@ -14,36 +61,51 @@ class Grid(object):
     :param str/list interconnect: interconnect name(s).
     :param str source: model used to build the network.
     :param str engine: engine used to run scenario, if using ScenarioGrid.
+    :param bool lazy: if True, each table is only loaded on first access. Lazy
+        grids bypass the in-memory cache.
+    :param bool/str compact: if True, data frames use categoricals for repeated
+        strings and 32-bit integers for identifiers. If *'float32'*, coordinates
+        are also stored as 32-bit floats.
     :raises TypeError: if source and engine are not both strings.
-    :raises ValueError: if model or engine does not exist.
+    :raises ValueError: if model, engine or compact does not exist.
     """
 
-    def __init__(self, interconnect, source="usa_tamu", engine="REISE"):
+    def __init__(
+        self, interconnect, source="usa_tamu", engine="REISE", lazy=False, compact=False
+    ):
         """Constructor."""
         if not isinstance(source, str):
             raise TypeError("source must be a string")
         supported_engines = {"REISE", "REISE.jl"}
         if engine not in supported_engines:
             raise ValueError(f"Engine must be one of {','.join(supported_engines)}")
+        if compact not in {False, True, "float32"}:
+            raise ValueError("compact must be one of False | True | 'float32'")
 
         if isinstance(interconnect, str):
             interconnect = [interconnect]
         if not isinstance(interconnect, list):
             raise TypeError("interconnect must be a str of list of str")
-        key = cache_key(interconnect, source)
-        cached = _cache.get(key)
+        key = cache_key(interconnect, source, compact)
+        cached = None if lazy else _cache.get(key)
         if cached is not None:
             data = cached
         elif source == "usa_tamu":
-            data = TAMU(interconnect)
+            data = TAMU(interconnect, lazy=lazy, compact=compact)
         elif os.path.splitext(source)[1] == ".mat":
             if engine == "REISE":
-                data = FromREISE(source)
+                data = FromREISE(source, lazy=lazy, compact=compact)
             elif engine == "REISE.jl":
-                data = FromREISEjl(source)
+                data = FromREISEjl(source, lazy=lazy, compact=compact)
         else:
             raise ValueError("%s not implemented" % source)
 
+        self.compact = compact
+        if lazy:
+            self.data_loc = data.data_loc
+            self._builder = data
+            return
+
         self.data_loc = data.data_loc
         self.interconnect = data.interconnect
         self.zone2id = data.zone2id
@@ -57,84 +119,81 @@ class Grid(object):
         self.branch = data.branch
         self.storage = data.storage
 
-        _cache.put(key, self)
+        if cached is None:
+            _cache.put(key, self)
+
+    def __getattr__(self, name):
+        """Loads a table of a lazy grid on first access.
+
+        :param str name: attribute name.
+        :return: (*object*) -- attribute value.
+        :raises AttributeError: if attribute does not exist.
+        """
+        if name in _lazy_attributes and "_builder" in self.__dict__:
+            value = self._builder.load(name)
+            setattr(self, name, value)
+            return value
+        raise AttributeError(
+            "'%s' object has no attribute '%s'" % (type(self).__name__, name)
+        )
+
+    def fingerprint(self):
+        """Computes a content hash of the grid. The hash of each data frame is
+        memoized until the data frame is replaced: a data frame must therefore not
+        be modified in place once the fingerprint has been computed, e.g. use
+        ``grid.plant = grid.plant.assign(Pmax=0)`` instead of
+        ``grid.plant["Pmax"] = 0``.
+
+        :return: (*str*) -- hexadecimal digest.
+        """
+        memo = self.__dict__.get("_fingerprints", {})
+        new_memo = {}
+
+        def hash_table(table):
+            if isinstance(table, pd.DataFrame):
+                entry = memo.get(id(table))
+                if entry is None or entry[0] is not table:
+                    entry = (table, hash_object(table))
+                new_memo[id(table)] = entry
+                return entry[1]
+            if isinstance(table, dict):
+                return hash_object({k: hash_table(v) for k, v in table.items()})
+            return hash_object(table)
+
+        digest = hashlib.sha1()
+        for name in _fingerprint_attributes:
+            digest.update(name.encode())
+            digest.update(hash_table(getattr(self, name)).encode())
+        self._fingerprints = new_memo
+        return digest.hexdigest()
+
+    def __copy__(self):
+        """Returns a copy of the grid sharing its data frames with the original
+        grid. Copying is O(1) in memory and time. A data frame must be copied
+        before being modified in place, e.g. ``grid.plant = grid.plant.copy()``,
+        whereas it can be freely replaced, e.g. ``grid.plant = new_plant``.
+
+        :return: (*powersimdata.input.grid.Grid*) -- shallow copy of the grid.
+        """
+        grid = self.__class__.__new__(self.__class__)
+        for key, value in self.__dict__.items():
+            setattr(grid, key, value.copy() if isinstance(value, dict) else value)
+        return grid
 
     def __eq__(self, other):
-        """Used when 'self == other' is evaluated.
+        """Used when 'self == other' is evaluated. Some columns that are modified
+        by the simulation engines are ignored, see :func:`grid_diff` to get the
+        differences between two grids.
 
         :param object other: other object to be compared against.
         :return: (*bool*).
         """
-
-        def _univ_eq(ref, test, failure_flag=None):
-            """Check for {boolean, dataframe, or column data} equality.
-
-            :param object ref: one object to be tested (order does not matter).
-            :param object test: another object to be tested.
-            :param str failure_flag: flag to add to nonmatching_entries on failure.
-            :raises AssertionError: if no equality can be confirmed (w/o failure_flag).
-            """
-            try:
-                try:
-                    test_eq = ref == test
-                    if isinstance(test_eq, bool):
-                        assert test_eq
-                    else:
-                        assert test_eq.all().all()
-                except ValueError:
-                    assert set(ref.columns) == set(test.columns)
-                    for col in ref.columns:
-                        assert (ref[col] == test[col]).all()
-            except (AssertionError, ValueError):
-                if failure_flag is None:
-                    raise
-                else:
-                    nonmatching_entries.add(failure_flag)
-
         if not isinstance(other, Grid):
             err_msg = "Unable to compare Grid & %s" % type(other).__name__
             raise NotImplementedError(err_msg)
 
-        nonmatching_entries = set()
-        # compare gencost
-        # Comparing gencost['after'] will fail if one Grid was linearized
-        _univ_eq(self.gencost["before"], other.gencost["before"], "gencost")
-
-        # compare storage
-        _univ_eq(len(self.storage["gen"]), len(other.storage["gen"]), "storage")
-        _univ_eq(self.storage.keys(), other.storage.keys(), "storage")
-        ignored_subkeys = {"gencost"} | set(tamu_storage.defaults.keys())
-        for subkey in set(self.storage.keys()) - ignored_subkeys:
-            # REISE will modify some gen columns
-            self_data = self.storage[subkey]
-            other_data = other.storage[subkey]
-            if subkey == "gen":
-                excluded_cols = ["ramp_10", "ramp_30"]
-                self_data = self_data.drop(excluded_cols, axis=1)
-                other_data = other_data.drop(excluded_cols, axis=1)
-            _univ_eq(self_data, other_data, "storage")
-
-        # compare bus
-        # MOST changes BUS_TYPE for buses with DC Lines attached
-        _univ_eq(self.bus.drop("type", axis=1), other.bus.drop("type", axis=1), "bus")
-        # compare plant
-        # REISE does some modifications to Plant data
-        excluded_cols = ["status", "Pmin", "ramp_10", "ramp_30"]
-        self_df = self.plant.drop(excluded_cols, axis=1)
-        other_df = other.plant.drop(excluded_cols, axis=1)
-        _univ_eq(self_df, other_df, "plant")
-        # compare branch
-        _univ_eq(self.branch, other.branch, "branch")
-        # compare dcline
-        _univ_eq(self.dcline, other.dcline, "dcline")
-        # compare sub
-        _univ_eq(self.sub, other.sub, "sub")
-        # check grid helper attribute equalities
-        _univ_eq(self.zone2id, other.zone2id, "zone2id")
-        _univ_eq(self.id2zone, other.id2zone, "id2zone")
-        _univ_eq(self.bus2sub, other.bus2sub, "bus2sub")
-
-        if len(nonmatching_entries) > 0:
-            print(f"non-matching entries: {', '.join(sorted(nonmatching_entries))}")
+        diff = grid_diff(self, other, exclude=_eq_exclusions)
+        if len(diff) > 0:
+            print(f"non-matching entries: {', '.join(sorted(diff))}")
             return False
         return True
@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+
+
+def grid_diff(ref, test, exclude=None, rtol=0, atol=0):
+    """Computes the differences between two grids. Tables are aligned on their
+    index and compared column by column.
+
+    :param powersimdata.input.grid.Grid ref: reference grid.
+    :param powersimdata.input.grid.Grid test: grid to compare to the reference.
+    :param dict exclude: tables or columns to ignore. Keys are table names (see
+        :func:`get_grid_tables`) and values are lists of column names (keys for
+        dictionaries) or None to ignore the whole table.
+    :param float rtol: relative tolerance for numeric values.
+    :param float atol: absolute tolerance for numeric values.
+    :return: (*dict*) -- keys are the names of the tables that differ and values
+        are dictionaries as returned by :func:`table_diff`. Empty if the grids
+        are equal.
+    """
+    exclude = {} if exclude is None else exclude
+    ref_tables = get_grid_tables(ref)
+    test_tables = get_grid_tables(test)
+
+    diff = {}
+    for name in ref_tables.keys() | test_tables.keys():
+        if name in exclude and exclude[name] is None:
+            continue
+        if name not in ref_tables or name not in test_tables:
+            diff[name] = {"added" if name in test_tables else "removed": [name]}
+            continue
+        table = table_diff(
+            ref_tables[name],
+            test_tables[name],
+            exclude=exclude.get(name),
+            rtol=rtol,
+            atol=atol,
+        )
+        if table:
+            diff[name] = table
+    return diff
+
+
+def get_grid_tables(grid):
+    """Lists the tables of a grid. Storage data frames are named
+    *storage_<key>* and the other storage entries are gathered in the
+    *storage* dictionary.
+
+    :param powersimdata.input.grid.Grid grid: grid.
+    :return: (*dict*) -- keys are table names and values are data frames or
+        dictionaries.
+    """
+    tables = {
+        name: getattr(grid, name)
+        for name in ["sub", "bus2sub", "bus", "plant", "branch", "dcline"]
+    }
+    tables["gencost"] = grid.gencost["before"]
+    tables["gencost_after"] = grid.gencost["after"]
+    tables["zone2id"] = grid.zone2id
+    tables["id2zone"] = grid.id2zone
+    tables["interconnect"] = dict.fromkeys(grid.interconnect)
+    tables["storage"] = {}
+    for key, value in grid.storage.items():
+        if isinstance(value, pd.DataFrame):
+            tables["storage_%s" % key] = value
+        else:
+            tables["storage"][key] = value
+    return tables
+
+
+def table_diff(ref, test, exclude=None, rtol=0, atol=0):
+    """Computes the differences between two data frames, aligned on their index,
+    or two dictionaries, aligned on their keys.
+
+    :param pandas.DataFrame/dict ref: reference table.
+    :param pandas.DataFrame/dict test: table to compare to the reference.
+    :param list exclude: columns (or keys) to ignore.
+    :param float rtol: relative tolerance for numeric values.
+    :param float atol: absolute tolerance for numeric values.
+    :return: (*dict*) -- ids of the *added*, *removed* and *changed* rows
+        (keys), name of the *changed_columns*, *added_columns* and
+        *removed_columns*. Only non-empty entries are kept.
+    :raises TypeError: if tables are neither both data frames nor both
+        dictionaries.
+    :raises ValueError: if the index of a data frame is not unique.
+    """
+    exclude = [] if exclude is None else exclude
+    if ref is test:
+        return {}
+    if isinstance(ref, dict) and isinstance(test, dict):
+        return _dict_diff(ref, test, exclude, rtol, atol)
+    if not (isinstance(ref, pd.DataFrame) and isinstance(test, pd.DataFrame)):
+        raise TypeError("tables must be both data frames or both dictionaries")
+    if not (ref.index.is_unique and test.index.is_unique):
+        raise ValueError("index of data frames must be unique")
+
+    ref_columns = [c for c in ref.columns if c not in exclude]
+    test_columns = [c for c in test.columns if c not in exclude]
+    if ref.index.equals(test.index):
+        common = np.ones(len(ref), dtype=bool)
+        ref_idx = test_idx = slice(None)
+    else:
+        common = ref.index.isin(test.index)
+        ref_idx = np.flatnonzero(common)
+        test_idx = test.index.get_indexer(ref.index[common])
+
+    changed = np.zeros(common.sum(), dtype=bool)
+    changed_columns = []
+    for column in [c for c in ref_columns if c in test.columns]:
+        equal = _equal_values(
+            ref[column].to_numpy()[ref_idx],
+            test[column].to_numpy()[test_idx],
+            rtol,
+            atol,
+        )
+        if not equal.all():
+            changed |= ~equal
+            changed_columns.append(column)
+
+    diff = {
+        "added": test.index[~test.index.isin(ref.index)].tolist(),
+        "removed": ref.index[~common].tolist(),
+        "changed": ref.index[common][changed].tolist(),
+        "changed_columns": changed_columns,
+        "added_columns": [c for c in test_columns if c not in ref.columns],
+        "removed_columns": [c for c in ref_columns if c not in test.columns],
+    }
+    return {k: v for k, v in diff.items() if len(v) > 0}
+
+
+def _dict_diff(ref, test, exclude, rtol, atol):
+    """Computes the differences between two dictionaries.
+
+    :param dict ref: reference dictionary.
+    :param dict test: dictionary to compare to the reference.
+    :param list exclude: keys to ignore.
+    :param float rtol: relative tolerance for numeric values.
+    :param float atol: absolute tolerance for numeric values.
+    :return: (*dict*) -- *added*, *removed* and *changed* keys.
+    """
+    ref_keys = [k for k in ref if k not in exclude]
+    test_keys = [k for k in test if k not in exclude]
+    changed = []
+    for key in [k for k in ref_keys if k in test]:
+        ref_value, test_value = ref[key], test[key]
+        if isinstance(ref_value, (list, tuple, np.ndarray)):
+            ref_value, test_value = np.asarray(ref_value), np.asarray(test_value)
+            equal = ref_value.shape == test_value.shape and bool(
+                _equal_values(ref_value.ravel(), test_value.ravel(), rtol, atol).all()
+            )
+        else:
+            equal = bool(
+                _equal_values(np.array([ref_value]), np.array([test_value]), rtol, atol)
+            )
+        if not equal:
+            changed.append(key)
+    diff = {
+        "added": [k for k in test_keys if k not in ref],
+        "removed": [k for k in ref_keys if k not in test],
+        "changed": changed,
+    }
+    return {k: v for k, v in diff.items() if len(v) > 0}
+
+
+def _equal_values(ref, test, rtol, atol):
+    """Compares two arrays element-wise. Missing values are equal to each other.
+
+    :param numpy.ndarray ref: reference values.
+    :param numpy.ndarray test: values to compare to the reference.
+    :param float rtol: relative tolerance for numeric values.
+    :param float atol: absolute tolerance for numeric values.
+    :return: (*numpy.ndarray*) -- boolean array.
+    """
+    ref, test = np.asarray(ref), np.asarray(test)
+    if _is_numeric(ref) and _is_numeric(test):
+        if rtol == 0 and atol == 0:
+            equal = ref == test
+        else:
+            equal = np.isclose(ref, test, rtol=rtol, atol=atol)
+    else:
+        ref, test = ref.astype(object), test.astype(object)
+        equal = np.array(ref == test, dtype=bool).reshape(ref.shape)
+    different = ~equal
+    if different.any():
+        equal[different] = pd.isna(ref[different]) & pd.isna(test[different])
+    return equal
+
+
+def _is_numeric(values):
+    """Checks if array holds numbers.
+
+    :param numpy.ndarray values: array.
+    :return: (*bool*) -- whether values are integers, floats or booleans.
+    """
+    return values.dtype.kind in "biuf"
@@ -1,6 +1,24 @@
 import os
 
+import numpy as np
 import pandas as pd
+from scipy.sparse import csr_matrix
+
+from powersimdata.utility.helpers import MemoryCache, hash_data_frame
+
+_bus_demand_operators = MemoryCache(max_entries=10, copy=False)
+
+categorical_columns = {
+    "type",
+    "zone_name",
+    "interconnect",
+    "from_zone_name",
+    "to_zone_name",
+    "branch_device_type",
+    "from_interconnect",
+    "to_interconnect",
+}
+coordinate_columns = {"lat", "lon", "from_lat", "from_lon", "to_lat", "to_lon"}
 
 
 def csv_to_data_frame(data_loc, filename):
@@ -26,39 +44,50 @@ def add_column_to_data_frame(data_frame, column_dict):
         data_frame[key] = value
 
 
+def get_indexer(index, keys):
+    """Computes the positions of keys in an index.
+
+    :param pandas.Index index: index with unique values.
+    :param iterable keys: values to be looked up in index.
+    :return: (*numpy.ndarray*) -- positional indexer.
+    :raises KeyError: if a key is not found in index.
+    """
+    indexer = index.get_indexer(keys)
+    if (indexer == -1).any():
+        missing = pd.Index(keys)[indexer == -1].unique().tolist()
+        raise KeyError("Unknown key(s): %s" % missing)
+    return indexer
+
+
 def add_coord_to_grid_data_frames(grid):
     """Adds longitude and latitude information to bus, plant and branch data
         frames of grid instance.
 
     :param powersimdata.input.grid.Grid grid: grid instance.
     """
-    bus2coord = (
-        pd.merge(grid.bus2sub[["sub_id"]], grid.sub[["lat", "lon"]], on="sub_id")
-        .set_index(grid.bus2sub.index)
-        .drop(columns="sub_id")
-        .to_dict()
-    )
-
-    def get_lat(idx):
-        return [bus2coord["lat"][i] for i in idx]
+    bus2sub = get_indexer(grid.sub.index, grid.bus2sub.sub_id)
+    lat = grid.sub.lat.to_numpy()[bus2sub]
+    lon = grid.sub.lon.to_numpy()[bus2sub]
 
-    def get_lon(idx):
-        return [bus2coord["lon"][i] for i in idx]
+    def get_coord(idx):
+        bus = get_indexer(grid.bus2sub.index, idx)
+        return lat[bus], lon[bus]
 
-    extra_col_bus = {"lat": get_lat(grid.bus.index), "lon": get_lon(grid.bus.index)}
+    bus_lat, bus_lon = get_coord(grid.bus.index)
+    extra_col_bus = {"lat": bus_lat, "lon": bus_lon}
     add_column_to_data_frame(grid.bus, extra_col_bus)
 
-    extra_col_plant = {
-        "lat": get_lat(grid.plant.bus_id),
-        "lon": get_lon(grid.plant.bus_id),
-    }
+    plant_lat, plant_lon = get_coord(grid.plant.bus_id)
+    extra_col_plant = {"lat": plant_lat, "lon": plant_lon}
     add_column_to_data_frame(grid.plant, extra_col_plant)
 
+    from_lat, from_lon = get_coord(grid.branch.from_bus_id)
+    to_lat, to_lon = get_coord(grid.branch.to_bus_id)
     extra_col_branch = {
-        "from_lat": get_lat(grid.branch.from_bus_id),
-        "from_lon": get_lon(grid.branch.from_bus_id),
-        "to_lat": get_lat(grid.branch.to_bus_id),
-        "to_lon": get_lon(grid.branch.to_bus_id),
+        "from_lat": from_lat,
+        "from_lon": from_lon,
+        "to_lat": to_lat,
+        "to_lon": to_lon,
     }
     add_column_to_data_frame(grid.branch, extra_col_branch)
 
@@ -68,25 +97,25 @@ def add_zone_to_grid_data_frames(grid):
 
     :param powersimdata.input.grid.Grid grid: grid instance.
     """
-    bus2zone = grid.bus.zone_id.to_dict()
-
-    def get_zone_id(idx):
-        return [bus2zone[i] for i in idx]
+    zone_id = grid.bus.zone_id.to_numpy()
+    id2zone = pd.Series(grid.id2zone, dtype=object)
+    zone_name = id2zone.to_numpy()[get_indexer(id2zone.index, zone_id)]
 
-    def get_zone_name(idx):
-        return [grid.id2zone[bus2zone[i]] for i in idx]
+    def get_zone(idx):
+        bus = get_indexer(grid.bus.index, idx)
+        return zone_id[bus], zone_name[bus]
 
-    extra_col_plant = {
-        "zone_id": get_zone_id(grid.plant.bus_id),
-        "zone_name": get_zone_name(grid.plant.bus_id),
-    }
+    plant_zone_id, plant_zone_name = get_zone(grid.plant.bus_id)
+    extra_col_plant = {"zone_id": plant_zone_id, "zone_name": plant_zone_name}
     add_column_to_data_frame(grid.plant, extra_col_plant)
 
+    from_zone_id, from_zone_name = get_zone(grid.branch.from_bus_id)
+    to_zone_id, to_zone_name = get_zone(grid.branch.to_bus_id)
     extra_col_branch = {
-        "from_zone_id": get_zone_id(grid.branch.from_bus_id),
-        "to_zone_id": get_zone_id(grid.branch.to_bus_id),
-        "from_zone_name": get_zone_name(grid.branch.from_bus_id),
-        "to_zone_name": get_zone_name(grid.branch.to_bus_id),
+        "from_zone_id": from_zone_id,
+        "to_zone_id": to_zone_id,
+        "from_zone_name": from_zone_name,
+        "to_zone_name": to_zone_name,
     }
     add_column_to_data_frame(grid.branch, extra_col_branch)
 
@@ -97,10 +126,10 @@ def add_interconnect_to_grid_data_frames(grid):
 
     :param powersimdata.input.grid.Grid grid: grid instance.
     """
-    bus2interconnect = grid.bus2sub.interconnect.to_dict()
+    interconnect = grid.bus2sub.interconnect.to_numpy()
 
     def get_interconnect(idx):
-        return [bus2interconnect[i] for i in idx]
+        return interconnect[get_indexer(grid.bus2sub.index, idx)]
 
     extra_col_bus = {"interconnect": get_interconnect(grid.bus.index)}
     add_column_to_data_frame(grid.bus, extra_col_bus)
@@ -120,3 +149,80 @@ def add_interconnect_to_grid_data_frames(grid):
         "to_interconnect": get_interconnect(grid.dcline.to_bus_id),
     }
     add_column_to_data_frame(grid.dcline, extra_col_dcline)
+
+
+def compact_data_frame(data_frame, float32=False):
+    """Converts columns of a grid data frame to memory-compact dtypes: repeated
+    strings to categoricals, identifiers to 32-bit integers and, optionally,
+    coordinates to 32-bit floats. Columns already in the target dtype are left
+    untouched.
+
+    :param pandas.DataFrame data_frame: grid data frame.
+    :param bool float32: convert coordinates to 32-bit floats.
+    :return: (*pandas.DataFrame*) -- data frame with compact dtypes. The input
+        data frame is returned if no column needs to be converted.
+    """
+    dtypes = {}
+    for column, dtype in data_frame.dtypes.items():
+        if column in categorical_columns and dtype == object:
+            dtypes[column] = "category"
+        elif column.endswith("_id") and dtype == np.int64:
+            dtypes[column] = np.int32
+        elif float32 and column in coordinate_columns and dtype == np.float64:
+            dtypes[column] = np.float32
+    return data_frame.astype(dtypes) if dtypes else data_frame
+
+
+def compact_grid_data_frames(grid, float32=False, names=None):
+    """Converts the data frames of a grid instance to memory-compact dtypes. Done
+    inplace.
+
+    .. note:: grouping by a categorical column includes the categories that are
+        not observed, e.g. the zones without any plant of the selected type.
+
+    :param powersimdata.input.grid.Grid grid: grid instance.
+    :param bool float32: convert coordinates to 32-bit floats.
+    :param iterable names: name of the data frames to convert. All data frames
+        are converted if None.
+    """
+    if names is None:
+        names = ["sub", "bus2sub", "bus", "plant", "branch", "dcline", "gencost"]
+    for name in names:
+        if name == "gencost":
+            gencost = grid.gencost
+            before = compact_data_frame(gencost["before"], float32)
+            if gencost["after"] is gencost["before"]:
+                gencost["after"] = before
+            else:
+                gencost["after"] = compact_data_frame(gencost["after"], float32)
+            gencost["before"] = before
+        elif name in {"sub", "bus2sub", "bus", "plant", "branch", "dcline"}:
+            setattr(grid, name, compact_data_frame(getattr(grid, name), float32))
+
+
+def get_bus_demand_operator(bus):
+    """Builds the sparse operator allocating zone demand to buses. Each bus gets a
+    share of the demand of its zone proportional to its Pd. Buses in a zone whose
+    total Pd is zero get nothing, rather than NaN. Operators are cached on the
+    content of the zone_id and Pd columns of the bus table.
+
+    :param pandas.DataFrame bus: bus data frame.
+    :return: (*tuple*) -- zone ids (*pandas.Index*) and operator
+        (*scipy.sparse.csr_matrix*) with one row per bus, in the order of the bus
+        data frame, and one column per zone. Each row has a single entry.
+    """
+    key = hash_data_frame(bus[["zone_id", "Pd"]])
+    cached = _bus_demand_operators.get(key)
+    if cached is not None:
+        return cached
+
+    zone_id, zone_idx = np.unique(bus["zone_id"].to_numpy(), return_inverse=True)
+    pd_bus = bus["Pd"].to_numpy(dtype=float)
+    pd_zone = np.bincount(zone_idx, weights=pd_bus, minlength=len(zone_id))[zone_idx]
+    share = np.divide(pd_bus, pd_zone, out=np.zeros_like(pd_bus), where=pd_zone != 0)
+    operator = csr_matrix(
+        (share, zone_idx, np.arange(len(bus) + 1)), shape=(len(bus), len(zone_id))
+    )
+    operator = (pd.Index(zone_id, name="zone_id"), operator)
+    _bus_demand_operators.put(key, operator)
+    return operator
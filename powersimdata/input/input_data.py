@@ -3,12 +3,28 @@ import os
 import pandas as pd
 
 from powersimdata.data_access.context import Context
-from powersimdata.scenario.helpers import interconnect2name
+from powersimdata.input.profile_store import (
+    get_store_path,
+    is_stored,
+    iter_frame_chunks,
+    iter_store_chunks,
+    read_profile,
+    slice_profile,
+    write_profile,
+)
+from powersimdata.scenario.helpers import (
+    calculate_bus_demand,
+    interconnect2name,
+)
 from powersimdata.utility import server_setup
+from powersimdata.utility.helpers import MemoryCache, cache_key
+
+_cache = MemoryCache(max_bytes=2 * 1024 ** 3, copy=False)
 
 
 class InputData(object):
-    """Load input data.
+    """Load input data. Base profiles are kept in memory, in a cache shared by all
+    instances, and returned as read-only data frames.
 
     :param str data_loc: data location.
     """
@@ -39,48 +55,128 @@ class InputData(object):
         if field_name not in possible:
             raise ValueError("Only %s data can be loaded" % " | ".join(possible))
 
-    def get_data(self, scenario_info, field_name):
-        """Returns data either from server or local directory.
+    def _get_file(self, scenario_info, field_name):
+        """Gets name and location of the file enclosing the data.
+
+        :param dict scenario_info: scenario information.
+        :param str field_name: *'demand'*, *'hydro'*, *'solar'*, *'wind'*,
+            *'ct'* or *'grid'*.
+        :return: (*tuple*) -- file name, directory relative to the data root and
+            key in the in-memory cache (None if the data is not a base profile).
+        """
+        ext = self.file_extension[field_name]
+        if field_name in ["demand", "hydro", "solar", "wind"]:
+            interconnect = interconnect2name(scenario_info["interconnect"].split("_"))
+            version = scenario_info["base_" + field_name]
+            file_name = interconnect + "_" + field_name + "_" + version + "." + ext
+            key = cache_key(interconnect, field_name, version)
+            return file_name, server_setup.BASE_PROFILE_DIR, key
+        file_name = scenario_info["id"] + "_" + field_name + "." + ext
+        return file_name, server_setup.INPUT_DIR, None
+
+    def get_data(self, scenario_info, field_name, columns=None, start=None, end=None):
+        """Returns data either from server or local directory. Profiles can be
+        restricted to some columns and/or a time range, in which case only these
+        values are read from disk.
 
         :param dict scenario_info: scenario information.
         :param str field_name: *'demand'*, *'hydro'*, *'solar'*, *'wind'*,
             *'ct'* or *'grid'*.
+        :param list columns: plant or zone ids to load. All if None.
+        :param str/pandas.Timestamp start: first time step to load, included.
+        :param str/pandas.Timestamp end: last time step to load, included.
         :return: (*pandas.DataFrame*, *dict*, or *str*) --
             demand, hydro, solar or wind as a data frame, change table as a
             dictionary, or the path to a matfile enclosing the grid data.
         :raises FileNotFoundError: if file not found on local machine.
+        :raises ValueError: if a selection is given for a field other than a
+            profile.
         """
         self._check_field(field_name)
+        selection = {"columns": columns, "start": start, "end": end}
+        if self.file_extension[field_name] != "csv" and any(
+            v is not None for v in selection.values()
+        ):
+            raise ValueError("Only profiles can be sliced")
 
         print("--> Loading %s" % field_name)
-        ext = self.file_extension[field_name]
-
-        if field_name in ["demand", "hydro", "solar", "wind"]:
-            interconnect = interconnect2name(scenario_info["interconnect"].split("_"))
-            version = scenario_info["base_" + field_name]
-            file_name = interconnect + "_" + field_name + "_" + version + "." + ext
-            from_dir = server_setup.BASE_PROFILE_DIR
-        else:
-            file_name = scenario_info["id"] + "_" + field_name + "." + ext
-            from_dir = server_setup.INPUT_DIR
+        file_name, from_dir, key = self._get_file(scenario_info, field_name)
+        if key is not None:
+            cached = _cache.get(key)
+            if cached is not None:
+                return slice_profile(cached.copy(deep=False), **selection)
 
         filepath = os.path.join(server_setup.LOCAL_DIR, from_dir, file_name)
         try:
-            return _read_data(filepath)
+            data = _read_data(filepath, **selection)
         except FileNotFoundError:
             print(
                 "%s not found in %s on local machine"
                 % (file_name, server_setup.LOCAL_DIR)
             )
+            self.data_access.copy_from(file_name, from_dir)
+            data = _read_data(filepath, **selection)
+
+        if key is not None and all(v is None for v in selection.values()):
+            data = read_only(data)
+            _cache.put(key, data)
+            data = data.copy(deep=False)
+        return data
+
+    def iter_chunks(self, scenario_info, field_name, hours_per_chunk=168, columns=None):
+        """Iterates over a base profile by chunks of consecutive hours. Once the
+        profile has been converted to its binary store, chunks are read one at a
+        time from disk unless the profile is already in memory.
+
+        :param dict scenario_info: scenario information.
+        :param str field_name: *'demand'*, *'hydro'*, *'solar'* or *'wind'*.
+        :param int hours_per_chunk: number of hours in each chunk.
+        :param list columns: plant or zone ids to load. All if None.
+        :return: (*generator*) -- data frames indexed by UTC timestamps.
+        :raises ValueError: if field is not a profile.
+        """
+        self._check_field(field_name)
+        file_name, from_dir, key = self._get_file(scenario_info, field_name)
+        if key is None:
+            raise ValueError("Only profiles can be iterated over")
+
+        profile = _cache.get(key)
+        filepath = os.path.join(server_setup.LOCAL_DIR, from_dir, file_name)
+        if profile is None and not is_stored(filepath):
+            profile = self.get_data(scenario_info, field_name)
+        if profile is None:
+            return iter_store_chunks(get_store_path(filepath), hours_per_chunk, columns)
+        return iter_frame_chunks(profile, hours_per_chunk, columns)
+
+    @staticmethod
+    def cache_stats():
+        """Returns usage statistics of the in-memory cache of base profiles.
+
+        :return: (*dict*) -- number of hits, misses, evictions and entries along
+            with the estimated size of the cache in bytes.
+        """
+        return _cache.stats()
 
-        self.data_access.copy_from(file_name, from_dir)
-        return _read_data(filepath)
 
+def read_only(profile):
+    """Makes the values of a profile read-only, so that it can be shared safely.
+
+    :param pandas.DataFrame profile: profile.
+    :return: (*pandas.DataFrame*) -- profile backed by a read-only array.
+    """
+    values = profile.to_numpy()
+    values.flags.writeable = False
+    return pd.DataFrame(values, index=profile.index, columns=profile.columns)
 
-def _read_data(filepath):
-    """Reads data from local machine.
+
+def _read_data(filepath, columns=None, start=None, end=None):
+    """Reads data from local machine. Profiles are converted to a binary store
+    the first time they are read, which is then used in place of the CSV file.
 
     :param str filepath: path to file, with extension either 'pkl', 'csv', or 'mat'.
+    :param list columns: columns of the profile to read. All if None.
+    :param str/pandas.Timestamp start: first time step of the profile to read.
+    :param str/pandas.Timestamp end: last time step of the profile to read.
     :return: (*pandas.DataFrame*, *dict*, or *str*) -- demand, hydro, solar or
         wind as a data frame, change table as a dict, or str containing a
         local path to a matfile of grid data.
@@ -90,8 +186,13 @@ def _read_data(filepath):
     if ext == "pkl":
         data = pd.read_pickle(filepath)
     elif ext == "csv":
-        data = pd.read_csv(filepath, index_col=0, parse_dates=True)
-        data.columns = data.columns.astype(int)
+        if is_stored(filepath):
+            data = read_profile(filepath, columns, start, end)
+        else:
+            data = pd.read_csv(filepath, index_col=0, parse_dates=True)
+            data.columns = data.columns.astype(int)
+            write_profile(data, filepath)
+            data = slice_profile(data, columns, start, end)
     elif ext == "mat":
         # Try to load the matfile, just to check if it exists locally
         open(filepath, "r")
@@ -102,20 +203,14 @@ def _read_data(filepath):
     return data
 
 
-def get_bus_demand(scenario_id, grid):
+def get_bus_demand(scenario_info, grid, lazy=False):
     """Returns demand profiles by bus.
 
-    :param str scenario_id: scenario id.
+    :param dict scenario_info: scenario information.
     :param powersimdata.input.grid.Grid grid: grid to construct bus demand for.
+    :param bool lazy: return a :class:`powersimdata.input.bus_demand.BusDemand`
+        object computing values when accessed instead of a data frame.
     :return: (*pandas.DataFrame*) -- data frame of demand.
     """
-    demand = InputData().get_data(scenario_id, "demand")
-    bus = grid.bus
-    bus["zone_Pd"] = bus.groupby("zone_id")["Pd"].transform("sum")
-    bus["zone_share"] = bus["Pd"] / bus["zone_Pd"]
-    zone_bus_shares = pd.DataFrame(
-        {z: bus.groupby("zone_id").get_group(z).zone_share for z in demand.columns}
-    ).fillna(0)
-    bus_demand = demand.dot(zone_bus_shares.T)
-
-    return bus_demand
+    demand = InputData().get_data(scenario_info, "demand")
+    return calculate_bus_demand(grid.bus, demand, lazy=lazy)
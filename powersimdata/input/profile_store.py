@@ -0,0 +1,295 @@
+import gzip
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from powersimdata.network.network_cache import atomic_pickle
+
+STORE_VERSION = 1
+
+
+def get_store_path(filepath):
+    """Gets location of the binary store of a profile.
+
+    :param str filepath: path to the CSV file of the profile.
+    :return: (*str*) -- path to the directory enclosing the binary store.
+    """
+    data_dir, file_name = os.path.split(filepath)
+    return os.path.join(data_dir, "binary", os.path.splitext(file_name)[0])
+
+
+def _source_stats(filepath):
+    """Gets size and modification time of the CSV file of a profile.
+
+    :param str filepath: path to the CSV file.
+    :return: (*list*) -- size and modification time in nanoseconds. None if the
+        file does not exist.
+    """
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def read_header(store):
+    """Reads header of a binary store.
+
+    :param str store: path to the binary store.
+    :return: (*dict*) -- header. None if the store does not exist or has been
+        written by another version.
+    """
+    try:
+        with open(os.path.join(store, "header.pkl"), "rb") as f:
+            header = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    return header if header.get("version") == STORE_VERSION else None
+
+
+def is_stored(filepath):
+    """Checks if the binary store of a profile is up to date. A store is up to
+    date if the CSV file is unchanged since the conversion or if the CSV file has
+    been removed.
+
+    :param str filepath: path to the CSV file of the profile.
+    :return: (*bool*) -- whether the binary store can be used.
+    """
+    header = read_header(get_store_path(filepath))
+    if header is None:
+        return False
+    stats = _source_stats(filepath)
+    return stats is None or stats == header["source"]
+
+
+def write_profile(profile, filepath):
+    """Writes a profile in its binary store.
+
+    :param pandas.DataFrame profile: profile with a single numeric dtype.
+    :param str filepath: path to the CSV file of the profile.
+    :return: (*bool*) -- whether the profile has been stored.
+    """
+    return write_store(profile, get_store_path(filepath), _source_stats(filepath))
+
+
+def read_profile(filepath, columns=None, start=None, end=None):
+    """Reads a profile, or a part of it, from its binary store.
+
+    :param str filepath: path to the CSV file of the profile.
+    :param list columns: columns to read. All columns are read if None.
+    :param str/pandas.Timestamp start: first time step to read, included. Read
+        from the beginning if None.
+    :param str/pandas.Timestamp end: last time step to read, included. Read until
+        the end if None.
+    :return: (*pandas.DataFrame*) -- profile.
+    :raises FileNotFoundError: if the binary store does not exist.
+    :raises KeyError: if some columns are not in the profile.
+    """
+    return read_store(get_store_path(filepath), columns, start, end)
+
+
+def write_store(profile, store, source=None):
+    """Writes a profile in a binary store. Values are saved column by column in a
+    numpy array, index and column labels are pickled.
+
+    :param pandas.DataFrame profile: profile with a single dense numeric dtype.
+    :param str store: path to the directory enclosing the binary store.
+    :param list source: size and modification time of the file the profile has
+        been read from, if any.
+    :return: (*bool*) -- whether the profile has been stored.
+    """
+    if not has_single_numeric_dtype(profile):
+        return False
+
+    header = {
+        "version": STORE_VERSION,
+        "source": source,
+        "index": profile.index,
+        "columns": profile.columns,
+    }
+    try:
+        os.makedirs(store, exist_ok=True)
+        values = os.path.join(store, "values.npy")
+        tmp = "%s.%d.tmp" % (values, os.getpid())
+        with open(tmp, "wb") as f:
+            np.save(f, np.asfortranarray(profile.to_numpy()))
+        os.replace(tmp, values)
+        atomic_pickle(header, os.path.join(store, "header.pkl"))
+    except OSError as e:
+        print("Unable to write binary profile in %s: %s" % (store, e))
+        return False
+    return True
+
+
+def read_store(store, columns=None, start=None, end=None):
+    """Reads a profile, or a part of it, from a binary store. The values are
+    memory mapped so that only the selected columns and time steps are read.
+
+    :param str store: path to the directory enclosing the binary store.
+    :param list columns: columns to read. All columns are read if None.
+    :param str/pandas.Timestamp start: first time step to read, included. Read
+        from the beginning if None.
+    :param str/pandas.Timestamp end: last time step to read, included. Read until
+        the end if None.
+    :return: (*pandas.DataFrame*) -- profile.
+    :raises FileNotFoundError: if the binary store does not exist.
+    :raises KeyError: if some columns are not in the profile.
+    """
+    header = read_header(store)
+    if header is None:
+        raise FileNotFoundError("No binary store in %s" % store)
+
+    values_path = os.path.join(store, "values.npy")
+    if columns is None and start is None and end is None:
+        values = np.load(values_path)
+        return pd.DataFrame(values, index=header["index"], columns=header["columns"])
+
+    rows = header["index"].slice_indexer(start, end)
+    positions = get_positions(header, columns)
+    values = np.load(values_path, mmap_mode="r")
+    return _select(values, header, positions, rows)
+
+
+def iter_store_chunks(store, hours_per_chunk, columns=None):
+    """Iterates over a profile stored in a binary store by chunks of consecutive
+    time steps. Only one chunk is held in memory at a time.
+
+    :param str store: path to the directory enclosing the binary store.
+    :param int hours_per_chunk: number of time steps in each chunk.
+    :param list columns: columns to read. All columns are read if None.
+    :return: (*generator*) -- data frames with the selected columns.
+    :raises FileNotFoundError: if the binary store does not exist.
+    :raises KeyError: if some columns are not in the profile.
+    """
+    check_chunk_size(hours_per_chunk)
+    header = read_header(store)
+    if header is None:
+        raise FileNotFoundError("No binary store in %s" % store)
+    positions = get_positions(header, columns)
+    values = np.load(os.path.join(store, "values.npy"), mmap_mode="r")
+    for start in range(0, len(header["index"]), hours_per_chunk):
+        rows = slice(start, start + hours_per_chunk)
+        yield _select(values, header, positions, rows)
+
+
+def iter_frame_chunks(profile, hours_per_chunk, columns=None):
+    """Iterates over a profile held in memory by chunks of consecutive time steps.
+
+    :param pandas.DataFrame profile: profile.
+    :param int hours_per_chunk: number of time steps in each chunk.
+    :param list columns: columns to select. All columns are selected if None.
+    :return: (*generator*) -- data frames with the selected columns.
+    """
+    check_chunk_size(hours_per_chunk)
+    if columns is not None:
+        profile = profile[list(columns)]
+    for start in range(0, len(profile), hours_per_chunk):
+        yield profile.iloc[start : start + hours_per_chunk]
+
+
+def write_csv(profile, f, hours_per_chunk=168, compress=False):
+    """Writes a profile as CSV in a file handle, chunk by chunk, such that the
+    formatted profile is never held in memory. The output is identical to the
+    one of *pandas.DataFrame.to_csv*.
+
+    :param pandas.DataFrame profile: profile.
+    :param io.BufferedIOBase f: binary file handle, e.g. a file in the data store
+        opened via :meth:`powersimdata.data_access.data_access.DataAccess.open_to`.
+    :param int hours_per_chunk: number of time steps formatted at once.
+    :param bool compress: whether the output is compressed with gzip.
+    """
+    check_chunk_size(hours_per_chunk)
+    if compress:
+        with gzip.GzipFile(fileobj=f, mode="wb") as g:
+            write_csv(profile, g, hours_per_chunk)
+        return
+
+    # labels are quoted by pandas when needed
+    f.write(profile.iloc[:0].to_csv().encode())
+    index = profile.index.astype(str)
+    quoted = any(c in label for label in index for c in ',"\r\n')
+    for start in range(0, len(profile), hours_per_chunk):
+        chunk = profile.iloc[start : start + hours_per_chunk]
+        values = chunk.to_numpy()
+        if quoted or values.dtype != np.float64 or np.isnan(values).any():
+            # quoted labels, missing values and other dtypes are formatted by pandas
+            f.write(chunk.to_csv(header=False).encode())
+            continue
+        # repr of python floats is the shortest string parsed back to the value
+        lines = [
+            i + "," + ",".join(map(repr, row)) + "\n"
+            for i, row in zip(index[start : start + hours_per_chunk], values.tolist())
+        ]
+        f.write("".join(lines).encode())
+
+
+def has_single_numeric_dtype(profile):
+    """Checks that all the columns of a profile share a dense numeric dtype.
+
+    :param pandas.DataFrame profile: profile.
+    :return: (*bool*) -- whether the profile can be stored in a numpy array.
+    """
+    dtypes = profile.dtypes.unique()
+    if len(dtypes) != 1 or not isinstance(dtypes[0], np.dtype):
+        return False
+    return dtypes[0].kind in "biuf"
+
+
+def check_chunk_size(hours_per_chunk):
+    """Checks size of chunks.
+
+    :param int hours_per_chunk: number of time steps in each chunk.
+    :raises ValueError: if hours_per_chunk is not a positive integer.
+    """
+    if not isinstance(hours_per_chunk, int) or hours_per_chunk < 1:
+        raise ValueError("hours_per_chunk must be a positive integer")
+
+
+def get_positions(header, columns):
+    """Locates columns in a binary store.
+
+    :param dict header: header of the binary store.
+    :param list columns: columns to locate. All columns if None.
+    :return: (*numpy.ndarray*) -- positions of the columns.
+    :raises KeyError: if some columns are not in the profile.
+    """
+    if columns is None:
+        return np.arange(len(header["columns"]))
+    positions = header["columns"].get_indexer(columns)
+    if (positions == -1).any():
+        missing = [c for c, p in zip(columns, positions) if p == -1]
+        raise KeyError("%s not in profile" % missing)
+    return positions
+
+
+def _select(values, header, positions, rows):
+    """Copies a selection of a memory mapped profile in a data frame.
+
+    :param numpy.memmap values: values of the profile.
+    :param dict header: header of the binary store.
+    :param numpy.ndarray positions: positions of the columns to select.
+    :param slice rows: time steps to select.
+    :return: (*pandas.DataFrame*) -- selection.
+    """
+    # values are stored column by column, i.e. the transpose is in C order
+    selection = values.T[positions, rows]
+    return pd.DataFrame(
+        selection.T, index=header["index"][rows], columns=header["columns"][positions]
+    )
+
+
+def slice_profile(profile, columns=None, start=None, end=None):
+    """Selects columns and time steps of a profile.
+
+    :param pandas.DataFrame profile: profile.
+    :param list columns: columns to select. All columns are selected if None.
+    :param str/pandas.Timestamp start: first time step, included.
+    :param str/pandas.Timestamp end: last time step, included.
+    :return: (*pandas.DataFrame*) -- selection.
+    """
+    if columns is None and start is None and end is None:
+        return profile
+    profile = profile.loc[start:end]
+    return profile if columns is None else profile[list(columns)]
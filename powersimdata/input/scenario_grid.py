@@ -9,21 +9,57 @@ from powersimdata.input.helpers import (
     add_coord_to_grid_data_frames,
     add_interconnect_to_grid_data_frames,
     add_zone_to_grid_data_frames,
+    compact_grid_data_frames,
 )
+from powersimdata.network.network_cache import NetworkCache
+
+cached_tables = [
+    "interconnect",
+    "id2zone",
+    "sub",
+    "bus2sub",
+    "bus",
+    "plant",
+    "branch",
+    "dcline",
+    "gencost",
+    "storage",
+]
 
 
 class ScenarioGrid(AbstractGrid):
-    """File reader for MAT files for scenarios which were run on the server."""
+    """File reader for MAT files for scenarios which were run on the server. The
+    tables built from the MAT file are cached in a *cache* directory next to it
+    so that the file is only parsed once.
+    """
 
-    def __init__(self, filename):
+    def __init__(self, filename, lazy=False, compact=False):
         """Constructor.
 
         :param str filename: path to file.
+        :param bool lazy: if True, tables are only read when first loaded.
+        :param bool/str compact: if True, data frames use categoricals for
+            repeated strings and 32-bit integers for identifiers. If *'float32'*,
+            coordinates are also stored as 32-bit floats.
         """
         super().__init__()
         self._set_data_loc(filename)
+        dirname, basename = os.path.split(filename)
+        self._cache = NetworkCache(
+            dirname,
+            os.path.join(
+                dirname,
+                "cache",
+                os.path.splitext(basename)[0],
+                type(self).__name__,
+            ),
+            pattern=basename,
+        )
 
-        self._build_network()
+        self._compact = compact
+        self._loaded = set()
+        if not lazy:
+            self._build()
 
     def _set_data_loc(self, filename):
         """Sets data location.
@@ -125,6 +161,48 @@ class ScenarioGrid(AbstractGrid):
         """
         pass
 
+    def load(self, name):
+        """Returns a grid attribute, reading the cached table backing it on first
+        call. The network is built from the MAT file if the cache cannot be used.
+
+        :param str name: attribute name.
+        :return: (*object*) -- attribute value.
+        """
+        table = "id2zone" if name == "zone2id" else name
+        if table in cached_tables and table not in self._loaded:
+            tables = self._cache.load([table])
+            if tables is None:
+                self._build()
+            else:
+                self._set_tables(tables)
+        return getattr(self, name)
+
+    def _build(self):
+        """Builds the network, reading the cached tables if possible or the MAT
+        file otherwise.
+        """
+        tables = self._cache.load(cached_tables)
+        if tables is None:
+            self._build_network()
+            self._cache.save({name: getattr(self, name) for name in cached_tables})
+            tables = {name: getattr(self, name) for name in cached_tables}
+        self._set_tables(tables)
+
+    def _set_tables(self, tables):
+        """Sets tables and converts data frames to compact dtypes if requested.
+
+        :param dict tables: tables keyed by name.
+        """
+        for name, table in tables.items():
+            setattr(self, name, table)
+            if name == "id2zone":
+                self.zone2id = {v: k for k, v in table.items()}
+        if self._compact:
+            compact_grid_data_frames(
+                self, float32=self._compact == "float32", names=tables
+            )
+        self._loaded.update(tables)
+
 
 class FromREISE(ScenarioGrid):
     """MATLAB file reader, for MAT files created by REISE/MATPOWER"""
@@ -447,38 +525,36 @@ def format_gencost(data):
     :param pandas.DataFrame data: generation cost data frame.
     :return: (pandas.DataFrame) -- formatted gencost data frame.
     """
-
-    def parse_gencost_row(row):
-        n = int(row["n"])
-        index = id2row[row.name]
-        if row["type"] == 2:
-            for c in range(n):
-                row["c" + str(n - c - 1)] = data.iloc[index, 4 + c]
-        if row["type"] == 1:
-            for c in range(n):
-                p_val = data.iloc[index, 4 + 2 * c]
-                f_val = data.iloc[index, 4 + 2 * c + 1]
-                row["p" + str(c + 1)] = p_val
-                row["f" + str(c + 1)] = f_val
-        return row
-
-    gencost = data.iloc[:, [0, 1, 2, 3]].copy()
-    gencost.rename(
-        columns={0: "type", 1: "startup", 2: "shutdown", 3: "n"}, inplace=True
+    values = data.to_numpy(dtype=float)
+    gencost = pd.DataFrame(
+        values[:, :4], index=data.index, columns=["type", "startup", "shutdown", "n"]
     )
-
-    if 2 in gencost.type.unique():
-        n_max = int(gencost.groupby("type").get_group(2).n.max())
+    cost_type = values[:, 0]
+    n = values[:, 3].astype(int)
+
+    columns = {}
+    polynomial = cost_type == 2
+    if polynomial.any():
+        n_max = n[polynomial].max()
+        coefficients = {
+            "c%d" % (n_max - i - 1): np.zeros(len(data)) for i in range(n_max)
+        }
+        for n_coef in np.unique(n[polynomial]):
+            rows = polynomial & (n == n_coef)
+            for c in range(n_coef):
+                coefficients["c%d" % (n_coef - c - 1)][rows] = values[rows, 4 + c]
+        columns.update(coefficients)
+    piecewise = cost_type == 1
+    if piecewise.any():
+        n_max = n[piecewise].max()
         for i in range(n_max):
-            gencost["c" + str(n_max - i - 1)] = [0.0] * gencost.shape[0]
-    if 1 in gencost.type.unique():
-        n_max = int(gencost.groupby("type").get_group(1).n.max())
-        for i in range(n_max):
-            gencost["p" + str(i + 1)] = [0.0] * gencost.shape[0]
-            gencost["f" + str(i + 1)] = [0.0] * gencost.shape[0]
+            for prefix, offset in [("p", 0), ("f", 1)]:
+                column = np.zeros(len(data))
+                rows = piecewise & (n > i)
+                column[rows] = values[rows, 4 + 2 * i + offset]
+                columns["%s%d" % (prefix, i + 1)] = column
 
-    id2row = {plant_id: row for row, plant_id in enumerate(gencost.index)}
-    gencost = gencost.apply(parse_gencost_row, axis=1)
+    gencost = pd.concat([gencost, pd.DataFrame(columns, index=data.index)], axis=1)
     gencost = gencost.astype({"type": "int", "n": "int"})
 
     return gencost
@@ -498,14 +574,21 @@ def add_information_to_model(grid):
 
 
 def reindex_model(grid):
-    def reset_id():
-        return lambda x: grid.bus.index[x - 1]
+    """Maps the bus numbers used by MATPOWER, i.e. the positions of the buses, to
+    bus ids. Done inplace.
+
+    :param powersimdata.input.ScenarioGrid grid: grid with bus positions.
+    """
+    bus_id = grid.bus.index.to_numpy()
+
+    def reset_id(column):
+        return bus_id[column.to_numpy() - 1]
 
-    grid.plant["bus_id"] = grid.plant["bus_id"].apply(reset_id())
-    grid.branch["from_bus_id"] = grid.branch["from_bus_id"].apply(reset_id())
-    grid.branch["to_bus_id"] = grid.branch["to_bus_id"].apply(reset_id())
+    grid.plant["bus_id"] = reset_id(grid.plant["bus_id"])
+    grid.branch["from_bus_id"] = reset_id(grid.branch["from_bus_id"])
+    grid.branch["to_bus_id"] = reset_id(grid.branch["to_bus_id"])
     if not grid.dcline.empty:
-        grid.dcline["from_bus_id"] = grid.dcline["from_bus_id"].apply(reset_id())
-        grid.dcline["to_bus_id"] = grid.dcline["to_bus_id"].apply(reset_id())
+        grid.dcline["from_bus_id"] = reset_id(grid.dcline["from_bus_id"])
+        grid.dcline["to_bus_id"] = reset_id(grid.dcline["to_bus_id"])
     if not grid.storage["gen"].empty:
-        grid.storage["gen"].bus_id = grid.storage["gen"].bus_id.apply(reset_id())
+        grid.storage["gen"].bus_id = reset_id(grid.storage["gen"].bus_id)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from powersimdata.input.bus_demand import BusDemand
+from powersimdata.scenario.helpers import calculate_bus_demand
+
+
+@pytest.fixture
+def bus():
+    return pd.DataFrame(
+        {"zone_id": [2, 1, 2, 3, 2, 1], "Pd": [1.0, 5.0, 3.0, 0.0, 0.0, 5.0]},
+        index=pd.Index([10, 20, 30, 40, 50, 60], name="bus_id"),
+    )
+
+
+@pytest.fixture
+def demand():
+    return pd.DataFrame(
+        np.random.default_rng(0).random((48, 3)) * 100,
+        index=pd.date_range("2016-01-01", periods=48, freq="H", name="UTC"),
+        columns=[1, 2, 3],
+    )
+
+
+def test_to_frame(bus, demand):
+    bus_demand = BusDemand(bus, demand)
+    # share of the Pd of the zone, zone 3 has no Pd
+    share = [0.25, 0.5, 0.75, 0.0, 0.0, 0.5]
+    expected = demand[[2, 1, 2, 3, 2, 1]] * share
+    expected.columns = bus.index
+    assert bus_demand.shape == expected.shape
+    assert_frame_equal(bus_demand.to_frame(), expected)
+    assert_frame_equal(calculate_bus_demand(bus, demand), expected)
+    assert isinstance(calculate_bus_demand(bus, demand, lazy=True), BusDemand)
+
+
+def test_loc(bus, demand):
+    bus_demand = BusDemand(bus, demand)
+    expected = bus_demand.to_frame()
+    start, end = "2016-01-01 05:00", "2016-01-02 03:00"
+    assert_frame_equal(bus_demand.loc[start:end], expected.loc[start:end])
+    assert_frame_equal(
+        bus_demand.loc[start:end, [60, 10]], expected.loc[start:end, [60, 10]]
+    )
+    assert_series_equal(bus_demand.loc[:, 30], expected.loc[:, 30])
+    assert_series_equal(bus_demand.loc[start, [20, 40]], expected.loc[start, [20, 40]])
+    assert bus_demand.loc[end, 60] == expected.loc[end, 60]
+    with pytest.raises(KeyError):
+        bus_demand.loc[:, 70]
+
+
+def test_sum(bus, demand):
+    bus_demand = BusDemand(bus, demand)
+    expected = bus_demand.to_frame()
+    assert_series_equal(bus_demand.sum(), expected.sum())
+    assert_series_equal(bus_demand.sum(axis=1), expected.sum(axis=1))
+    with pytest.raises(ValueError):
+        bus_demand.sum(axis=2)
+
+
+def test_iter_chunks(bus, demand):
+    bus_demand = BusDemand(bus, demand)
+    expected = bus_demand.to_frame()
+    chunks = list(bus_demand.iter_chunks(hours_per_chunk=20, columns=[50, 20]))
+    assert [len(c) for c in chunks] == [20, 20, 8]
+    assert_frame_equal(pd.concat(chunks), expected[[50, 20]])
+    assert_frame_equal(pd.concat(bus_demand.iter_chunks()), expected)
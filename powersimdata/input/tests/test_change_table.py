@@ -467,3 +467,12 @@ def test_change_table_clear_bad_type(ct):
 def test_change_table_clear_bad_key(ct):
     with pytest.raises(ValueError):
         ct.clear({"plantttt"})
+
+
+def test_fingerprint(ct):
+    fingerprint = ct.fingerprint()
+    ct.scale_plant_capacity("solar", zone_name={"Idaho": 2})
+    assert ct.fingerprint() != fingerprint
+    other = ChangeTable(grid)
+    other.scale_plant_capacity("solar", zone_name={"Idaho": 2.0})
+    assert ct.fingerprint() == other.fingerprint()
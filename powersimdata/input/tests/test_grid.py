@@ -3,14 +3,25 @@ import copy
 import numpy as np
 import pandas as pd
 import pytest
+from scipy.io import savemat
 
 from powersimdata.input.grid import Grid
-from powersimdata.input.helpers import add_column_to_data_frame
-from powersimdata.input.scenario_grid import format_gencost, link
+from powersimdata.input.helpers import (
+    add_column_to_data_frame,
+    add_coord_to_grid_data_frames,
+    add_zone_to_grid_data_frames,
+    compact_data_frame,
+    get_bus_demand_operator,
+    get_indexer,
+)
+from powersimdata.input.scenario_grid import FromREISE, format_gencost, link
 from powersimdata.network.usa_tamu.usa_tamu_model import (
     TAMU,
+    _concat_partitions,
     check_interconnect,
 )
+from powersimdata.scenario.helpers import calculate_bus_demand
+from powersimdata.tests.mock_grid import MockGrid
 
 
 def test_interconnect_type():
@@ -47,6 +58,64 @@ def test_add_column_to_data_frame():
     assert np.array_equal(df.c.values, [True, True, False])
 
 
+def test_get_indexer():
+    index = pd.Index([10, 20, 30])
+    assert np.array_equal(get_indexer(index, [30, 10, 10]), [2, 0, 0])
+    with pytest.raises(KeyError):
+        get_indexer(index, [10, 40])
+
+
+def test_calculate_bus_demand():
+    bus = pd.DataFrame(
+        {"zone_id": [2, 1, 2, 3, 2], "Pd": [1.0, 5.0, 3.0, 0.0, 0.0]},
+        index=pd.Index([10, 20, 30, 40, 50], name="bus_id"),
+    )
+    demand = pd.DataFrame(
+        {1: [10.0, 20.0], 2: [8.0, 4.0], 3: [1.0, 1.0]},
+        index=pd.date_range("2016-01-01", periods=2, freq="H", name="UTC"),
+    )
+    expected = pd.DataFrame(
+        [[2.0, 10.0, 6.0, 0.0, 0.0], [1.0, 20.0, 3.0, 0.0, 0.0]],
+        index=demand.index,
+        columns=bus.index,
+    )
+    pd.testing.assert_frame_equal(calculate_bus_demand(bus, demand), expected)
+    # zone 3 has demand but no Pd, its buses get nothing
+    assert (calculate_bus_demand(bus, demand)[40] == 0).all()
+    with pytest.raises(ValueError, match="zones missing from demand profile: 1, 3"):
+        calculate_bus_demand(bus, demand[[2]])
+
+    zone_id, operator = get_bus_demand_operator(bus)
+    assert zone_id.tolist() == [1, 2, 3]
+    assert operator.shape == (5, 3)
+    assert operator.nnz == 5
+    assert get_bus_demand_operator(bus.copy())[1] is operator
+    assert get_bus_demand_operator(bus.assign(Pd=1))[1] is not operator
+
+
+def test_add_zone_and_coord_to_grid_data_frames():
+    grid = MockGrid(
+        {
+            "sub": {"sub_id": [1, 2], "lat": [40.0, 45.0], "lon": [-100.0, -90.0]},
+            "bus2sub": {"bus_id": [7, 8, 9], "sub_id": [2, 1, 2]},
+            "bus": {"bus_id": [7, 8, 9], "zone_id": [1, 2, 1]},
+            "plant": {"plant_id": [0, 1], "bus_id": [9, 8]},
+            "branch": {"branch_id": [0], "from_bus_id": [7], "to_bus_id": [8]},
+        }
+    )
+    grid.plant = grid.plant[["bus_id"]]
+    grid.branch = grid.branch[["from_bus_id", "to_bus_id"]]
+    add_zone_to_grid_data_frames(grid)
+    add_coord_to_grid_data_frames(grid)
+    assert grid.plant.zone_id.tolist() == [1, 2]
+    assert grid.plant.zone_name.tolist() == ["zone1", "zone2"]
+    assert grid.plant.lat.tolist() == [45.0, 40.0]
+    assert grid.bus.lon.tolist() == [-90.0, -100.0, -90.0]
+    assert grid.branch.from_zone_name.tolist() == ["zone1"]
+    assert grid.branch.to_zone_id.tolist() == [2]
+    assert grid.branch.to_lat.tolist() == [40.0]
+
+
 def test_grid_type():
     g = Grid(["USA"])
     assert isinstance(g, Grid)
@@ -81,6 +150,23 @@ def test_drop_two_interconnect():
         assert interconnect not in model.dcline.to_interconnect.unique()
 
 
+def test_partitions_match_full_network():
+    usa = TAMU(["USA"])
+    model = TAMU(["Texas", "Western"])
+    for name in ["sub", "bus2sub", "bus", "plant", "branch"]:
+        table = getattr(usa, name)
+        expected = table[table.interconnect.isin(["Texas", "Western"])]
+        assert getattr(model, name).equals(expected)
+    assert list(model.id2zone) == list(model.bus.zone_id.unique())
+
+
+def test_concat_partitions_restores_order():
+    table = pd.DataFrame({"a": [1, 2, 3, 4]}, index=[10, 20, 30, 40])
+    positions = [np.array([1, 3]), np.array([0, 2])]
+    tables = [table.take(p) for p in positions]
+    assert _concat_partitions(tables, positions).equals(table)
+
+
 def test_format_gencost_polynomial_only_same_n():
     df_input = pd.DataFrame(
         {
@@ -367,6 +453,58 @@ def test_link():
     assert np.array_equal(output["c"], values[2])
 
 
+@pytest.fixture
+def reise_mat(tmp_path):
+    bus = np.zeros((2, 17))
+    bus[:, 0] = [1, 2]
+    bus[:, 6] = [301, 302]
+    gen = np.zeros((2, 25))
+    gen[:, 0] = [2, 1]
+    branch = np.zeros((2, 21))
+    branch[:, :2] = [[1, 2], [2, 1]]
+    sub = np.array(
+        [["sub1", 1, 30.0, -97.0, "Texas"], ["sub2", 2, 31.0, -96.0, "Texas"]],
+        dtype=object,
+    )
+    mpc = {
+        "bus": bus,
+        "busid": np.array([101, 102]),
+        "gen": gen,
+        "genid": np.array([7, 8]),
+        "genfuel": np.array(["ng", "coal"], dtype=object),
+        "genfuelcost": np.array([1.0, 2.0]),
+        "heatratecurve": np.ones((2, 3)),
+        "gencost_orig": np.array([[2, 0, 0, 3, 1.0, 2.0, 3.0]] * 2),
+        "gencost": np.array([[2, 0, 0, 3, 1.0, 2.0, 3.0]] * 2),
+        "branch": branch,
+        "branchid": np.array([11, 12]),
+        "branchdevicetype": np.array(["Line", "Line"], dtype=object),
+        "sub": sub,
+        "subid": np.array([5, 6]),
+        "bus2sub": np.array([[5, "Texas"], [6, "Texas"]], dtype=object),
+        "zone": np.array([[301, "East"], [302, "Coast"]], dtype=object),
+    }
+    filename = str(tmp_path / "1_grid.mat")
+    savemat(filename, {"mdi": {"mpc": mpc}})
+    return filename
+
+
+def test_from_reise_is_cached(reise_mat, monkeypatch):
+    grid = FromREISE(reise_mat)
+    assert grid.plant.bus_id.tolist() == [102, 101]
+    assert grid.branch.from_bus_id.tolist() == [101, 102]
+    assert grid.id2zone == {301: "East", 302: "Coast"}
+
+    def fail(*args, **kwargs):
+        raise AssertionError("MAT file should not be read")
+
+    monkeypatch.setattr("powersimdata.input.scenario_grid.loadmat", fail)
+    cached = FromREISE(reise_mat)
+    assert cached.plant.equals(grid.plant)
+    assert cached.zone2id == grid.zone2id
+    assert Grid([None], source=reise_mat, lazy=True).bus.equals(grid.bus)
+
+
 @pytest.fixture(scope="session")
 def base_texas():
     return Grid(["Texas"])
@@ -381,6 +519,77 @@ def test_deepcopy_works(base_texas):
     assert isinstance(copy.deepcopy(base_texas), Grid)
 
 
+def test_copy_shares_data_frames(base_texas):
+    grid = copy.copy(base_texas)
+    assert isinstance(grid, Grid)
+    assert grid.plant is base_texas.plant
+    assert grid.gencost["before"] is base_texas.gencost["before"]
+    grid.gencost["before"] = grid.gencost["before"].copy()
+    assert grid.gencost["before"] is not base_texas.gencost["before"]
+
+
+def test_lazy_grid_loads_tables_on_access(base_texas):
+    grid = Grid(["Texas"], lazy=True)
+    assert "plant" not in grid.__dict__
+    assert grid.zone2id == base_texas.zone2id
+    assert "plant" not in grid.__dict__
+    assert grid.plant.equals(base_texas.plant)
+    assert grid == base_texas
+    with pytest.raises(AttributeError):
+        grid.foo
+
+
+def test_lazy_grid_copy(base_texas):
+    grid = Grid(["Texas"], lazy=True)
+    assert copy.deepcopy(grid) == base_texas
+    assert copy.copy(grid).bus is grid.bus
+
+
+def test_compact_data_frame():
+    df = pd.DataFrame(
+        {
+            "bus_id": [1, 2, 2],
+            "type": ["wind", "solar", "wind"],
+            "lat": [30.0, 31.0, 32.0],
+            "Pmax": [10.0, 20.0, 30.0],
+        }
+    )
+    assert compact_data_frame(df).dtypes.to_dict() == {
+        "bus_id": np.int32,
+        "type": "category",
+        "lat": np.float64,
+        "Pmax": np.float64,
+    }
+    compact = compact_data_frame(df, float32=True)
+    assert compact.lat.dtype == np.float32
+    assert compact.Pmax.dtype == np.float64
+    assert compact_data_frame(compact, float32=True) is compact
+
+
+def test_compact_grid(base_texas):
+    grid = Grid(["Texas"], compact=True)
+    assert grid.plant.type.dtype == "category"
+    assert grid.branch.from_bus_id.dtype == np.int32
+    assert grid.gencost["after"] is grid.gencost["before"]
+    assert grid == base_texas
+    assert base_texas == grid
+    assert Grid(["Texas"], lazy=True, compact=True) == grid
+    with pytest.raises(ValueError):
+        Grid(["Texas"], compact="float16")
+
+
+def test_grid_fingerprint(base_texas, base_western):
+    fingerprint = base_texas.fingerprint()
+    assert copy.deepcopy(base_texas).fingerprint() == fingerprint
+    assert base_western.fingerprint() != fingerprint
+
+    grid = copy.copy(base_texas)
+    assert grid.fingerprint() == fingerprint
+    grid.plant = grid.plant.assign(Pmax=0)
+    assert grid.fingerprint() != fingerprint
+    assert base_texas.fingerprint() == fingerprint
+
+
 def test_grid_eq_success_simple(base_texas):
     assert base_texas == Grid(["Texas"])
 
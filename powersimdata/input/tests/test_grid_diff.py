@@ -0,0 +1,76 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from powersimdata.input.grid import Grid
+from powersimdata.input.grid_diff import grid_diff, table_diff
+
+
+@pytest.fixture
+def table():
+    return pd.DataFrame(
+        {"Pmax": [10.0, 20.0, np.nan], "type": ["coal", "wind", None]},
+        index=pd.Index([1, 2, 3], name="plant_id"),
+    )
+
+
+def test_table_diff_equal(table):
+    assert table_diff(table, table.copy()) == {}
+
+
+def test_table_diff_rows(table):
+    test = table.drop(1).append(pd.DataFrame({"Pmax": [5.0], "type": ["ng"]}, [4]))
+    test.loc[2, "type"] = "solar"
+    diff = table_diff(table, test)
+    assert diff == {
+        "added": [4],
+        "removed": [1],
+        "changed": [2],
+        "changed_columns": ["type"],
+    }
+
+
+def test_table_diff_ignores_row_order(table):
+    assert table_diff(table, table.iloc[::-1]) == {}
+
+
+def test_table_diff_columns(table):
+    test = table.drop(columns="type").assign(Pmin=0)
+    diff = table_diff(table, test)
+    assert diff == {"added_columns": ["Pmin"], "removed_columns": ["type"]}
+    assert table_diff(table, test, exclude=["type", "Pmin"]) == {}
+
+
+def test_table_diff_tolerance(table):
+    test = table.assign(Pmax=table.Pmax * (1 + 1e-9))
+    assert table_diff(table, test) == {"changed": [1, 2], "changed_columns": ["Pmax"]}
+    assert table_diff(table, test, rtol=1e-6) == {}
+
+
+def test_table_diff_dict():
+    ref = {"a": 1, "b": [1, 2], "c": "x"}
+    test = {"a": 1.0, "b": [1, 3], "d": None}
+    diff = table_diff(ref, test)
+    assert diff == {"added": ["d"], "removed": ["c"], "changed": ["b"]}
+
+
+def test_table_diff_errors(table):
+    with pytest.raises(TypeError):
+        table_diff(table, {})
+    with pytest.raises(ValueError):
+        table_diff(table, pd.concat([table, table]))
+
+
+def test_grid_diff_change():
+    ref = Grid(["Texas"])
+    test = copy.deepcopy(ref)
+    plant_id = test.plant.index[0]
+    test.plant.loc[plant_id, "Pmax"] *= 2
+    test.branch = test.branch.drop(test.branch.index[-1])
+    diff = grid_diff(ref, test)
+    assert diff.keys() == {"plant", "branch"}
+    assert diff["plant"] == {"changed": [plant_id], "changed_columns": ["Pmax"]}
+    assert diff["branch"] == {"removed": [ref.branch.index[-1]]}
+    assert grid_diff(ref, test, exclude={"plant": ["Pmax"], "branch": None}) == {}
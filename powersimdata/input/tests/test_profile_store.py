@@ -0,0 +1,162 @@
+import gzip
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from powersimdata.input import input_data
+from powersimdata.input.input_data import InputData, _read_data
+from powersimdata.input.profile_store import (
+    get_store_path,
+    is_stored,
+    iter_frame_chunks,
+    iter_store_chunks,
+    read_profile,
+    write_csv,
+    write_profile,
+)
+from powersimdata.utility import server_setup
+
+
+@pytest.fixture
+def profile_csv(tmp_path):
+    index = pd.date_range("2016-01-01", periods=24, freq="H", name="UTC")
+    profile = pd.DataFrame(
+        np.random.default_rng(0).random((24, 5)), index=index, columns=range(101, 106)
+    )
+    filepath = str(tmp_path / "texas_wind_vTest.csv")
+    profile.to_csv(filepath)
+    return filepath
+
+
+def test_read_data_converts_profile(profile_csv):
+    expected = pd.read_csv(profile_csv, index_col=0, parse_dates=True)
+    expected.columns = expected.columns.astype(int)
+
+    assert not is_stored(profile_csv)
+    assert_frame_equal(_read_data(profile_csv), expected)
+    assert is_stored(profile_csv)
+    assert_frame_equal(read_profile(profile_csv), expected)
+    assert_frame_equal(_read_data(profile_csv), expected)
+
+
+def test_store_is_stale_when_csv_changes(profile_csv):
+    _read_data(profile_csv)
+    profile = read_profile(profile_csv) * 2
+    profile.to_csv(profile_csv)
+    os.utime(profile_csv, ns=(0, 0))
+    assert not is_stored(profile_csv)
+    assert_frame_equal(_read_data(profile_csv), profile)
+
+
+def test_store_is_used_without_csv(profile_csv):
+    profile = _read_data(profile_csv)
+    os.remove(profile_csv)
+    assert is_stored(profile_csv)
+    assert_frame_equal(_read_data(profile_csv), profile)
+
+
+def test_write_profile_requires_single_numeric_dtype(profile_csv):
+    profile = pd.DataFrame({"a": [1.0], "b": ["x"]})
+    assert not write_profile(profile, profile_csv)
+    assert not os.path.exists(get_store_path(profile_csv))
+
+
+@pytest.mark.parametrize("stored", [False, True])
+def test_read_data_selection(profile_csv, stored):
+    profile = _read_data(profile_csv)
+    if not stored:
+        os.remove(os.path.join(get_store_path(profile_csv), "header.pkl"))
+    start, end = "2016-01-01 03:00", "2016-01-01 10:00"
+    selection = _read_data(profile_csv, columns=[104, 102], start=start, end=end)
+    assert_frame_equal(selection, profile.loc[start:end, [104, 102]])
+    assert_frame_equal(_read_data(profile_csv, start=start), profile.loc[start:])
+    assert_frame_equal(_read_data(profile_csv, columns=[103]), profile[[103]])
+    with pytest.raises(KeyError):
+        _read_data(profile_csv, columns=[999])
+
+
+def test_input_data_cache(profile_csv, monkeypatch):
+    local_dir = os.path.dirname(profile_csv)
+    monkeypatch.setattr(server_setup, "LOCAL_DIR", local_dir)
+    monkeypatch.setattr(server_setup, "BASE_PROFILE_DIR", "")
+    monkeypatch.setattr(input_data, "_cache", input_data.MemoryCache(copy=False))
+    info = {"interconnect": "Texas", "base_wind": "vTest"}
+
+    profile = InputData().get_data(info, "wind")
+    assert InputData.cache_stats()["misses"] == 1
+    with pytest.raises(ValueError, match="read-only"):
+        profile.iloc[0, 0] = 0
+
+    cached = InputData().get_data(info, "wind")
+    assert InputData.cache_stats()["hits"] == 1
+    assert_frame_equal(cached, profile)
+    assert np.shares_memory(cached.to_numpy(), profile.to_numpy())
+
+    selection = InputData().get_data(info, "wind", columns=[102], end="2016-01-01")
+    assert_frame_equal(selection, profile.loc[:"2016-01-01", [102]])
+    assert InputData.cache_stats()["hits"] == 2
+
+
+def test_iter_chunks(profile_csv):
+    profile = _read_data(profile_csv)
+    store = get_store_path(profile_csv)
+    chunks = list(iter_store_chunks(store, 10, columns=[105, 101]))
+    assert [len(c) for c in chunks] == [10, 10, 4]
+    assert_frame_equal(pd.concat(chunks), profile[[105, 101]])
+
+    chunks = list(iter_frame_chunks(profile, 24))
+    assert len(chunks) == 1
+    assert_frame_equal(chunks[0], profile)
+    with pytest.raises(ValueError):
+        next(iter_store_chunks(store, 0))
+
+
+def test_input_data_iter_chunks(profile_csv, monkeypatch):
+    monkeypatch.setattr(server_setup, "LOCAL_DIR", os.path.dirname(profile_csv))
+    monkeypatch.setattr(server_setup, "BASE_PROFILE_DIR", "")
+    monkeypatch.setattr(input_data, "_cache", input_data.MemoryCache(copy=False))
+    info = {"interconnect": "Texas", "base_wind": "vTest"}
+
+    chunks = list(InputData().iter_chunks(info, "wind", hours_per_chunk=5))
+    assert InputData.cache_stats()["entries"] == 1
+    assert_frame_equal(pd.concat(chunks), InputData().get_data(info, "wind"))
+
+    input_data._cache.clear()
+    chunks = InputData().iter_chunks(info, "wind", hours_per_chunk=5, columns=[102])
+    assert_frame_equal(pd.concat(chunks), _read_data(profile_csv)[[102]])
+    assert InputData.cache_stats()["entries"] == 0
+    with pytest.raises(ValueError):
+        InputData().iter_chunks({"id": "1"}, "ct")
+
+
+def test_write_csv(profile_csv):
+    profile = _read_data(profile_csv)
+    profile.iloc[3, 2] = 1e-20
+    f = io.BytesIO()
+    write_csv(profile, f, hours_per_chunk=10)
+    assert f.getvalue().decode() == profile.to_csv()
+
+    profile.iloc[15, 1] = np.nan
+    f = io.BytesIO()
+    write_csv(profile, f, hours_per_chunk=10, compress=True)
+    assert gzip.decompress(f.getvalue()).decode() == profile.to_csv()
+
+
+def test_write_csv_quotes_labels():
+    profile = pd.DataFrame(
+        [[1.5, 2.0, 0.1]],
+        index=pd.Index(["x,y"], name="UTC,1"),
+        columns=["a,b", 'c"d', 3],
+    )
+    f = io.BytesIO()
+    write_csv(profile, f)
+    assert f.getvalue().decode() == profile.to_csv()
+
+    profile.index = pd.Index(["2016-01-01"], name=None)
+    f = io.BytesIO()
+    write_csv(profile, f)
+    assert f.getvalue().decode() == profile.to_csv()
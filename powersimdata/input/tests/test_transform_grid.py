@@ -48,6 +48,18 @@ def test_that_only_capacities_are_modified_when_scaling_renewable_gen(ct):
     assert new_grid == ref_grid
 
 
+def test_that_only_modified_tables_are_copied(ct):
+    ct.scale_plant_capacity("coal", zone_name={"Colorado": 2.0})
+    ref_grid = copy.deepcopy(grid)
+    new_grid = TransformGrid(grid, ct.ct).get_grid()
+
+    assert new_grid.plant is not grid.plant
+    assert new_grid.gencost["before"] is not grid.gencost["before"]
+    for name in ["bus", "bus2sub", "sub", "branch", "dcline"]:
+        assert getattr(new_grid, name) is getattr(grid, name)
+    assert grid == ref_grid
+
+
 def test_scale_gen_capacity_one_zone(ct):
     gen_type = "coal"
     zone = "Colorado"
@@ -432,6 +444,16 @@ def test_add_gen_add_entries_in_plant_data_frame(ct):
     assert np.array_equal(new_status[-len(new_plant) :], np.array([1] * len(new_plant)))
 
 
+def test_add_gen_keeps_compact_dtypes(ct):
+    compact_grid = Grid(["USA"], compact=True)
+    ct.add_plant([{"type": "solar", "bus_id": 2050363, "Pmax": 85}])
+    new_grid = TransformGrid(compact_grid, ct.ct).get_grid()
+
+    assert new_grid.plant.type.dtype == "category"
+    assert new_grid.plant.bus_id.dtype == np.int32
+    assert new_grid == TransformGrid(grid, ct.ct).get_grid()
+
+
 def test_add_gen_add_entries_in_gencost_data_frame(ct):
     new_plant = [
         {"type": "solar", "bus_id": 2050363, "Pmax": 15},
@@ -1,11 +1,17 @@
+import copy
+import os
+
 import numpy as np
+import pandas as pd
 import pytest
 
+from powersimdata.input import transform_profile
 from powersimdata.input.change_table import ChangeTable
 from powersimdata.input.grid import Grid
 from powersimdata.input.input_data import InputData
 from powersimdata.input.transform_grid import TransformGrid
 from powersimdata.input.transform_profile import TransformProfile
+from powersimdata.utility import server_setup
 
 interconnect = ["Western"]
 param = {
@@ -392,3 +398,159 @@ def test_new_wind_profile(base_grid, base_wind):
 @pytest.mark.ssh
 def test_new_hydro_profile(base_grid, base_hydro):
     _check_profile_of_new_plants_are_produced_correctly(base_grid, base_hydro, "hydro")
+
+
+class MockInputData:
+    def __init__(self, grid):
+        index = pd.date_range("2016-01-01", periods=48, freq="H", name="UTC")
+        rng = np.random.default_rng(0)
+        plant = grid.plant
+        self.profiles = {
+            "demand": pd.DataFrame(
+                rng.random((48, len(grid.id2zone))),
+                index=index,
+                columns=list(grid.id2zone),
+            )
+        }
+        for resource in ["hydro", "solar", "wind"]:
+            plant_id = plant.index[plant.type.str.startswith(resource)]
+            self.profiles[resource] = pd.DataFrame(
+                rng.random((48, len(plant_id))), index=index, columns=plant_id
+            )
+
+    def get_data(self, scenario_info, field_name):
+        return self.profiles[field_name].copy()
+
+
+@pytest.fixture
+def local_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(server_setup, "LOCAL_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _get_mock_profile(base_grid, ct, name):
+    grid = TransformGrid(base_grid, ct).get_grid()
+    info = {"interconnect": "_".join(interconnect), "base_%s" % name: "vMock"}
+    tp = TransformProfile(info, grid, ct)
+    tp._input_data = MockInputData(base_grid)
+    return tp._input_data.profiles[name], tp.get_profile(name)
+
+
+def test_mock_wind_is_scaled_by_zone_and_id(base_grid, local_dir):
+    ct = ChangeTable(base_grid)
+    wind = base_grid.plant.query("type == 'wind'")
+    offshore = base_grid.plant.query("type == 'wind_offshore'")
+    ct.scale_plant_capacity("wind", zone_name={wind.zone_name.iloc[0]: 2})
+    ct.scale_plant_capacity("wind", plant_id={wind.index[0]: 3, wind.index[-1]: 0.5})
+    ct.scale_plant_capacity("wind_offshore", zone_name={offshore.zone_name.iloc[0]: 4})
+    base_profile, profile = _get_mock_profile(base_grid, ct.ct, "wind")
+
+    factor = pd.Series(1.0, index=base_profile.columns)
+    factor[wind.index[wind.zone_id == wind.zone_id.iloc[0]]] *= 2
+    factor[offshore.index[offshore.zone_id == offshore.zone_id.iloc[0]]] *= 4
+    factor[wind.index[0]] *= 3
+    factor[wind.index[-1]] *= 0.5
+    assert profile.equals(base_profile.multiply(factor, axis=1))
+
+
+def test_mock_new_plants_are_added_and_not_scaled(base_grid, local_dir):
+    ct = ChangeTable(base_grid)
+    solar = base_grid.plant.query("type == 'solar'")
+    ct.scale_plant_capacity("solar", zone_name={solar.zone_name.iloc[0]: 2})
+    bus_id = solar.bus_id.iloc[0]
+    ct.add_plant([{"type": "solar", "bus_id": bus_id, "Pmax": 100}])
+    base_profile, profile = _get_mock_profile(base_grid, ct.ct, "solar")
+
+    neighbor_id = ct.ct["new_plant"][0]["plant_id_neighbor"]
+    new_id = profile.columns[-1]
+    assert len(profile.columns) == len(base_profile.columns) + 1
+    assert profile[new_id].equals(
+        base_profile[neighbor_id] * (100 / base_grid.plant.loc[neighbor_id, "Pmax"])
+    )
+
+
+def test_mock_demand_is_scaled(base_grid, local_dir):
+    ct = ChangeTable(base_grid)
+    zone_id = list(base_grid.id2zone)[:2]
+    ct.scale_demand(
+        zone_name={
+            base_grid.id2zone[zone_id[0]]: 1.5,
+            base_grid.id2zone[zone_id[1]]: 0.5,
+        }
+    )
+    base_profile, profile = _get_mock_profile(base_grid, ct.ct, "demand")
+    factor = pd.Series(1.0, index=base_profile.columns)
+    factor[zone_id] = [1.5, 0.5]
+    assert profile.equals(base_profile.multiply(factor, axis=1))
+
+
+def test_transformed_profile_is_cached(base_grid, local_dir):
+    ct = ChangeTable(base_grid)
+    hydro = base_grid.plant.query("type == 'hydro'")
+    ct.scale_plant_capacity("hydro", plant_id={hydro.index[0]: 2})
+    ct.scale_branch_capacity(zone_name={base_grid.id2zone[hydro.zone_id.iloc[0]]: 2})
+    _, profile = _get_mock_profile(base_grid, ct.ct, "hydro")
+    assert len(list(local_dir.glob("raw/transformed/western_hydro_vMock/*"))) == 1
+
+    info = {"interconnect": "Western", "base_hydro": "vMock"}
+    ct_hydro = {"hydro": ct.ct["hydro"]}
+    tp = TransformProfile(info, base_grid, ct_hydro)
+    tp._input_data = None
+    assert profile.equals(tp.get_profile("hydro"))
+
+    ct_hydro["hydro"]["plant_id"][hydro.index[0]] = 3
+    _, new_profile = _get_mock_profile(base_grid, ct_hydro, "hydro")
+    assert not new_profile.equals(profile)
+    assert len(list(local_dir.glob("raw/transformed/western_hydro_vMock/*"))) == 2
+
+
+def test_cache_location_depends_on_base_capacity_of_neighbors(
+    base_grid, local_dir, monkeypatch
+):
+    ct = ChangeTable(base_grid)
+    solar = base_grid.plant.query("type == 'solar'")
+    ct.add_plant([{"type": "solar", "bus_id": solar.bus_id.iloc[0], "Pmax": 100}])
+    grid = TransformGrid(base_grid, ct.ct).get_grid()
+    info = {"interconnect": "_".join(interconnect), "base_solar": "vMock"}
+    location = TransformProfile(info, grid, ct.ct)._get_cache_location("solar")
+
+    neighbor_id = ct.ct["new_plant"][0]["plant_id_neighbor"]
+    updated_grid = copy.deepcopy(base_grid)
+    updated_grid.plant.loc[neighbor_id, "Pmax"] *= 2
+    monkeypatch.setattr(transform_profile, "Grid", lambda *args: updated_grid)
+    tp = TransformProfile(info, grid, ct.ct)
+    assert tp._get_cache_location("solar") != location
+
+
+def test_unchanged_profile_is_not_cached(base_grid, local_dir):
+    ct = ChangeTable(base_grid)
+    ct.scale_demand(zone_id={list(base_grid.id2zone)[0]: 2})
+    base_profile, profile = _get_mock_profile(base_grid, ct.ct, "wind")
+    assert profile.equals(base_profile)
+    assert not (local_dir / "raw" / "transformed").exists()
+
+
+def test_evict_transformed_profiles(base_grid, local_dir, monkeypatch):
+    cache = local_dir / "raw" / "transformed"
+    stores = []
+    for i, name in enumerate(["western_wind_vMock", "western_solar_vMock"] * 2):
+        store = cache / name / str(i)
+        store.mkdir(parents=True)
+        (store / "values.npy").write_bytes(b"0" * 100)
+        os.utime(store, (1000 + i, 1000 + i))
+        stores.append(str(store))
+
+    assert transform_profile.evict_transformed_profiles(max_bytes=400) == []
+    removed = transform_profile.evict_transformed_profiles(max_bytes=250)
+    assert removed == stores[:2]
+    removed = transform_profile.evict_transformed_profiles(max_bytes=0, keep=stores[2])
+    assert removed == stores[3:]
+    assert [str(p) for p in cache.glob("*/*")] == [stores[2]]
+
+    monkeypatch.setattr(transform_profile, "TRANSFORMED_CACHE_BYTES", 0)
+    ct = ChangeTable(base_grid)
+    solar = base_grid.plant.query("type == 'solar'")
+    ct.scale_plant_capacity("solar", plant_id={solar.index[0]: 2})
+    _get_mock_profile(base_grid, ct.ct, "solar")
+    assert len(list(cache.glob("*/*"))) == 1
+    assert [str(p) for p in cache.glob("*/*")] != [stores[2]]
@@ -3,6 +3,7 @@ import copy
 import numpy as np
 import pandas as pd
 
+from powersimdata.input.helpers import compact_grid_data_frames
 from powersimdata.utility.distance import haversine
 
 
@@ -15,8 +16,9 @@ class TransformGrid(object):
         :param powersimdata.input.grid.Grid grid: a Grid object.
         :param dict ct: change table.
         """
-        self.grid = copy.deepcopy(grid)
+        self.grid = copy.copy(grid)
         self.ct = copy.deepcopy(ct)
+        self._copied = set()
         self.gen_types = [
             "biomass",
             "coal",
@@ -39,8 +41,32 @@ class TransformGrid(object):
         """
         if bool(self.ct):
             self._apply_change_table()
+            compact = getattr(self.grid, "compact", False)
+            if compact:
+                # appended rows turn categoricals with new values into objects
+                compact_grid_data_frames(self.grid, float32=compact == "float32")
         return self.grid
 
+    def _copy_on_write(self, name):
+        """Copies a table of the grid the first time it is about to be modified in
+        place, since tables are shared with the original grid.
+
+        :param str name: name of the table.
+        """
+        if name in self._copied:
+            return
+        if name == "gencost":
+            gencost = self.grid.gencost
+            before = gencost["before"].copy()
+            if gencost["after"] is gencost["before"]:
+                gencost["after"] = before
+            gencost["before"] = before
+        elif name == "storage":
+            self.grid.storage["genfuel"] = list(self.grid.storage["genfuel"])
+        else:
+            setattr(self.grid, name, getattr(self.grid, name).copy())
+        self._copied.add(name)
+
     def _apply_change_table(self):
         """Apply changes listed in change table to the grid."""
         for g in self.gen_types:
@@ -100,6 +126,7 @@ class TransformGrid(object):
         :param str gen_type: type of generator.
         """
         cost_key = f"{gen_type}_cost"
+        self._copy_on_write("gencost")
         if "zone_id" in self.ct[cost_key].keys():
             for zone_id, factor in self.ct[cost_key]["zone_id"].items():
                 plant_id = (
@@ -118,6 +145,7 @@ class TransformGrid(object):
         :param str gen_type: type of generator.
         """
         pmin_key = f"{gen_type}_pmin"
+        self._copy_on_write("plant")
         if "zone_id" in self.ct[pmin_key].keys():
             for zone_id, factor in self.ct[pmin_key]["zone_id"].items():
                 plant_id = (
@@ -136,6 +164,7 @@ class TransformGrid(object):
         :param int/list plant_id: plant identification number(s).
         :param float factor: scaling factor.
         """
+        self._copy_on_write("plant")
         self.grid.plant.loc[plant_id, "Pmax"] *= factor
         self.grid.plant.loc[plant_id, "Pmin"] *= factor
 
@@ -147,6 +176,7 @@ class TransformGrid(object):
         :param float factor: scaling factor.
         :return:
         """
+        self._copy_on_write("gencost")
         self.grid.gencost["before"].loc[plant_id, "c0"] *= factor
         if factor != 0:
             self.grid.gencost["before"].loc[plant_id, "c2"] /= factor
@@ -171,11 +201,13 @@ class TransformGrid(object):
         :param int/list branch_id: branch identification number(s)
         :param float factor: scaling factor
         """
+        self._copy_on_write("branch")
         self.grid.branch.loc[branch_id, "rateA"] *= factor
         self.grid.branch.loc[branch_id, "x"] /= factor
 
     def _scale_dcline(self):
         """Scales capacity of HVDC lines."""
+        self._copy_on_write("dcline")
         for dcline_id, factor in self.ct["dcline"]["dcline_id"].items():
             self.grid.dcline.loc[dcline_id, "Pmin"] *= factor
             self.grid.dcline.loc[dcline_id, "Pmax"] *= factor
@@ -356,6 +388,7 @@ class TransformGrid(object):
 
     def _add_storage(self):
         """Adds storage to the grid."""
+        self._copy_on_write("storage")
         first_storage_id = self.grid.plant.index.max() + 1
         for i, entry in enumerate(self.ct["storage"]):
             storage_id = first_storage_id + i
@@ -1,11 +1,25 @@
-import copy
+import glob
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
 
 from powersimdata.input.grid import Grid
 from powersimdata.input.input_data import InputData
+from powersimdata.input.profile_store import read_store, write_store
+from powersimdata.scenario.helpers import interconnect2name
+from powersimdata.utility import server_setup
+from powersimdata.utility.helpers import hash_object
+
+TRANSFORMED_CACHE_BYTES = 8 * 2 ** 30
 
 
 class TransformProfile(object):
-    """Transforms profile according to operations listed in change table."""
+    """Transforms profile according to operations listed in change table.
+    Transformed profiles are cached on the local machine and shared by all the
+    scenarios using the same base profile and the same relevant changes.
+    """
 
     def __init__(self, scenario_info, grid, ct):
         """Constructor
@@ -16,8 +30,8 @@ class TransformProfile(object):
         """
         self._input_data = InputData()
         self.scenario_info = scenario_info
-        self.grid = copy.deepcopy(grid)
-        self.ct = copy.deepcopy(ct)
+        self.grid = grid
+        self.ct = ct
         self.scale_keys = {
             "wind": {"wind", "wind_offshore"},
             "solar": {"solar"},
@@ -27,10 +41,10 @@ class TransformProfile(object):
         self.n_new_plant = (
             0 if "new_plant" not in self.ct.keys() else len(self.ct["new_plant"])
         )
-        self.base_plant = Grid(self.grid.interconnect).plant
 
     def _get_renewable_profile(self, resource):
-        """Returns the transformed grid.
+        """Returns the transformed grid. Profiles of new plants are copied from
+        their neighbor and all the columns are scaled in a single pass.
 
         :param str resource: *'hydro'*, *'solar'* or *'wind'*.
         :return: (*pandas.DataFrame*) -- power output for generators of
@@ -40,65 +54,75 @@ class TransformProfile(object):
         power_output = self._input_data.get_data(self.scenario_info, resource)
         if not bool(self.ct):
             return power_output
-        else:
-            if self.n_new_plant > 0:
-                power_output = self._add_plant_profile(power_output, resource)
-            if resource in self.ct.keys():
-                power_output = self._scale_plant_profile(power_output, resource)
+
+        new_plant_ids, neighbor_ids, new_scaling = self._get_new_plant(resource)
+        if len(new_plant_ids) == 0 and resource not in self.ct.keys():
             return power_output
 
-    def _add_plant_profile(self, profile, resource):
-        """Add power output profile for plants added via the change table.
+        columns = power_output.columns.append(pd.Index(new_plant_ids))
+        source = np.concatenate(
+            [
+                np.arange(len(power_output.columns)),
+                power_output.columns.get_indexer(neighbor_ids),
+            ]
+        )
+        multiplier = self._get_plant_multiplier(columns, resource)
+        multiplier.iloc[len(power_output.columns) :] *= new_scaling
+
+        # profiles are stored column by column, i.e. the transpose is in C order
+        values = power_output.to_numpy().T[source]
+        values *= multiplier.to_numpy()[:, np.newaxis]
+        return pd.DataFrame(values.T, index=power_output.index, columns=columns)
+
+    def _get_new_plant(self, resource):
+        """Lists plants of given type added via the change table. Their profile is
+        the one of their neighbor scaled by the ratio of their capacities.
 
-        :param pandas.DataFrame profile: power output profile with plant
-            identification number as columns and UTC timestamp as index.
         :param resource: fuel type.
-        :return: (*pandas.DataFrame*) -- power output profile with additional
-            columns corresponding to new generators inserted to the grid via
-            the change table.
+        :return: (*tuple*) -- id of new plants, id of their neighbor and scaling
+            factor of the profile of the neighbors.
         """
-        new_plant_ids, neighbor_ids, scaling = [], [], []
-        for i, entry in enumerate(self.ct["new_plant"]):
+        new_plant_ids, neighbor_ids, new_pmax = [], [], []
+        for i, entry in enumerate(self.ct.get("new_plant", [])):
             if entry["type"] in self.scale_keys[resource]:
-                new_plant_id = self.grid.plant.index[-self.n_new_plant + i]
-                new_plant_ids.append(new_plant_id)
-                neighbor_id = entry["plant_id_neighbor"]
-                neighbor_ids.append(neighbor_id)
-                scaling.append(entry["Pmax"] / self.base_plant.loc[neighbor_id, "Pmax"])
-
-        if len(new_plant_ids) > 0:
-            neighbor_profiles = profile[neighbor_ids]
-            new_profiles = neighbor_profiles.multiply(scaling, axis=1)
-            new_profiles.columns = new_plant_ids
-            joined_profiles = profile.join(new_profiles)
-            return joined_profiles
-        else:
-            return profile
+                new_plant_ids.append(self.grid.plant.index[-self.n_new_plant + i])
+                neighbor_ids.append(entry["plant_id_neighbor"])
+                new_pmax.append(entry["Pmax"])
 
-    def _scale_plant_profile(self, profile, resource):
-        """Scales power output according to change table.
+        if len(new_plant_ids) == 0:
+            return [], [], np.array([])
+        scaling = np.array(new_pmax) / self._get_base_pmax(neighbor_ids)
+        return new_plant_ids, neighbor_ids, scaling
 
-        :param pandas.DataFrame profile: power output profile with plant
-            identification number as columns and UTC timestamp as index.
+    def _get_base_pmax(self, plant_ids):
+        """Gets capacity of plants in the base grid. Capacity of the neighbors of
+        new plants may have been scaled in the transformed grid.
+
+        :param list plant_ids: plant identification numbers.
+        :return: (*numpy.ndarray*) -- capacity of the plants in the base grid.
+        """
+        base_plant = Grid(self.grid.interconnect).plant
+        return base_plant.loc[plant_ids, "Pmax"].to_numpy(dtype=float)
+
+    def _get_plant_multiplier(self, columns, resource):
+        """Combines zone and plant scaling factors of the change table in a single
+        multiplier per plant. New plants are not scaled by zone.
+
+        :param pandas.Index columns: plant identification numbers.
         :param resource: fuel type.
-        :return: (*pandas.DataFrame*) -- scaled power output profile.
+        :return: (*pandas.Series*) -- multiplier indexed by plant id.
         """
+        multiplier = pd.Series(1.0, index=columns)
+        plant = self.grid.plant.iloc[: len(self.grid.plant) - self.n_new_plant]
         for r in self.scale_keys[resource]:
             if r in self.ct.keys() and "zone_id" in self.ct[r].keys():
-                if self.n_new_plant > 0:
-                    type_in_zone = self.grid.plant[: -self.n_new_plant].groupby(
-                        ["zone_id", "type"]
-                    )
-                else:
-                    type_in_zone = self.grid.plant.groupby(["zone_id", "type"])
-                for z, f in self.ct[r]["zone_id"].items():
-                    plant_id = type_in_zone.get_group((z, r)).index.tolist()
-                    profile.loc[:, plant_id] *= f
+                zone_id = plant.loc[plant["type"] == r, "zone_id"]
+                zone_factor = zone_id.map(self.ct[r]["zone_id"]).dropna()
+                multiplier.loc[zone_factor.index] *= zone_factor
             if r in self.ct.keys() and "plant_id" in self.ct[r].keys():
-                for i, f in self.ct[r]["plant_id"].items():
-                    profile.loc[:, i] *= f
-
-        return profile
+                plant_factor = pd.Series(self.ct[r]["plant_id"], dtype=float)
+                multiplier.loc[plant_factor.index] *= plant_factor
+        return multiplier
 
     def _get_demand_profile(self):
         """Returns scaled demand profile.
@@ -112,9 +136,67 @@ class TransformProfile(object):
                     "Multiply demand in %s (#%d) by %.2f"
                     % (self.grid.id2zone[key], key, value)
                 )
-                demand.loc[:, key] *= value
+            factor = pd.Series(1.0, index=demand.columns)
+            zone_factor = pd.Series(self.ct["demand"]["zone_id"], dtype=float)
+            factor.loc[zone_factor.index] *= zone_factor
+            demand = demand * factor.to_numpy()
         return demand
 
+    def _get_relevant_changes(self, name):
+        """Gathers the changes affecting a profile, i.e. the scaling factors and the
+        new plants of the corresponding type along with the plants they apply to
+        and the capacity of the neighbors of new plants in the base grid.
+
+        :param str name: either *'demand'*, *'hydro'*, *'solar'*, *'wind'*.
+        :return: (*dict*) -- relevant changes. Empty if the profile is unchanged.
+        """
+        changes = {r: self.ct[r] for r in self.scale_keys[name] if r in self.ct}
+        if name == "demand":
+            return changes
+
+        zone_scaled = [r for r in changes if "zone_id" in changes[r]]
+        if len(zone_scaled) > 0:
+            plant = self.grid.plant.iloc[: len(self.grid.plant) - self.n_new_plant]
+            plant = plant[plant["type"].isin(zone_scaled)]
+            changes["plant"] = {
+                "plant_id": plant.index.to_numpy(dtype="int64"),
+                "type": plant["type"].astype(str).to_numpy(),
+                "zone_id": plant["zone_id"].to_numpy(dtype="int64"),
+            }
+        plant_id = self.grid.plant.index[len(self.grid.plant) - self.n_new_plant :]
+        new_plant = [
+            [int(plant_id[i]), entry["plant_id_neighbor"], entry["Pmax"]]
+            for i, entry in enumerate(self.ct.get("new_plant", []))
+            if entry["type"] in self.scale_keys[name]
+        ]
+        if len(new_plant) > 0:
+            # profiles of new plants also depend on the base capacity of neighbors
+            base_pmax = self._get_base_pmax([p[1] for p in new_plant])
+            changes["new_plant"] = [
+                p + [float(b)] for p, b in zip(new_plant, base_pmax)
+            ]
+        return changes
+
+    def _get_cache_location(self, name):
+        """Gets location of the cached transformed profile.
+
+        :param str name: either *'demand'*, *'hydro'*, *'solar'*, *'wind'*.
+        :return: (*str*) -- path to the binary store of the transformed profile.
+            None if the profile is unchanged.
+        """
+        changes = self._get_relevant_changes(name) if bool(self.ct) else {}
+        if len(changes) == 0:
+            return None
+        interconnect = interconnect2name(self.scenario_info["interconnect"].split("_"))
+        version = self.scenario_info["base_" + name]
+        return os.path.join(
+            server_setup.LOCAL_DIR,
+            server_setup.BASE_PROFILE_DIR,
+            "transformed",
+            "%s_%s_%s" % (interconnect, name, version),
+            hash_object(changes),
+        )
+
     def get_profile(self, name):
         """Returns profile.
 
@@ -126,7 +208,58 @@ class TransformProfile(object):
         possible = ["demand", "hydro", "solar", "wind"]
         if name not in possible:
             raise ValueError("Choose from %s" % " | ".join(possible))
-        elif name == "demand":
-            return self._get_demand_profile()
+
+        store = self._get_cache_location(name)
+        if store is not None:
+            try:
+                profile = read_store(store)
+                print("--> Loading transformed %s from cache" % name)
+                # modification time of the store tracks its last use
+                os.utime(store)
+                return profile
+            except FileNotFoundError:
+                pass
+
+        if name == "demand":
+            profile = self._get_demand_profile()
         else:
-            return self._get_renewable_profile(name)
+            profile = self._get_renewable_profile(name)
+        if store is None:
+            # base profiles are shared and read-only
+            return profile.copy()
+        write_store(profile, store)
+        evict_transformed_profiles(keep=store)
+        return profile
+
+
+def evict_transformed_profiles(max_bytes=None, keep=None):
+    """Removes the least recently used transformed profiles from the local cache
+    until the size of the cache is below a limit.
+
+    :param int max_bytes: maximum size of the cache, in bytes. Defaults to
+        :data:`TRANSFORMED_CACHE_BYTES`. All the profiles are removed if 0.
+    :param str keep: path to a cached profile that is never removed.
+    :return: (*list*) -- paths to the removed profiles.
+    """
+    max_bytes = TRANSFORMED_CACHE_BYTES if max_bytes is None else max_bytes
+    pattern = os.path.join(
+        server_setup.LOCAL_DIR, server_setup.BASE_PROFILE_DIR, "transformed", "*", "*"
+    )
+    stores = []
+    for store in glob.glob(pattern):
+        if not os.path.isdir(store) or store == keep:
+            continue
+        size = sum(e.stat().st_size for e in os.scandir(store) if e.is_file())
+        stores.append((os.stat(store).st_mtime, size, store))
+    total = sum(size for _, size, _ in stores)
+    if keep is not None and os.path.isdir(keep):
+        total += sum(e.stat().st_size for e in os.scandir(keep) if e.is_file())
+
+    removed = []
+    for _, size, store in sorted(stores):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(store, ignore_errors=True)
+        total -= size
+        removed.append(store)
+    return removed
@@ -0,0 +1,163 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import shutil
+
+import pandas as pd
+
+CACHE_VERSION = 3
+
+
+class NetworkCache(object):
+    """Binary cache of the data frames of a network built from source files, e.g.
+    CSV or MAT files. Tables can be stored in partitions, e.g. one per
+    interconnect, so that only the partitions needed are read. The cache is
+    invalidated as soon as the content of one of the source files changes.
+
+    :param str data_loc: path to the directory enclosing the source files.
+    :param str cache_loc: path to the directory enclosing the cached tables.
+    :param str pattern: glob pattern of the source files in data_loc.
+    """
+
+    def __init__(self, data_loc, cache_loc, pattern="*.csv"):
+        """Constructor."""
+        self.data_loc = data_loc
+        self.cache_loc = cache_loc
+        self.pattern = pattern
+        self._manifest = os.path.join(cache_loc, "manifest.json")
+        self._fingerprint = None
+
+    def _source_files(self):
+        """Lists the source files.
+
+        :return: (*list*) -- sorted paths to the source files.
+        """
+        return sorted(glob.glob(os.path.join(self.data_loc, self.pattern)))
+
+    def _source_stats(self):
+        """Gets size and modification time of the source files.
+
+        :return: (*dict*) -- keys are file names, values are size and modification
+            time in nanoseconds.
+        """
+        stats = {}
+        for filepath in self._source_files():
+            stat = os.stat(filepath)
+            stats[os.path.basename(filepath)] = [stat.st_size, stat.st_mtime_ns]
+        return stats
+
+    @property
+    def fingerprint(self):
+        """Computes content hash of the source files.
+
+        :return: (*str*) -- hexadecimal digest.
+        """
+        if self._fingerprint is None:
+            digest = hashlib.sha1(str(CACHE_VERSION).encode())
+            for filepath in self._source_files():
+                digest.update(os.path.basename(filepath).encode())
+                with open(filepath, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(block)
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def is_valid(self):
+        """Checks if cached tables have been built from the current source files.
+        Files are only hashed when their size or modification time differ from
+        the ones recorded when the cache was written.
+
+        :return: (*bool*) -- whether the cache can be used.
+        """
+        try:
+            with open(self._manifest) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if manifest.get("version") != CACHE_VERSION:
+            return False
+        if manifest.get("files") == self._source_stats():
+            return True
+        return manifest.get("fingerprint") == self.fingerprint
+
+    def load(self, names, partition=None):
+        """Loads cached tables.
+
+        :param iterable names: name of the tables to load.
+        :param str partition: name of the partition to read the tables from. The
+            tables common to all partitions are read if None.
+        :return: (*dict* or *NoneType*) -- tables keyed by name or None if the
+            cache is missing, stale or unreadable.
+        """
+        if not self.is_valid():
+            return None
+        tables = {}
+        try:
+            for name in names:
+                tables[name] = pd.read_pickle(self._path(name, partition))
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        return tables
+
+    def save(self, tables, partitions=None):
+        """Writes tables in cache. Failure to write, e.g. on a read-only
+        installation, is reported but not raised.
+
+        :param dict tables: tables common to all partitions, keyed by name.
+        :param dict partitions: partitioned tables. Keys are the partition names
+            and values are tables keyed by name.
+        """
+        partitions = {} if partitions is None else partitions
+        try:
+            # stats are collected before hashing so that a concurrent change of
+            # a source file cannot go unnoticed
+            files = self._source_stats()
+            fingerprint = self.fingerprint
+            os.makedirs(self.cache_loc, exist_ok=True)
+            for name, table in tables.items():
+                atomic_pickle(table, self._path(name))
+            for partition, partition_tables in partitions.items():
+                os.makedirs(os.path.join(self.cache_loc, partition), exist_ok=True)
+                for name, table in partition_tables.items():
+                    atomic_pickle(table, self._path(name, partition))
+            tmp = "%s.%d.tmp" % (self._manifest, os.getpid())
+            with open(tmp, "w") as f:
+                json.dump(
+                    {
+                        "version": CACHE_VERSION,
+                        "fingerprint": fingerprint,
+                        "files": files,
+                    },
+                    f,
+                )
+            os.replace(tmp, self._manifest)
+        except OSError as e:
+            print("Unable to write network cache in %s: %s" % (self.cache_loc, e))
+
+    def clear(self):
+        """Deletes cached tables."""
+        for path in glob.glob(os.path.join(self.cache_loc, "*")):
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+
+    def _path(self, name, partition=None):
+        if partition is None:
+            return os.path.join(self.cache_loc, name + ".pkl")
+        return os.path.join(self.cache_loc, partition, name + ".pkl")
+
+
+def atomic_pickle(obj, filepath):
+    """Pickles object to a temporary file and then renames it, so that
+    concurrent readers never see a partially written file.
+
+    :param object obj: object to pickle.
+    :param str filepath: path to file.
+    """
+    tmp = "%s.%d.tmp" % (filepath, os.getpid())
+    with open(tmp, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, filepath)
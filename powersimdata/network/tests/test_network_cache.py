@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from powersimdata.network.network_cache import NetworkCache
+
+
+@pytest.fixture
+def data_loc(tmp_path):
+    data_loc = tmp_path / "data"
+    data_loc.mkdir()
+    pd.DataFrame({"bus_id": [1, 2], "Pd": [10.0, 20.0]}).to_csv(
+        data_loc / "bus.csv", index=False
+    )
+    return data_loc
+
+
+def test_load_without_cache(data_loc, tmp_path):
+    cache = NetworkCache(str(data_loc), str(tmp_path / "cache"))
+    assert cache.load(["bus"]) is None
+
+
+def test_save_and_load(data_loc, tmp_path):
+    bus = pd.read_csv(data_loc / "bus.csv", index_col=0)
+    id2zone = {1: "zone1"}
+    NetworkCache(str(data_loc), str(tmp_path / "cache")).save(
+        {"bus": bus, "id2zone": id2zone}
+    )
+    tables = NetworkCache(str(data_loc), str(tmp_path / "cache")).load(
+        ["bus", "id2zone"]
+    )
+    assert tables["bus"].equals(bus)
+    assert tables["id2zone"] == id2zone
+
+
+def test_cache_is_invalidated_when_csv_changes(data_loc, tmp_path):
+    bus = pd.read_csv(data_loc / "bus.csv", index_col=0)
+    NetworkCache(str(data_loc), str(tmp_path / "cache")).save({"bus": bus})
+
+    bus.loc[2, "Pd"] = 30.0
+    bus.to_csv(data_loc / "bus.csv")
+    cache = NetworkCache(str(data_loc), str(tmp_path / "cache"))
+    assert not cache.is_valid()
+    assert cache.load(["bus"]) is None
+
+
+def test_missing_table_is_a_miss(data_loc, tmp_path):
+    bus = pd.read_csv(data_loc / "bus.csv", index_col=0)
+    NetworkCache(str(data_loc), str(tmp_path / "cache")).save({"bus": bus})
+    cache = NetworkCache(str(data_loc), str(tmp_path / "cache"))
+    assert cache.is_valid()
+    assert cache.load(["bus", "branch"]) is None
+
+
+def test_save_and_load_partitions(data_loc, tmp_path):
+    bus = pd.read_csv(data_loc / "bus.csv", index_col=0)
+    NetworkCache(str(data_loc), str(tmp_path / "cache")).save(
+        {"bus": bus}, {"a": {"bus": bus.loc[[1]]}, "b": {"bus": bus.loc[[2]]}}
+    )
+    cache = NetworkCache(str(data_loc), str(tmp_path / "cache"))
+    assert cache.load(["bus"])["bus"].equals(bus)
+    assert cache.load(["bus"], partition="b")["bus"].equals(bus.loc[[2]])
+    assert cache.load(["bus"], partition="c") is None
+
+
+def test_clear(data_loc, tmp_path):
+    bus = pd.read_csv(data_loc / "bus.csv", index_col=0)
+    cache = NetworkCache(str(data_loc), str(tmp_path / "cache"))
+    cache.save({"bus": bus}, {"a": {"bus": bus}})
+    cache.clear()
+    assert not cache.is_valid()
+    assert not (tmp_path / "cache" / "a").exists()
+
+
+def test_unchanged_files_are_not_hashed(data_loc, tmp_path, monkeypatch):
+    bus = pd.read_csv(data_loc / "bus.csv", index_col=0)
+    NetworkCache(str(data_loc), str(tmp_path / "cache")).save({"bus": bus})
+
+    cache = NetworkCache(str(data_loc), str(tmp_path / "cache"))
+    monkeypatch.setattr(NetworkCache, "fingerprint", None)
+    assert cache.is_valid()
+
+
+def test_pattern(data_loc, tmp_path):
+    bus = pd.read_csv(data_loc / "bus.csv", index_col=0)
+    NetworkCache(str(data_loc), str(tmp_path / "cache"), pattern="bus.csv").save(
+        {"bus": bus}
+    )
+    (data_loc / "other.csv").write_text("a,b\n1,2\n")
+    cache = NetworkCache(str(data_loc), str(tmp_path / "cache"), pattern="bus.csv")
+    assert cache.is_valid()
+    assert not NetworkCache(str(data_loc), str(tmp_path / "cache")).is_valid()
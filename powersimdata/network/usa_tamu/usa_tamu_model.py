@@ -1,12 +1,17 @@
 import os
 
+import numpy as np
+import pandas as pd
+
 from powersimdata.input.abstract_grid import AbstractGrid
 from powersimdata.input.helpers import (
     add_coord_to_grid_data_frames,
     add_zone_to_grid_data_frames,
+    compact_grid_data_frames,
     csv_to_data_frame,
 )
 from powersimdata.network.csv_reader import CSVReader
+from powersimdata.network.network_cache import NetworkCache
 from powersimdata.network.usa_tamu.constants.storage import defaults
 from powersimdata.network.usa_tamu.constants.zones import (
     abv2state,
@@ -19,16 +24,27 @@ class TAMU(AbstractGrid):
     """TAMU network.
 
     :param list interconnect: interconnect name(s).
+    :param bool lazy: if True, tables are only read when first loaded.
+    :param bool/str compact: if True, data frames use categoricals for repeated
+        strings and 32-bit integers for identifiers. If *'float32'*, coordinates
+        are also stored as 32-bit floats.
     """
 
-    def __init__(self, interconnect):
+    def __init__(self, interconnect, lazy=False, compact=False):
         """Constructor."""
         super().__init__()
         self._set_data_loc()
+        self._cache = NetworkCache(
+            self.data_loc, os.path.join(os.path.dirname(__file__), "cache")
+        )
+        self._compact = compact
+        self._loaded = set()
 
         if check_interconnect(interconnect):
             self.interconnect = interconnect
-            self._build_network()
+            self.storage.update(defaults)
+            if not lazy:
+                self._build_network()
 
     def _set_data_loc(self):
         """Sets data location.
@@ -42,8 +58,53 @@ class TAMU(AbstractGrid):
         else:
             self.data_loc = data_loc
 
+    def load(self, name):
+        """Returns a grid attribute, reading from the network cache only the
+        tables backing it on first call. The whole network is built if the cache
+        cannot be used.
+
+        :param str name: attribute name.
+        :return: (*object*) -- attribute value.
+        """
+        names = table_dependencies.get(name, [])
+        if "id2zone" in names and "USA" not in self.interconnect:
+            # the bus table is needed to trim the zone mappings
+            names = names + ["bus"]
+        names = [n for n in names if n not in self._loaded]
+        if len(names) > 0:
+            tables = self._load_tables(names)
+            if tables is None:
+                self._build_network()
+            else:
+                self._set_tables(tables)
+        return getattr(self, name)
+
     def _build_network(self):
-        """Build network."""
+        """Build network. Tables are read from the cache partitions of the
+        requested interconnect(s) if possible, otherwise the full network is read
+        from the CSV files, cached (in full and partitioned by interconnect) and
+        trimmed.
+        """
+        tables = self._load_tables(partitioned_tables + shared_tables)
+        if tables is None:
+            self._read_network()
+            self._cache.save(
+                {
+                    name: self._get_table(name)
+                    for name in partitioned_tables + shared_tables
+                },
+                self._get_partitions(),
+            )
+            if "USA" not in self.interconnect:
+                self._drop_interconnect()
+            if self._compact:
+                compact_grid_data_frames(self, float32=self._compact == "float32")
+            self._loaded.update(partitioned_tables + shared_tables)
+        else:
+            self._set_tables(tables)
+
+    def _read_network(self):
+        """Read network from CSV files and add derived columns."""
         reader = CSVReader(self.data_loc)
         self.bus = reader.bus
         self.plant = reader.plant
@@ -51,12 +112,94 @@ class TAMU(AbstractGrid):
         self.dcline = reader.dcline
         self.gencost["after"] = self.gencost["before"] = reader.gencost
 
-        self.storage.update(defaults)
-
         add_information_to_model(self)
 
+    def _get_partitions(self):
+        """Splits the tables of the network by interconnect. The position of the
+        rows in the original tables is stored along each partition in order to
+        preserve the row order when partitions are put back together.
+
+        :return: (*dict*) -- keys are the interconnects and values are
+            dictionaries of tables keyed by name, including the row positions.
+        """
+        partitions = {}
+        for interconnect in all_interconnects:
+            partition = {"position": {}}
+            for name in partitioned_tables:
+                table = self._get_table(name)
+                mask = (table.interconnect == interconnect).to_numpy()
+                partition[name] = table[mask]
+                partition["position"][name] = np.flatnonzero(mask)
+            partitions[interconnect] = partition
+        return partitions
+
+    def _load_tables(self, names):
+        """Loads tables from the cache partitions of the requested
+        interconnect(s). The full tables are read for the USA interconnect.
+
+        :param list names: name of the tables to load.
+        :return: (*dict* or *NoneType*) -- tables keyed by name or None if the
+            cache cannot be used.
+        """
+        if "USA" in self.interconnect:
+            return self._cache.load(names)
+        tables = self._cache.load([n for n in names if n in shared_tables])
+        partitioned = [n for n in names if n in partitioned_tables]
+        if len(partitioned) == 0:
+            return tables
+        partitions = [
+            self._cache.load(partitioned + ["position"], partition=i)
+            for i in self.interconnect
+        ]
+        if tables is None or any(p is None for p in partitions):
+            return None
+        for name in partitioned:
+            tables[name] = _concat_partitions(
+                [p[name] for p in partitions],
+                [p["position"][name] for p in partitions],
+            )
+        return tables
+
+    def _set_tables(self, tables):
+        """Sets tables loaded from the cache and trims the ones that are not
+        partitioned by interconnect.
+
+        :param dict tables: tables keyed by name.
+        """
+        for name, table in tables.items():
+            self._set_table(name, table)
+        self._loaded.update(tables)
         if "USA" not in self.interconnect:
-            self._drop_interconnect()
+            if "dcline" in tables:
+                self._drop_interconnect_dcline()
+            if "id2zone" in tables:
+                self._drop_interconnect_zone()
+        if self._compact:
+            compact_grid_data_frames(
+                self, float32=self._compact == "float32", names=tables
+            )
+
+    def _get_table(self, name):
+        """Returns a table of the network.
+
+        :param str name: name of the table.
+        :return: (*pandas.DataFrame* or *dict*) -- table.
+        """
+        return self.gencost["before"] if name == "gencost" else getattr(self, name)
+
+    def _set_table(self, name, table):
+        """Sets a table of the network.
+
+        :param str name: name of the table.
+        :param pandas.DataFrame/dict table: table.
+        """
+        if name == "gencost":
+            self.gencost["after"] = self.gencost["before"] = table
+        elif name == "id2zone":
+            self.id2zone = table
+            self.zone2id = {v: k for k, v in table.items()}
+        else:
+            setattr(self, name, table)
 
     def _drop_interconnect(self):
         """Trim data frames to only keep information pertaining to the user
@@ -79,6 +222,39 @@ class TAMU(AbstractGrid):
         self.id2zone = {k: self.id2zone[k] for k in self.bus.zone_id.unique()}
         self.zone2id = {value: key for key, value in self.id2zone.items()}
 
+    def _drop_interconnect_dcline(self):
+        """Trim the dcline table to only keep the lines connecting buses of the
+        user defined interconnect(s).
+        """
+        self.dcline = self.dcline[
+            self.dcline.from_interconnect.isin(self.interconnect)
+            & self.dcline.to_interconnect.isin(self.interconnect)
+        ]
+
+    def _drop_interconnect_zone(self):
+        """Trim the zone mappings to only keep the zones of the user defined
+        interconnect(s). Requires the bus table.
+        """
+        self.id2zone = {k: self.id2zone[k] for k in self.bus.zone_id.unique()}
+        self.zone2id = {value: key for key, value in self.id2zone.items()}
+
+
+all_interconnects = ["Eastern", "Texas", "Western"]
+partitioned_tables = ["sub", "bus2sub", "bus", "plant", "branch", "gencost"]
+shared_tables = ["dcline", "id2zone"]
+# Tables to load for each attribute of the grid
+table_dependencies = {
+    "sub": ["sub"],
+    "bus2sub": ["bus2sub"],
+    "bus": ["bus"],
+    "plant": ["plant"],
+    "branch": ["branch"],
+    "gencost": ["gencost"],
+    "dcline": ["dcline"],
+    "id2zone": ["id2zone"],
+    "zone2id": ["id2zone"],
+}
+
 
 def check_interconnect(interconnect):
     """Checks interconnect.
@@ -107,6 +283,23 @@ def check_interconnect(interconnect):
     return True
 
 
+def _concat_partitions(tables, positions):
+    """Concatenates partitions of a table and restores the original row order.
+
+    :param list tables: partitions of a table.
+    :param list positions: position of the rows of each partition in the
+        original table.
+    :return: (*pandas.DataFrame*) -- concatenated table.
+    """
+    if len(tables) == 1:
+        return tables[0]
+    table = pd.concat(tables)
+    position = np.concatenate(positions)
+    if np.any(np.diff(position) < 0):
+        table = table.take(np.argsort(position, kind="stable"))
+    return table
+
+
 def add_information_to_model(model):
     """Adds information to TAMU model. This is done inplace.
 
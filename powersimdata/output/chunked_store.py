@@ -0,0 +1,323 @@
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import (
+    csc_matrix,
+    csr_matrix,
+    hstack,
+    load_npz,
+    save_npz,
+    vstack,
+)
+
+from powersimdata.input.profile_store import (
+    STORE_VERSION,
+    check_chunk_size,
+    get_positions,
+    has_single_numeric_dtype,
+    read_header,
+)
+from powersimdata.network.network_cache import atomic_pickle
+
+HOURS_PER_CHUNK = 744
+COLUMNS_PER_CHUNK = 100
+SPARSE_COLUMNS_PER_CHUNK = 5000
+SPARSE_FIELDS = ("CONGU", "CONGL", "LOAD_SHED")
+
+
+def get_chunked_store_path(filepath):
+    """Gets location of the chunked store of an output table.
+
+    :param str filepath: path to the pickle file of the output table.
+    :return: (*str*) -- path to the directory enclosing the chunked store.
+    """
+    data_dir, file_name = os.path.split(filepath)
+    return os.path.join(data_dir, "chunked", os.path.splitext(file_name)[0])
+
+
+def get_chunk_name(row_chunk, column_chunk, sparse=False):
+    """Gets name of the file enclosing a chunk.
+
+    :param int row_chunk: position of the chunk along the time axis.
+    :param int column_chunk: position of the chunk along the column axis.
+    :param bool sparse: whether the chunk is stored as a sparse matrix.
+    :return: (*str*) -- file name.
+    """
+    return "%d_%d.%s" % (row_chunk, column_chunk, "npz" if sparse else "npy")
+
+
+def write_chunked_store(
+    table,
+    store,
+    hours_per_chunk=HOURS_PER_CHUNK,
+    columns_per_chunk=None,
+    sparse=None,
+):
+    """Writes an output table in a chunked store. The table is split in blocks of
+    consecutive hours and columns, each block being saved in its own numpy file
+    such that a selection only requires the blocks it intersects. Index and
+    column labels are pickled in a header written last.
+
+    :param pandas.DataFrame table: table with a single numeric dtype, dense or
+        sparse with a fill value of 0.
+    :param str store: path to the directory enclosing the chunked store.
+    :param int hours_per_chunk: number of hours in each block.
+    :param int columns_per_chunk: number of columns in each block. Defaults to
+        :data:`COLUMNS_PER_CHUNK` or, for sparse blocks, to the larger
+        :data:`SPARSE_COLUMNS_PER_CHUNK` since they only hold non-zero values.
+    :param bool sparse: whether blocks are saved as CSR matrices, only storing
+        the non-zero values. If None, blocks are sparse if the table is.
+    :return: (*bool*) -- whether the table has been stored.
+    """
+    if has_single_sparse_dtype(table):
+        dtype = table.dtypes.iloc[0].subtype
+        values = to_csc_matrix(table).tocsr()
+        sparse = True if sparse is None else sparse
+    elif has_single_numeric_dtype(table):
+        dtype = table.dtypes.iloc[0]
+        values = table.to_numpy()
+        sparse = False if sparse is None else sparse
+    else:
+        return False
+    if columns_per_chunk is None:
+        columns_per_chunk = SPARSE_COLUMNS_PER_CHUNK if sparse else COLUMNS_PER_CHUNK
+
+    header = {
+        "version": STORE_VERSION,
+        "index": table.index,
+        "columns": table.columns,
+        "dtype": dtype,
+        "hours_per_chunk": hours_per_chunk,
+        "columns_per_chunk": columns_per_chunk,
+        "sparse": sparse,
+    }
+    try:
+        os.makedirs(store, exist_ok=True)
+        for i in range(0, values.shape[0], hours_per_chunk):
+            for j in range(0, values.shape[1], columns_per_chunk):
+                block = values[i : i + hours_per_chunk, j : j + columns_per_chunk]
+                name = get_chunk_name(
+                    i // hours_per_chunk, j // columns_per_chunk, sparse
+                )
+                path = os.path.join(store, name)
+                if sparse:
+                    save_npz(path, csr_matrix(block, dtype=dtype), compressed=False)
+                elif isinstance(block, np.ndarray):
+                    np.save(path, np.ascontiguousarray(block))
+                else:
+                    np.save(path, block.toarray())
+        atomic_pickle(header, os.path.join(store, "header.pkl"))
+    except OSError as e:
+        print("Unable to write chunked output in %s: %s" % (store, e))
+        return False
+    return True
+
+
+def convert_to_chunked_store(filepath, sparse=None, **kwargs):
+    """Converts an output table saved as a pickle file in a chunked store located
+    next to it, see :func:`get_chunked_store_path`.
+
+    :param str filepath: path to the pickle file of the output table.
+    :param bool sparse: whether blocks are saved as sparse matrices. If None,
+        blocks of the fields listed in :data:`SPARSE_FIELDS` and of tables with
+        sparse columns are.
+    :param \\*\\*kwargs: arbitrary keyword arguments passed to
+        :func:`write_chunked_store`.
+    :return: (*bool*) -- whether the table has been stored.
+    """
+    table = pd.read_pickle(filepath)
+    if sparse is None and is_sparse_field(filepath):
+        sparse = True
+    store = get_chunked_store_path(filepath)
+    return write_chunked_store(table, store, sparse=sparse, **kwargs)
+
+
+def is_sparse_field(filepath):
+    """Checks if an output table is mostly made of zeros, i.e. whether it is one
+    of the fields listed in :data:`SPARSE_FIELDS`.
+
+    :param str filepath: path to the pickle file of the output table, named
+        *<scenario_id>_<field_name>.pkl*.
+    :return: (*bool*) -- whether the table is better stored as a sparse table.
+    """
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return stem.split("_", 1)[-1] in SPARSE_FIELDS
+
+
+def read_chunked_store(store, columns=None, start=None, end=None, fetch=None):
+    """Reads an output table, or a part of it, from a chunked store. Only the
+    blocks intersecting the selection are read.
+
+    :param str store: path to the directory enclosing the chunked store.
+    :param list columns: columns to read. All columns are read if None.
+    :param str/pandas.Timestamp start: first time step to read, included. Read
+        from the beginning if None.
+    :param str/pandas.Timestamp end: last time step to read, included. Read until
+        the end if None.
+    :param callable fetch: function called with the name of each block before it
+        is read, e.g. to download it. Blocks are expected on disk if None.
+    :return: (*pandas.DataFrame*) -- selection, with sparse columns if the blocks
+        are stored as sparse matrices.
+    :raises FileNotFoundError: if the chunked store does not exist.
+    :raises KeyError: if some columns are not in the table.
+    """
+    header = read_header(store)
+    if header is None:
+        raise FileNotFoundError("No chunked store in %s" % store)
+    rows = header["index"].slice_indexer(start, end)
+    positions = get_positions(header, columns)
+    return _read_blocks(store, header, positions, rows, fetch)
+
+
+def iter_chunked_store(
+    store, hours_per_chunk, columns=None, fetch=None, start=None, end=None
+):
+    """Iterates over an output table stored in a chunked store by chunks of
+    consecutive time steps.
+
+    :param str store: path to the directory enclosing the chunked store.
+    :param int hours_per_chunk: number of time steps in each chunk.
+    :param list columns: columns to read. All columns are read if None.
+    :param callable fetch: function called with the name of each block before it
+        is read. Blocks are expected on disk if None.
+    :param str/pandas.Timestamp start: first time step to read, included. Read
+        from the beginning if None.
+    :param str/pandas.Timestamp end: last time step to read, included. Read until
+        the end if None.
+    :return: (*generator*) -- data frames with the selected columns.
+    :raises FileNotFoundError: if the chunked store does not exist.
+    :raises KeyError: if some columns are not in the table.
+    """
+    check_chunk_size(hours_per_chunk)
+    header = read_header(store)
+    if header is None:
+        raise FileNotFoundError("No chunked store in %s" % store)
+    positions = get_positions(header, columns)
+    first, last, _ = (
+        header["index"].slice_indexer(start, end).indices(len(header["index"]))
+    )
+    for i in range(first, last, hours_per_chunk):
+        rows = slice(i, min(i + hours_per_chunk, last))
+        yield _read_blocks(store, header, positions, rows, fetch)
+
+
+def _read_blocks(store, header, positions, rows, fetch):
+    """Assembles a selection from the blocks of a chunked store.
+
+    :param str store: path to the directory enclosing the chunked store.
+    :param dict header: header of the chunked store.
+    :param numpy.ndarray positions: positions of the columns to select.
+    :param slice rows: time steps to select, with a step of 1.
+    :param callable fetch: function called with the name of each block before it
+        is read. Not called if None.
+    :return: (*pandas.DataFrame*) -- selection.
+    """
+    if header.get("sparse", False):
+        return _read_sparse_blocks(store, header, positions, rows, fetch)
+    n_hour, n_column = header["hours_per_chunk"], header["columns_per_chunk"]
+    row_start, row_stop, _ = rows.indices(len(header["index"]))
+    row_stop = max(row_start, row_stop)
+    values = np.empty((row_stop - row_start, len(positions)), header["dtype"])
+    column_chunk = positions // n_column
+    for i in range(row_start // n_hour, -(-row_stop // n_hour)):
+        first = max(row_start, i * n_hour)
+        last = min(row_stop, (i + 1) * n_hour)
+        for j in np.unique(column_chunk):
+            name = get_chunk_name(i, j)
+            if fetch is not None:
+                fetch(name)
+            block = np.load(os.path.join(store, name), mmap_mode="r")
+            selected = column_chunk == j
+            values[first - row_start : last - row_start, selected] = block[
+                first - i * n_hour : last - i * n_hour,
+                positions[selected] - j * n_column,
+            ]
+    return pd.DataFrame(
+        values,
+        index=header["index"][row_start:row_stop],
+        columns=header["columns"][positions],
+    )
+
+
+def _read_sparse_blocks(store, header, positions, rows, fetch):
+    """Assembles a selection from the sparse blocks of a chunked store. Values are
+    never densified, the selection having sparse columns.
+
+    :param str store: path to the directory enclosing the chunked store.
+    :param dict header: header of the chunked store.
+    :param numpy.ndarray positions: positions of the columns to select.
+    :param slice rows: time steps to select, with a step of 1.
+    :param callable fetch: function called with the name of each block before it
+        is read. Not called if None.
+    :return: (*pandas.DataFrame*) -- selection.
+    """
+    n_hour, n_column = header["hours_per_chunk"], header["columns_per_chunk"]
+    row_start, row_stop, _ = rows.indices(len(header["index"]))
+    row_stop = max(row_start, row_stop)
+    column_chunk = positions // n_column
+    chunks = np.unique(column_chunk)
+    # blocks are stacked side by side, only the last block may be narrower
+    offset = np.searchsorted(chunks, column_chunk) * n_column + positions % n_column
+    parts = []
+    for i in range(row_start // n_hour, -(-row_stop // n_hour)):
+        first = max(row_start, i * n_hour) - i * n_hour
+        last = min(row_stop, (i + 1) * n_hour) - i * n_hour
+        blocks = []
+        for j in chunks:
+            name = get_chunk_name(i, j, sparse=True)
+            if fetch is not None:
+                fetch(name)
+            blocks.append(load_npz(os.path.join(store, name)))
+        if len(blocks) == 0:
+            parts.append(csr_matrix((last - first, 0), dtype=header["dtype"]))
+            continue
+        block = hstack(blocks, format="csc")[:, offset]
+        parts.append(block.tocsr()[first:last])
+    if len(parts) == 0:
+        values = csr_matrix((0, len(positions)), dtype=header["dtype"])
+    else:
+        values = vstack(parts, format="csr")
+    return pd.DataFrame.sparse.from_spmatrix(
+        values,
+        index=header["index"][row_start:row_stop],
+        columns=header["columns"][positions],
+    )
+
+
+def to_csc_matrix(table):
+    """Converts a table with sparse columns to a sparse matrix. Faster than
+    *pandas.DataFrame.sparse.to_coo* since the non-zero values and their
+    positions are gathered column by column as they are stored.
+
+    :param pandas.DataFrame table: table with sparse numeric columns and a fill
+        value of 0.
+    :return: (*scipy.sparse.csc_matrix*) -- sparse matrix.
+    :raises ValueError: if the columns are not sparse with a fill value of 0.
+    """
+    if not has_single_sparse_dtype(table):
+        raise ValueError("table must have sparse numeric columns filled with 0")
+    # a shallow copy is iterated over so that its columns are not cached
+    arrays = [column.array for _, column in table.copy(deep=False).items()]
+    indices = [a.sp_index.to_int_index().indices for a in arrays]
+    indptr = np.cumsum([0] + [len(i) for i in indices])
+    values = np.concatenate([a.sp_values for a in arrays])
+    return csc_matrix((values, np.concatenate(indices), indptr), shape=table.shape)
+
+
+def has_single_sparse_dtype(table):
+    """Checks that all the columns of a table share a sparse numeric dtype with a
+    fill value of 0.
+
+    :param pandas.DataFrame table: table.
+    :return: (*bool*) -- whether the table can be converted to a sparse matrix.
+    """
+    if len(table.columns) == 0:
+        return False
+    # sparse dtypes are slow to hash, the columns usually share the same instance
+    first = table.dtypes.iloc[0]
+    if not isinstance(first, pd.SparseDtype) or first.fill_value != 0:
+        return False
+    if first.subtype.kind not in "biuf":
+        return False
+    return all(d is first or d == first for d in table.dtypes)
@@ -1,17 +1,41 @@
 import os
 import pickle
+import posixpath
 
 import numpy as np
 import pandas as pd
-from scipy.sparse import coo_matrix
+from scipy.sparse import coo_matrix, csr_matrix
 
 from powersimdata.data_access.context import Context
-from powersimdata.input.input_data import get_bus_demand
+from powersimdata.input.input_data import get_bus_demand, read_only
+from powersimdata.input.profile_store import (
+    get_store_path,
+    has_single_numeric_dtype,
+    is_stored,
+    iter_frame_chunks,
+    iter_store_chunks,
+    slice_profile,
+    write_profile,
+)
+from powersimdata.output.chunked_store import (
+    HOURS_PER_CHUNK,
+    SPARSE_FIELDS,
+    get_chunked_store_path,
+    has_single_sparse_dtype,
+    iter_chunked_store,
+    read_chunked_store,
+)
 from powersimdata.utility import server_setup
+from powersimdata.utility.helpers import MemoryCache, cache_key
+
+_cache = MemoryCache(max_bytes=2 * 1024 ** 3, copy=False)
 
 
 class OutputData(object):
-    """Load output data.
+    """Load output data. Tables loaded in full are kept in memory, in a cache
+    shared by all instances, and returned as read-only data frames when they have
+    a single numeric dtype. Congestion and load shed tables, mostly made of zeros,
+    are returned with sparse columns.
 
     :param str data_loc: data location.
     """
@@ -21,23 +45,81 @@ class OutputData(object):
         os.makedirs(server_setup.LOCAL_DIR, exist_ok=True)
         self._data_access = Context.get_data_access(data_loc)
 
-    def get_data(self, scenario_id, field_name):
-        """Returns data either from server or from local directory.
+    def get_data(
+        self, scenario_id, field_name, columns=None, start=None, end=None, resample=None
+    ):
+        """Returns data either from server or from local directory. When the table
+        has been converted to a chunked store, only the blocks intersecting the
+        selection are read and, if needed, transferred from the server, and the
+        table is resampled block by block.
 
         :param str scenario_id: scenario id.
         :param str field_name: *'PG'*, *'PF'*, *'LMP'*, *'CONGU'*, *'CONGL'*,
             *'AVERAGED_CONG'*, *'STORAGE_PG'* or *'STORAGE_E'*.
-        :return: (*pandas.DataFrame*) -- specified field as a data frame.
+        :param list columns: columns to load. All if None.
+        :param str/pandas.Timestamp start: first time step to load, included.
+            Load from the beginning if None.
+        :param str/pandas.Timestamp end: last time step to load, included. Load
+            until the end if None.
+        :param str resample: frequency the data is averaged over, e.g. *'D'*. Not
+            resampled if None.
+        :return: (*pandas.DataFrame*) -- specified field as a data frame. Columns
+            of the fields listed in
+            :data:`powersimdata.output.chunked_store.SPARSE_FIELDS` are sparse,
+            unless resampled.
         :raises FileNotFoundError: if file not found on local machine.
         :raises ValueError: if second argument is not an allowable field.
+        :raises KeyError: if some columns are not in the table.
         """
         _check_field(field_name)
 
         print("--> Loading %s" % field_name)
-        file_name = scenario_id + "_" + field_name + ".pkl"
-        from_dir = server_setup.OUTPUT_DIR
-        filepath = os.path.join(server_setup.LOCAL_DIR, from_dir, file_name)
+        key = cache_key(scenario_id, field_name, self._data_access.root)
+        data = _cache.get(key)
+        if data is None:
+            file_name = scenario_id + "_" + field_name + ".pkl"
+            from_dir = server_setup.OUTPUT_DIR
+            filepath = os.path.join(server_setup.LOCAL_DIR, from_dir, file_name)
+
+            store = self._get_chunked_store(filepath)
+            selection = [columns, start, end, resample]
+            if store is not None and any(v is not None for v in selection):
+                fetch = self._fetch(store)
+                if resample is None:
+                    return read_chunked_store(store, columns, start, end, fetch)
+                chunks = iter_chunked_store(
+                    store, HOURS_PER_CHUNK, columns, fetch, start, end
+                )
+                return _resample_chunks(chunks, resample)
+            if store is not None:
+                data = read_chunked_store(store, fetch=self._fetch(store))
+            else:
+                data = self._read_pickle(file_name, from_dir)
+            if field_name in SPARSE_FIELDS:
+                data = _to_sparse(data)
+            elif has_single_numeric_dtype(data):
+                data = read_only(data)
+            _cache.put(key, data)
+
+        data = slice_profile(data.copy(deep=False), columns, start, end)
+        if resample is None:
+            # only tables backed by a read-only array are shared with the cache
+            return data if has_single_numeric_dtype(data) else data.copy()
+        if has_single_sparse_dtype(data):
+            chunks = iter_frame_chunks(data, HOURS_PER_CHUNK)
+            return _resample_chunks(chunks, resample)
+        return data.resample(resample).mean()
 
+    def _read_pickle(self, file_name, from_dir):
+        """Reads an output table from its pickle file, transferred from the server
+        if not found on the local machine.
+
+        :param str file_name: name of the pickle file.
+        :param str from_dir: directory enclosing the file, relative to the root.
+        :return: (*pandas.DataFrame*) -- output table.
+        :raises ValueError: if the file cannot be unpickled.
+        """
+        filepath = os.path.join(server_setup.LOCAL_DIR, from_dir, file_name)
         try:
             return pd.read_pickle(filepath)
         except pickle.UnpicklingError:
@@ -49,6 +131,144 @@ class OutputData(object):
         self._data_access.copy_from(file_name, from_dir)
         return pd.read_pickle(filepath)
 
+    def _get_chunked_store(self, filepath):
+        """Locates the chunked store of an output table, on the local machine or on
+        the server. The header of a store found on the server is transferred. The
+        pickle file is preferred to a remote store when available locally.
+
+        :param str filepath: path to the pickle file on the local machine.
+        :return: (*str*) -- path to the chunked store on the local machine. None
+            if the table has not been converted.
+        """
+        store = get_chunked_store_path(filepath)
+        if os.path.isfile(os.path.join(store, "header.pkl")):
+            return store
+        if os.path.isfile(filepath):
+            return None
+        rel_dir = self._get_rel_dir(store)
+        if not self._data_access.file_exists(posixpath.join(rel_dir, "header.pkl")):
+            return None
+        self._data_access.copy_from("header.pkl", rel_dir)
+        return store if os.path.isfile(os.path.join(store, "header.pkl")) else None
+
+    def _fetch(self, store):
+        """Builds function transferring a block of a chunked store from the server
+        if not found on the local machine.
+
+        :param str store: path to the chunked store on the local machine.
+        :return: (*callable*) -- function taking the name of the block.
+        """
+        rel_dir = self._get_rel_dir(store)
+
+        def fetch(name):
+            if not os.path.isfile(os.path.join(store, name)):
+                self._data_access.copy_from(name, rel_dir)
+
+        return fetch
+
+    @staticmethod
+    def _get_rel_dir(path):
+        """Gets location of a directory relative to the local directory.
+
+        :param str path: path to a directory on the local machine.
+        :return: (*str*) -- relative path, in posix format.
+        """
+        rel_dir = os.path.relpath(path, server_setup.LOCAL_DIR)
+        return rel_dir.replace(os.sep, posixpath.sep)
+
+    def iter_chunks(self, scenario_id, field_name, hours_per_chunk=168, columns=None):
+        """Iterates over an output table by chunks of consecutive hours. Tables
+        converted to a chunked store are read from it. Otherwise, the table is
+        converted to a binary store the first time, after which chunks are read
+        one at a time from disk. Tables with sparse columns are iterated over in
+        memory.
+
+        :param str scenario_id: scenario id.
+        :param str field_name: *'PG'*, *'PF'*, *'PF_DCLINE'*, *'LMP'*, *'CONGU'*,
+            *'CONGL'*, *'STORAGE_PG'*, *'STORAGE_E'* or *'LOAD_SHED'*.
+        :param int hours_per_chunk: number of hours in each chunk.
+        :param list columns: columns to load. All if None.
+        :return: (*generator*) -- data frames indexed by UTC timestamps.
+        :raises ValueError: if second argument is not an allowable field.
+        """
+        _check_field(field_name)
+        cached = _cache.get(cache_key(scenario_id, field_name, self._data_access.root))
+        if cached is not None:
+            return iter_frame_chunks(cached, hours_per_chunk, columns)
+        file_name = scenario_id + "_" + field_name + ".pkl"
+        filepath = os.path.join(
+            server_setup.LOCAL_DIR, server_setup.OUTPUT_DIR, file_name
+        )
+        store = self._get_chunked_store(filepath)
+        if store is not None:
+            fetch = self._fetch(store)
+            return iter_chunked_store(store, hours_per_chunk, columns, fetch)
+        if not is_stored(filepath):
+            data = self.get_data(scenario_id, field_name)
+            if not write_profile(data, filepath):
+                return iter_frame_chunks(data, hours_per_chunk, columns)
+        return iter_store_chunks(get_store_path(filepath), hours_per_chunk, columns)
+
+    @staticmethod
+    def cache_stats():
+        """Returns usage statistics of the in-memory cache of output tables.
+
+        :return: (*dict*) -- number of hits, misses, evictions and entries along
+            with the estimated size of the cache in bytes.
+        """
+        return _cache.stats()
+
+    @staticmethod
+    def clear_cache(scenario_id=None):
+        """Removes output tables from the in-memory cache. Must be called when the
+        output data of a scenario is moved or deleted.
+
+        :param str scenario_id: scenario id. All tables are removed if None.
+        """
+        for key in _cache.memory_usage():
+            if scenario_id is None or key[0] == scenario_id:
+                _cache.clear(key)
+
+
+def _resample_chunks(chunks, resample):
+    """Averages consecutive chunks of a table over periods of time. Sums and
+    counts are accumulated such that periods spanning several chunks are averaged
+    over all their time steps.
+
+    :param iterable chunks: data frames indexed by consecutive UTC timestamps.
+        Sparse chunks are densified one at a time.
+    :param str resample: frequency the data is averaged over.
+    :return: (*pandas.DataFrame*) -- averaged table. Empty if there is no chunk.
+    """
+    total, count = [], []
+    for chunk in chunks:
+        if has_single_sparse_dtype(chunk):
+            chunk = chunk.sparse.to_dense()
+        resampler = chunk.resample(resample)
+        total.append(resampler.sum())
+        count.append(resampler.count())
+    if len(total) == 0:
+        return pd.DataFrame()
+    total = pd.concat(total).groupby(level=0).sum()
+    count = pd.concat(count).groupby(level=0).sum()
+    return (total / count).asfreq(resample)
+
+
+def _to_sparse(table):
+    """Converts a table to a table with sparse columns, only storing the non-zero
+    values. The dense values are converted at once via a sparse matrix rather
+    than column by column.
+
+    :param pandas.DataFrame table: table with a single numeric dtype.
+    :return: (*pandas.DataFrame*) -- table with sparse columns and a fill value
+        of 0. The table itself if its columns are already sparse.
+    """
+    if has_single_sparse_dtype(table) or not has_single_numeric_dtype(table):
+        return table
+    return pd.DataFrame.sparse.from_spmatrix(
+        csr_matrix(table.to_numpy()), index=table.index, columns=table.columns
+    )
+
 
 def _check_field(field_name):
     """Checks field name.
@@ -77,36 +297,42 @@ def _check_field(field_name):
 
 
 def construct_load_shed(scenario_info, grid, infeasibilities=None):
-    """Constructs load_shed dataframe from relevant scenario/grid data.
+    """Constructs load_shed dataframe from relevant scenario/grid data. The table
+    is built as a sparse matrix from the demand of the infeasible intervals only,
+    bus demand being computed for these intervals alone.
 
     :param dict scenario_info: info attribute of Scenario object.
     :param powersimdata.input.grid.Grid grid: grid to construct load_shed for.
     :param dict/None infeasibilities: dictionary of
         {interval (int): load shed percentage (int)}, or None.
-    :return: (*pandas.DataFrame*) -- data frame of load_shed.
+    :return: (*pandas.DataFrame*) -- data frame of load_shed, with sparse columns.
     """
     hours = pd.date_range(
         start=scenario_info["start_date"], end=scenario_info["end_date"], freq="1H"
     ).tolist()
     buses = grid.bus.index
-    if infeasibilities is None:
+    if not infeasibilities:
         print("No infeasibilities, constructing DataFrame")
         load_shed_data = coo_matrix((len(hours), len(buses)))
-        load_shed = pd.DataFrame.sparse.from_spmatrix(load_shed_data)
     else:
         print("Infeasibilities, constructing DataFrame")
-        bus_demand = get_bus_demand(scenario_info["id"], grid)
-        load_shed = np.zeros((len(hours), len(buses)))
+        bus_demand = get_bus_demand(scenario_info, grid, lazy=True)
         # Convert '24H' to 24
         interval = int(scenario_info["interval"][:-1])
+        row, col, data = [], [], []
         for i, v in infeasibilities.items():
             start = i * interval
             end = (i + 1) * interval
-            base_demand = bus_demand.iloc[start:end, :].to_numpy()
-            shed_demand = base_demand * (v / 100)
-            load_shed[start:end, :] = shed_demand
-        load_shed = pd.DataFrame(load_shed, columns=buses, index=hours)
-        load_shed = load_shed.astype(pd.SparseDtype("float", 0))
+            base_demand = bus_demand.loc[bus_demand.index[start:end]].to_numpy()
+            shed_demand = coo_matrix(base_demand * (v / 100))
+            row.append(shed_demand.row + start)
+            col.append(shed_demand.col)
+            data.append(shed_demand.data)
+        load_shed_data = coo_matrix(
+            (np.concatenate(data), (np.concatenate(row), np.concatenate(col))),
+            shape=(len(hours), len(buses)),
+        )
+    load_shed = pd.DataFrame.sparse.from_spmatrix(load_shed_data.tocsc())
     load_shed.index = hours
     load_shed.index.name = "UTC"
     load_shed.columns = buses
@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from powersimdata.output.chunked_store import (
+    convert_to_chunked_store,
+    get_chunked_store_path,
+    iter_chunked_store,
+    read_chunked_store,
+    to_csc_matrix,
+    write_chunked_store,
+)
+
+
+@pytest.fixture
+def table():
+    index = pd.date_range("2016-01-01", periods=50, freq="H", name="UTC")
+    return pd.DataFrame(
+        np.random.default_rng(0).random((50, 7)), index=index, columns=range(11, 18)
+    )
+
+
+def test_read_chunked_store(table, tmp_path):
+    store = str(tmp_path / "1_PG")
+    assert write_chunked_store(table, store, hours_per_chunk=20, columns_per_chunk=3)
+    assert len(os.listdir(store)) == 3 * 3 + 1
+    assert_frame_equal(read_chunked_store(store), table)
+
+    start, end = "2016-01-01 15:00", "2016-01-02 02:00"
+    fetched = []
+    selection = read_chunked_store(store, [17, 12], start, end, fetch=fetched.append)
+    assert_frame_equal(selection, table.loc[start:end, [17, 12]])
+    assert sorted(fetched) == ["0_0.npy", "0_2.npy", "1_0.npy", "1_2.npy"]
+
+    selection = read_chunked_store(store, [], start="2016-01-05")
+    assert selection.shape == (0, 0)
+    with pytest.raises(KeyError):
+        read_chunked_store(store, [99])
+    with pytest.raises(FileNotFoundError):
+        read_chunked_store(str(tmp_path / "1_PF"))
+
+
+def test_write_chunked_store_requires_single_numeric_dtype(table, tmp_path):
+    store = str(tmp_path / "1_PG")
+    assert not write_chunked_store(table.assign(x="a"), store)
+    assert not os.path.exists(store)
+
+
+def test_iter_chunked_store(table, tmp_path):
+    store = str(tmp_path / "1_PG")
+    write_chunked_store(table, store, hours_per_chunk=20, columns_per_chunk=3)
+    chunks = list(iter_chunked_store(store, 15, columns=[13, 14]))
+    assert [len(c) for c in chunks] == [15, 15, 15, 5]
+    assert_frame_equal(pd.concat(chunks), table[[13, 14]])
+
+    start, end = "2016-01-01 05:00", "2016-01-02 00:00"
+    chunks = list(iter_chunked_store(store, 15, start=start, end=end))
+    assert [len(c) for c in chunks] == [15, 5]
+    assert_frame_equal(pd.concat(chunks), table.loc[start:end])
+
+
+def test_convert_to_chunked_store(table, tmp_path):
+    filepath = str(tmp_path / "1_PG.pkl")
+    table.to_pickle(filepath)
+    assert convert_to_chunked_store(filepath, hours_per_chunk=24)
+    store = get_chunked_store_path(filepath)
+    assert store == str(tmp_path / "chunked" / "1_PG")
+    assert_frame_equal(read_chunked_store(store), table)
+
+
+def test_sparse_chunked_store(table, tmp_path):
+    table = table.where(table > 0.8, 0)
+    expected = table.astype(pd.SparseDtype("float", 0))
+    store = str(tmp_path / "1_CONGU")
+    assert write_chunked_store(
+        table, store, hours_per_chunk=20, columns_per_chunk=3, sparse=True
+    )
+    assert "0_0.npz" in os.listdir(store)
+    assert_frame_equal(read_chunked_store(store), expected)
+
+    start, end = "2016-01-01 15:00", "2016-01-02 02:00"
+    selection = read_chunked_store(store, [17, 12, 15], start, end)
+    assert_frame_equal(selection, expected.loc[start:end, [17, 12, 15]])
+    chunks = list(iter_chunked_store(store, 15, columns=[13]))
+    assert_frame_equal(pd.concat(chunks), expected[[13]])
+    assert read_chunked_store(store, [], start="2016-01-05").shape == (0, 0)
+
+    store = str(tmp_path / "2_CONGU")
+    assert write_chunked_store(expected, store, hours_per_chunk=20)
+    assert_frame_equal(read_chunked_store(store), expected)
+
+
+def test_to_csc_matrix(table):
+    table = table.where(table > 0.5, 0)
+    matrix = to_csc_matrix(table.astype(pd.SparseDtype("float", 0)))
+    assert matrix.nnz == (table > 0).sum().sum()
+    np.testing.assert_array_equal(matrix.toarray(), table.to_numpy())
+    with pytest.raises(ValueError):
+        to_csc_matrix(table)
+
+
+def test_convert_sparse_field_to_chunked_store(table, tmp_path):
+    filepath = str(tmp_path / "1_LOAD_SHED.pkl")
+    table.to_pickle(filepath)
+    assert convert_to_chunked_store(filepath)
+    store = get_chunked_store_path(filepath)
+    assert "0_0.npz" in os.listdir(store)
+    expected = table.astype(pd.SparseDtype("float", 0))
+    assert_frame_equal(read_chunked_store(store), expected)
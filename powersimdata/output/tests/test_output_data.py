@@ -0,0 +1,224 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from powersimdata.input.bus_demand import BusDemand
+from powersimdata.output import output_data
+from powersimdata.output.chunked_store import (
+    convert_to_chunked_store,
+    write_chunked_store,
+)
+from powersimdata.output.output_data import OutputData, construct_load_shed
+from powersimdata.tests.mock_grid import MockGrid
+from powersimdata.utility import server_setup
+
+
+@pytest.fixture
+def local_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(server_setup, "LOCAL_DIR", str(tmp_path))
+    monkeypatch.setattr(output_data, "_cache", output_data.MemoryCache(copy=False))
+    os.makedirs(tmp_path / server_setup.OUTPUT_DIR)
+    return tmp_path
+
+
+class MockDataAccess:
+    def __init__(self, root):
+        self.root = root
+        self.transferred = []
+        self.listed = []
+
+    def copy_from(self, file_name, from_dir):
+        src = os.path.join(self.root, from_dir, file_name)
+        if not os.path.isfile(src):
+            raise OSError(f"{src} not found on server")
+        to_dir = os.path.join(server_setup.LOCAL_DIR, from_dir)
+        os.makedirs(to_dir, exist_ok=True)
+        shutil.copy(src, to_dir)
+        self.transferred.append(file_name)
+
+    def file_exists(self, relative_path):
+        self.listed.append(relative_path)
+        return os.path.isfile(os.path.join(self.root, relative_path))
+
+
+@pytest.fixture
+def pg():
+    index = pd.date_range("2016-01-01", periods=50, freq="H", name="UTC")
+    return pd.DataFrame(
+        np.random.random((50, 4)), index=index, columns=[11, 12, 13, 14]
+    )
+
+
+def _write_output(local_dir, field_name, data):
+    filepath = local_dir / server_setup.OUTPUT_DIR / ("1_%s.pkl" % field_name)
+    data.to_pickle(filepath)
+
+
+def test_iter_chunks(local_dir, pg):
+    _write_output(local_dir, "PG", pg)
+
+    for _ in range(2):
+        chunks = list(OutputData().iter_chunks("1", "PG", hours_per_chunk=24))
+        assert [len(c) for c in chunks] == [24, 24, 2]
+        assert_frame_equal(pd.concat(chunks), pg)
+    assert os.path.isdir(local_dir / server_setup.OUTPUT_DIR / "binary" / "1_PG")
+
+    chunks = OutputData().iter_chunks("1", "PG", columns=[13])
+    assert_frame_equal(pd.concat(chunks), pg[[13]])
+
+
+def test_iter_chunks_sparse(local_dir):
+    index = pd.date_range("2016-01-01", periods=10, freq="H", name="UTC")
+    load_shed = pd.DataFrame(0.0, index=index, columns=[1, 2])
+    load_shed = load_shed.astype(pd.SparseDtype("float", 0))
+    _write_output(local_dir, "LOAD_SHED", load_shed)
+
+    chunks = list(OutputData().iter_chunks("1", "LOAD_SHED", hours_per_chunk=4))
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    assert_frame_equal(pd.concat(chunks), load_shed)
+    assert not os.path.exists(local_dir / server_setup.OUTPUT_DIR / "binary")
+
+
+def test_get_data_selection_from_pickle(local_dir, pg):
+    _write_output(local_dir, "PG", pg)
+    data = OutputData().get_data("1", "PG", columns=[14, 11], end="2016-01-01 10:00")
+    assert_frame_equal(data, pg.loc[:"2016-01-01 10:00", [14, 11]])
+
+
+def test_get_data_from_remote_chunked_store(local_dir, pg, tmp_path_factory):
+    server = tmp_path_factory.mktemp("server")
+    store = server / server_setup.OUTPUT_DIR / "chunked" / "1_PG"
+    write_chunked_store(pg, str(store), hours_per_chunk=24, columns_per_chunk=2)
+    output_data = OutputData()
+    output_data._data_access = MockDataAccess(str(server))
+
+    data = output_data.get_data("1", "PG", columns=[13], start="2016-01-02 01:00")
+    assert_frame_equal(data, pg.loc["2016-01-02 01:00":, [13]])
+    assert output_data._data_access.transferred == ["header.pkl", "1_1.npy", "2_1.npy"]
+
+    assert_frame_equal(output_data.get_data("1", "PG"), pg)
+    assert len(output_data._data_access.transferred) == 1 + 3 * 2
+    chunks = list(output_data.iter_chunks("1", "PG", hours_per_chunk=10))
+    assert_frame_equal(pd.concat(chunks), pg)
+
+    with pytest.raises(OSError):
+        output_data.get_data("1", "PF")
+    assert output_data._data_access.listed[-1] == "data/output/chunked/1_PF/header.pkl"
+    assert not os.path.exists(local_dir / server_setup.OUTPUT_DIR / "chunked" / "1_PF")
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_get_data_resample(local_dir, pg, chunked, monkeypatch):
+    pg.iloc[5, 2] = np.nan
+    _write_output(local_dir, "PG", pg)
+    if chunked:
+        filepath = local_dir / server_setup.OUTPUT_DIR / "1_PG.pkl"
+        write_chunked_store(pg, str(filepath.parent / "chunked" / "1_PG"))
+        os.remove(filepath)
+        monkeypatch.setattr(output_data, "HOURS_PER_CHUNK", 7)
+
+    start, end = "2016-01-01 03:00", "2016-01-02 20:00"
+    data = OutputData().get_data("1", "PG", [12, 13], start, end, resample="6H")
+    expected = pg.loc[start:end, [12, 13]].resample("6H").mean()
+    assert_frame_equal(data, expected)
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_get_data_sparse_field(local_dir, pg, chunked):
+    congu = pg.where(pg > 0.9, 0)
+    _write_output(local_dir, "CONGU", congu)
+    if chunked:
+        filepath = local_dir / server_setup.OUTPUT_DIR / "1_CONGU.pkl"
+        convert_to_chunked_store(str(filepath), hours_per_chunk=24)
+        os.remove(filepath)
+    expected = congu.astype(pd.SparseDtype("float", 0))
+
+    assert_frame_equal(OutputData().get_data("1", "CONGU"), expected)
+    selection = OutputData().get_data(
+        "1", "CONGU", columns=[14, 12], start="2016-01-02"
+    )
+    assert_frame_equal(selection, expected.loc["2016-01-02":, [14, 12]])
+    data = OutputData().get_data("1", "CONGU", columns=[13], resample="D")
+    assert_frame_equal(data, congu[[13]].resample("D").mean())
+
+
+def test_output_cache(local_dir, pg):
+    _write_output(local_dir, "PG", pg)
+    data = OutputData().get_data("1", "PG")
+    assert OutputData.cache_stats()["misses"] == 1
+    with pytest.raises(ValueError, match="read-only"):
+        data.iloc[0, 0] = 0
+
+    os.remove(local_dir / server_setup.OUTPUT_DIR / "1_PG.pkl")
+    cached = OutputData().get_data("1", "PG")
+    assert np.shares_memory(cached.to_numpy(), data.to_numpy())
+    selection = OutputData().get_data("1", "PG", columns=[12], resample="D")
+    assert_frame_equal(selection, pg[[12]].resample("D").mean())
+    assert OutputData.cache_stats()["hits"] == 2
+
+    OutputData.clear_cache("2")
+    assert OutputData.cache_stats()["entries"] == 1
+    OutputData.clear_cache("1")
+    assert OutputData.cache_stats()["entries"] == 0
+
+
+def test_output_cache_sparse_and_mixed(local_dir, pg):
+    congu = pg.where(pg > 0.5, 0)
+    _write_output(local_dir, "CONGU", congu)
+    storage_e = pg.assign(label="a")
+    _write_output(local_dir, "STORAGE_E", storage_e)
+
+    data = OutputData().get_data("1", "CONGU")
+    data[11].array.sp_values[:] = 2
+    data.fillna(0, inplace=True)
+    expected = congu.astype(pd.SparseDtype("float", 0))
+    assert_frame_equal(OutputData().get_data("1", "CONGU"), expected)
+
+    data = OutputData().get_data("1", "STORAGE_E")
+    data[11] = data[11].fillna(0) * 2
+    data.iloc[0, 1] = 5
+    data.loc[:, "label"] = "b"
+    assert_frame_equal(OutputData().get_data("1", "STORAGE_E"), storage_e)
+    assert OutputData.cache_stats()["hits"] == 2
+
+
+def test_construct_load_shed(monkeypatch):
+    index = pd.date_range("2016-01-01", periods=96, freq="H", name="UTC")
+    demand = pd.DataFrame(
+        np.random.default_rng(0).random((96, 2)) * 100, index=index, columns=[1, 2]
+    )
+    grid = MockGrid(
+        grid_attrs={
+            "bus": {
+                "bus_id": [11, 12, 13, 14, 15],
+                "zone_id": [1, 2, 2, 1, 2],
+                "Pd": [10.0, 5.0, 15.0, 0.0, 20.0],
+            }
+        }
+    )
+    bus = grid.bus
+    monkeypatch.setattr(
+        output_data, "get_bus_demand", lambda *args, **kw: BusDemand(bus, demand)
+    )
+    info = {
+        "start_date": "2016-01-01 00:00:00",
+        "end_date": "2016-01-04 23:00:00",
+        "interval": "24H",
+    }
+
+    load_shed = construct_load_shed(info, grid, {1: 10, 3: 25})
+    expected = BusDemand(bus, demand).to_frame() * 0
+    expected.iloc[24:48] = BusDemand(bus, demand).to_frame().iloc[24:48] * 0.1
+    expected.iloc[72:96] = BusDemand(bus, demand).to_frame().iloc[72:96] * 0.25
+    assert_frame_equal(
+        load_shed, expected.astype(pd.SparseDtype("float", 0)), check_freq=False
+    )
+    assert load_shed[14].sparse.npoints == 0
+
+    load_shed = construct_load_shed(info, grid)
+    assert load_shed.shape == (96, 5)
+    assert load_shed.sparse.density == 0
@@ -1,12 +1,15 @@
 import copy
 import os
-import pickle
 
 import pandas as pd
 
 from powersimdata.input.grid import Grid
 from powersimdata.input.input_data import InputData
 from powersimdata.input.transform_profile import TransformProfile
+from powersimdata.output.chunked_store import (
+    get_chunked_store_path,
+    write_chunked_store,
+)
 from powersimdata.output.output_data import OutputData, construct_load_shed
 from powersimdata.scenario.helpers import calculate_bus_demand
 from powersimdata.scenario.state import State
@@ -52,6 +55,7 @@ class Analyze(State):
             interconnect=[None],
             source=grid_mat_path,
             engine=self._scenario_info["engine"],
+            lazy=True,
         )
 
         if self._scenario_info["change_table"] == "Yes":
@@ -107,65 +111,108 @@ class Analyze(State):
                     )
                 )
 
-    def get_pg(self):
+    def _get_output(self, field_name, columns, start, end, resample):
+        """Loads an output table, or a part of it. The selection and the resampling
+        are passed to the storage layer such that only the relevant blocks of the
+        table are read and, if needed, transferred from the server.
+
+        :param str field_name: output field, see
+            :meth:`powersimdata.output.output_data.OutputData.get_data`.
+        :param list columns: columns to load. All if None.
+        :param str/pandas.Timestamp start: first hour to load, included.
+        :param str/pandas.Timestamp end: last hour to load, included.
+        :param str resample: frequency the data is averaged over. Not resampled if
+            None.
+        :return: (*pandas.DataFrame*) -- selection.
+        """
+        output_data = OutputData(data_loc=self.data_loc)
+        return output_data.get_data(
+            self._scenario_info["id"], field_name, columns, start, end, resample
+        )
+
+    def get_pg(self, columns=None, start=None, end=None, resample=None):
         """Returns PG data frame.
 
+        :param list columns: columns to load. All if None.
+        :param str/pandas.Timestamp start: first hour to load, included. Load from
+            the beginning if None.
+        :param str/pandas.Timestamp end: last hour to load, included. Load until
+            the end if None.
+        :param str resample: frequency the data is averaged over, e.g. *'D'*. Hourly
+            data is returned if None.
         :return: (*pandas.DataFrame*) -- data frame of power generated.
         """
-        output_data = OutputData(data_loc=self.data_loc)
-        pg = output_data.get_data(self._scenario_info["id"], "PG")
+        return self._get_output("PG", columns, start, end, resample)
 
-        return pg
-
-    def get_pf(self):
+    def get_pf(self, columns=None, start=None, end=None, resample=None):
         """Returns PF data frame.
 
+        :param list columns: columns to load. All if None.
+        :param str/pandas.Timestamp start: first hour to load, included. Load from
+            the beginning if None.
+        :param str/pandas.Timestamp end: last hour to load, included. Load until
+            the end if None.
+        :param str resample: frequency the data is averaged over, e.g. *'D'*. Hourly
+            data is returned if None.
         :return: (*pandas.DataFrame*) -- data frame of power flow.
         """
-        output_data = OutputData(data_loc=self.data_loc)
-        pf = output_data.get_data(self._scenario_info["id"], "PF")
-
-        return pf
+        return self._get_output("PF", columns, start, end, resample)
 
-    def get_dcline_pf(self):
+    def get_dcline_pf(self, columns=None, start=None, end=None, resample=None):
         """Returns PF_DCLINE data frame.
 
+        :param list columns: columns to load. All if None.
+        :param str/pandas.Timestamp start: first hour to load, included. Load from
+            the beginning if None.
+        :param str/pandas.Timestamp end: last hour to load, included. Load until
+            the end if None.
+        :param str resample: frequency the data is averaged over, e.g. *'D'*. Hourly
+            data is returned if None.
         :return: (*pandas.DataFrame*) -- data frame of power flow on DC line(s).
         """
-        output_data = OutputData(data_loc=self.data_loc)
-        dcline_pf = output_data.get_data(self._scenario_info["id"], "PF_DCLINE")
-
-        return dcline_pf
+        return self._get_output("PF_DCLINE", columns, start, end, resample)
 
-    def get_lmp(self):
+    def get_lmp(self, columns=None, start=None, end=None, resample=None):
         """Returns LMP data frame. LMP = locational marginal price
 
+        :param list columns: columns to load. All if None.
+        :param str/pandas.Timestamp start: first hour to load, included. Load from
+            the beginning if None.
+        :param str/pandas.Timestamp end: last hour to load, included. Load until
+            the end if None.
+        :param str resample: frequency the data is averaged over, e.g. *'D'*. Hourly
+            data is returned if None.
         :return: (*pandas.DataFrame*) -- data frame of nodal prices.
         """
-        output_data = OutputData(data_loc=self.data_loc)
-        lmp = output_data.get_data(self._scenario_info["id"], "LMP")
-
-        return lmp
+        return self._get_output("LMP", columns, start, end, resample)
 
-    def get_congu(self):
+    def get_congu(self, columns=None, start=None, end=None, resample=None):
         """Returns CONGU data frame. CONGU = Congestion, Upper flow limit
 
+        :param list columns: columns to load. All if None.
+        :param str/pandas.Timestamp start: first hour to load, included. Load from
+            the beginning if None.
+        :param str/pandas.Timestamp end: last hour to load, included. Load until
+            the end if None.
+        :param str resample: frequency the data is averaged over, e.g. *'D'*. Hourly
+            data is returned if None.
         :return: (*pandas.DataFrame*) -- data frame of branch flow mu (upper).
         """
-        output_data = OutputData(data_loc=self.data_loc)
-        congu = output_data.get_data(self._scenario_info["id"], "CONGU")
+        return self._get_output("CONGU", columns, start, end, resample)
 
-        return congu
-
-    def get_congl(self):
+    def get_congl(self, columns=None, start=None, end=None, resample=None):
         """Returns CONGL data frame. CONGL = Congestion, Lower flow limit
 
+        :param list columns: columns to load. All if None.
+        :param str/pandas.Timestamp start: first hour to load, included. Load from
+            the beginning if None.
+        :param str/pandas.Timestamp end: last hour to load, included. Load until
+            the end if None.
+        :param str resample: frequency the data is averaged over, e.g. *'D'*. Hourly
+            data is returned if None.
         :return: (*pandas.DataFrame*) -- data frame of branch flow mu (lower).
         """
-        output_data = OutputData(data_loc=self.data_loc)
-        congl = output_data.get_data(self._scenario_info["id"], "CONGL")
-
-        return congl
+        return self._get_output("CONGL", columns, start, end, resample)
 
     def get_averaged_cong(self):
         """Returns averaged CONGL and CONGU.
@@ -178,31 +225,42 @@ class Analyze(State):
 
         return mean_cong
 
-    def get_storage_pg(self):
+    def get_storage_pg(self, columns=None, start=None, end=None, resample=None):
         """Returns STORAGE_PG data frame.
 
+        :param list columns: columns to load. All if None.
+        :param str/pandas.Timestamp start: first hour to load, included. Load from
+            the beginning if None.
+        :param str/pandas.Timestamp end: last hour to load, included. Load until
+            the end if None.
+        :param str resample: frequency the data is averaged over, e.g. *'D'*. Hourly
+            data is returned if None.
         :return: (*pandas.DataFrame*) -- data frame of power generated by
             storage units.
         """
-        output_data = OutputData(data_loc=self.data_loc)
-        storage_pg = output_data.get_data(self._scenario_info["id"], "STORAGE_PG")
-
-        return storage_pg
+        return self._get_output("STORAGE_PG", columns, start, end, resample)
 
-    def get_storage_e(self):
+    def get_storage_e(self, columns=None, start=None, end=None, resample=None):
         """Returns STORAGE_E data frame. Energy state of charge.
 
+        :param list columns: columns to load. All if None.
+        :param str/pandas.Timestamp start: first hour to load, included. Load from
+            the beginning if None.
+        :param str/pandas.Timestamp end: last hour to load, included. Load until
+            the end if None.
+        :param str resample: frequency the data is averaged over, e.g. *'D'*. Hourly
+            data is returned if None.
         :return: (*pandas.DataFrame*) -- data frame of energy state of charge.
         """
-        output_data = OutputData(data_loc=self.data_loc)
-        storage_e = output_data.get_data(self._scenario_info["id"], "STORAGE_E")
-
-        return storage_e
+        return self._get_output("STORAGE_E", columns, start, end, resample)
 
     def get_load_shed(self):
-        """Returns LOAD_SHED data frame, either via loading or calculating.
+        """Returns LOAD_SHED data frame, either via loading or calculating. A
+        calculated data frame is saved in a sparse chunked store on the local
+        machine, see :mod:`powersimdata.output.chunked_store`.
 
-        :return: (*pandas.DataFrame*) -- data frame of load shed (hour x bus).
+        :return: (*pandas.DataFrame*) -- data frame of load shed (hour x bus),
+            with sparse columns.
         """
         scenario_id = self._scenario_info["id"]
         try:
@@ -218,8 +276,7 @@ class Analyze(State):
             filename = scenario_id + "_LOAD_SHED.pkl"
             output_dir = server_setup.OUTPUT_DIR
             filepath = os.path.join(server_setup.LOCAL_DIR, output_dir, filename)
-            with open(filepath, "wb") as f:
-                pickle.dump(load_shed, f)
+            write_chunked_store(load_shed, get_chunked_store_path(filepath))
 
         return load_shed
 
@@ -244,7 +301,7 @@ class Analyze(State):
             potentially modified one be returned.
         :return: (*pandas.DataFrame*) -- data frame of demand (hour, zone).
         """
-        profile = TransformProfile(self._scenario_info, self.get_grid(), self.get_ct())
+        profile = TransformProfile(self._scenario_info, self.grid, self.ct)
         demand = profile.get_profile("demand")
 
         if original:
@@ -270,22 +327,24 @@ class Analyze(State):
                     demand[start:end] *= 1.0 - value / 100.0
                 return demand
 
-    def get_bus_demand(self):
+    def get_bus_demand(self, lazy=False):
         """Returns demand profiles, by bus.
 
+        :param bool lazy: return a
+            :class:`powersimdata.input.bus_demand.BusDemand` object that only
+            computes the hours and buses accessed, instead of a data frame.
         :return: (*pandas.DataFrame*) -- data frame of demand (hour, bus).
         """
-        profile = TransformProfile(self._scenario_info, self.get_grid(), self.get_ct())
+        profile = TransformProfile(self._scenario_info, self.grid, self.ct)
         demand = profile.get_profile("demand")
-        grid = self.get_grid()
-        return calculate_bus_demand(grid.bus, demand)
+        return calculate_bus_demand(self.grid.bus, demand, lazy=lazy)
 
     def get_hydro(self):
         """Returns hydro profile
 
         :return: (*pandas.DataFrame*) -- data frame of hydro energy output.
         """
-        profile = TransformProfile(self._scenario_info, self.get_grid(), self.get_ct())
+        profile = TransformProfile(self._scenario_info, self.grid, self.ct)
         return profile.get_profile("hydro")
 
     def get_solar(self):
@@ -293,7 +352,7 @@ class Analyze(State):
 
         :return: (*pandas.DataFrame*) -- data frame of solar energy output.
         """
-        profile = TransformProfile(self._scenario_info, self.get_grid(), self.get_ct())
+        profile = TransformProfile(self._scenario_info, self.grid, self.ct)
         return profile.get_profile("solar")
 
     def get_wind(self):
@@ -301,5 +360,5 @@ class Analyze(State):
 
         :return: (*pandas.DataFrame*) -- data frame of wind energy output.
         """
-        profile = TransformProfile(self._scenario_info, self.get_grid(), self.get_ct())
+        profile = TransformProfile(self._scenario_info, self.grid, self.ct)
         return profile.get_profile("wind")
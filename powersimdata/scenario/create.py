@@ -148,14 +148,17 @@ class Create(State):
         """
         return self.get_profile("demand")
 
-    def get_bus_demand(self):
+    def get_bus_demand(self, lazy=False):
         """Returns demand profiles, by bus.
 
+        :param bool lazy: return a
+            :class:`powersimdata.input.bus_demand.BusDemand` object that only
+            computes the hours and buses accessed, instead of a data frame.
         :return: (*pandas.DataFrame*) -- data frame of demand (hour, bus).
         """
         demand = self.get_profile("demand")
         grid = self.get_grid()
-        return calculate_bus_demand(grid.bus, demand)
+        return calculate_bus_demand(grid.bus, demand, lazy=lazy)
 
     def get_hydro(self):
         """Returns hydro profile.
@@ -418,7 +421,8 @@ class _Builder(object):
 
         :return: (*powersimdata.input.grid.Grid*) -- a Grid object.
         """
-        return TransformGrid(self.base_grid, self.change_table.ct).get_grid()
+        grid = TransformGrid(self.base_grid, self.change_table.ct).get_grid()
+        return copy.deepcopy(grid)
 
     def __str__(self):
         return self.name
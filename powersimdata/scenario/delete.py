@@ -1,7 +1,9 @@
 import glob
 import os
 import posixpath
+import shutil
 
+from powersimdata.output.output_data import OutputData
 from powersimdata.scenario.state import State
 from powersimdata.utility import server_setup
 
@@ -50,6 +52,13 @@ class Delete(State):
         _, _, stderr = self._data_access.remove(target, recursive=False, force=True)
         if len(stderr.readlines()) != 0:
             raise IOError("Failed to delete scenario output data on server")
+        target = posixpath.join(
+            self.path_config.output_dir(), "chunked", "%s_*" % self._scenario_info["id"]
+        )
+        _, _, stderr = self._data_access.remove(target, recursive=True, force=True)
+        if len(stderr.readlines()) != 0:
+            raise IOError("Failed to delete scenario output data on server")
+        OutputData.clear_cache(self._scenario_info["id"])
 
         # Delete temporary folder enclosing simulation inputs
         print("--> Deleting temporary folder on server")
@@ -69,6 +78,29 @@ class Delete(State):
         )
         for f in local_file:
             os.remove(f)
+        # binary and chunked stores of the output tables
+        for store in ["binary", "chunked"]:
+            local_store = glob.glob(
+                os.path.join(
+                    server_setup.LOCAL_DIR,
+                    server_setup.OUTPUT_DIR,
+                    store,
+                    self._scenario_info["id"] + "_*",
+                )
+            )
+            for d in filter(os.path.isdir, local_store):
+                shutil.rmtree(d)
+        # tables cached from the grid MAT file
+        local_cache = glob.glob(
+            os.path.join(
+                server_setup.LOCAL_DIR,
+                server_setup.INPUT_DIR,
+                "cache",
+                self._scenario_info["id"] + "_*",
+            )
+        )
+        for d in filter(os.path.isdir, local_cache):
+            shutil.rmtree(d)
 
         # Delete attributes
         self._clean()
@@ -1,6 +1,9 @@
 import copy
 import os
 import posixpath
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 import numpy as np
 import requests
@@ -8,6 +11,7 @@ from scipy.io import savemat
 
 from powersimdata.input.grid import Grid
 from powersimdata.input.input_data import InputData
+from powersimdata.input.profile_store import write_csv
 from powersimdata.input.transform_grid import TransformGrid
 from powersimdata.input.transform_profile import TransformProfile
 from powersimdata.scenario.helpers import interconnect2name
@@ -130,10 +134,13 @@ class Execute(State):
         self._update_scenario_status()
         print(self._scenario_status)
 
-    def prepare_simulation_input(self, profiles_as=None):
-        """Prepares scenario for execution
+    def prepare_simulation_input(self, profiles_as=None, max_workers=None):
+        """Prepares scenario for execution. The profiles and the MPC file are
+        prepared concurrently.
 
         :param int/str/None profiles_as: if given, copy profiles from this scenario.
+        :param int max_workers: maximum number of inputs prepared at the same time.
+            One per input if None.
         :raises TypeError: if profiles_as parameter not a str or int.
         """
         if profiles_as is not None and not isinstance(profiles_as, (str, int)):
@@ -149,10 +156,8 @@ class Execute(State):
                 self._data_access, self._scenario_info, self.grid, self.ct
             )
             si.create_folder()
-            for p in ["demand", "hydro", "solar", "wind"]:
-                si.prepare_profile(p, profiles_as)
-
-            si.prepare_mpc_file()
+            si.prepare_inputs(profiles_as, max_workers)
+            si.print_timings()
 
             self._execute_list_manager.update_execute_list(
                 "prepared", self._scenario_info
@@ -303,6 +308,52 @@ class SimulationInput(object):
         self.REL_TMP_DIR = posixpath.join(
             server_setup.EXECUTE_DIR, self.scenario_folder
         )
+        self.timings = {}
+
+    @contextmanager
+    def _timer(self, task, stage):
+        """Records the time spent in a stage of the preparation of an input.
+
+        :param str task: input being prepared.
+        :param str stage: stage of the preparation.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings.setdefault(task, {})[stage] = elapsed
+
+    def prepare_inputs(self, profiles_as=None, max_workers=None):
+        """Prepares the profiles and the MPC file in a pool of threads, such that
+        transforming, writing and uploading the inputs overlap.
+
+        :param int/str/None profiles_as: if given, copy profiles from this scenario.
+        :param int max_workers: maximum number of inputs prepared at the same time.
+            One per input if None.
+        :raises Exception: the first error raised while preparing an input, once
+            all the inputs have been processed.
+        """
+        tasks = {
+            kind: (self.prepare_profile, kind, profiles_as)
+            for kind in ["demand", "hydro", "solar", "wind"]
+        }
+        tasks["mpc"] = (self.prepare_mpc_file,)
+        max_workers = len(tasks) if max_workers is None else max_workers
+
+        with self._timer("all", "total"):
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {name: executor.submit(*task) for name, task in tasks.items()}
+        errors = [f.exception() for f in futures.values() if f.exception()]
+        if len(errors) > 0:
+            raise errors[0]
+
+    def print_timings(self):
+        """Prints time spent in each stage of the preparation of the inputs."""
+        print("--> Preparation time (s)")
+        for task, stages in self.timings.items():
+            report = " | ".join("%s: %.2f" % (s, t) for s, t in stages.items())
+            print("%s: %s" % (task, report))
 
     def create_folder(self):
         """Creates folder on server that will enclose simulation inputs.
@@ -317,10 +368,26 @@ class SimulationInput(object):
     def prepare_mpc_file(self):
         """Creates MATPOWER case file."""
         print("--> Preparing MPC file")
-        print("Scaling grid")
-        grid = copy.deepcopy(self.grid)
+        with self._timer("mpc", "build"):
+            mpc = self._build_mpc()
 
+        file_name = "%s_case.mat" % self._scenario_info["id"]
+        with self._timer("mpc", "write"):
+            savemat(
+                os.path.join(server_setup.LOCAL_DIR, file_name), mpc, appendmat=False
+            )
+        with self._timer("mpc", "upload"):
+            self._data_access.move_to(
+                file_name, self.REL_TMP_DIR, change_name_to="case.mat"
+            )
+
+    def _build_mpc(self):
+        """Builds MATPOWER case. The storage case, if any, is written and uploaded.
+
+        :return: (*dict*) -- MATPOWER case.
+        """
         print("Building MPC file")
+        grid = self.grid
         mpc = {"mpc": {"version": "2", "baseMVA": 100.0}}
 
         # zone
@@ -347,7 +414,7 @@ class SimulationInput(object):
         # plant
         gen = grid.plant.copy()
         genid = gen.index.values[np.newaxis].T
-        genfuel = gen.type.values[np.newaxis].T
+        genfuel = gen.type.to_numpy()[np.newaxis].T
         genfuelcost = gen.GenFuelCost.values[np.newaxis].T
         heatratecurve = gen[["GenIOB", "GenIOC", "GenIOD"]].values
         gen.reset_index(inplace=True, drop=True)
@@ -374,7 +441,7 @@ class SimulationInput(object):
         # branch
         branch = grid.branch.copy()
         branchid = branch.index.values[np.newaxis].T
-        branchdevicetype = branch.branch_device_type.values[np.newaxis].T
+        branchdevicetype = branch.branch_device_type.to_numpy()[np.newaxis].T
         branch.reset_index(inplace=True, drop=True)
         branch.drop(
             columns=[
@@ -396,10 +463,9 @@ class SimulationInput(object):
         mpc["mpc"]["branchdevicetype"] = branchdevicetype
 
         # generation cost
-        gencost = grid.gencost.copy()
-        gencost["before"].reset_index(inplace=True, drop=True)
-        gencost["before"].drop(columns=["interconnect"], inplace=True)
-        mpc["mpc"]["gencost"] = gencost["before"].values
+        gencost = grid.gencost["before"].reset_index(drop=True)
+        gencost.drop(columns=["interconnect"], inplace=True)
+        mpc["mpc"]["gencost"] = gencost.values
 
         # DC line
         if len(grid.dcline) > 0:
@@ -435,13 +501,7 @@ class SimulationInput(object):
                 file_name, self.REL_TMP_DIR, change_name_to="case_storage.mat"
             )
 
-        # MPC file
-        file_name = "%s_case.mat" % self._scenario_info["id"]
-        savemat(os.path.join(server_setup.LOCAL_DIR, file_name), mpc, appendmat=False)
-
-        self._data_access.move_to(
-            file_name, self.REL_TMP_DIR, change_name_to="case.mat"
-        )
+        return mpc
 
     def prepare_profile(self, kind, profile_as=None):
         """Prepares profile for simulation.
@@ -458,7 +518,8 @@ class SimulationInput(object):
             if bool(profile.scale_keys[kind] & (new_plant_types | set(self.ct.keys()))):
                 self._prepare_transformed_profile(kind, profile)
             else:
-                self._create_link_to_base_profile(kind)
+                with self._timer(kind, "link"):
+                    self._create_link_to_base_profile(kind)
         else:
             from_dir = posixpath.join(
                 self.server_config.execute_dir(),
@@ -467,8 +528,10 @@ class SimulationInput(object):
             to_dir = posixpath.join(
                 self.server_config.execute_dir(), self.scenario_folder
             )
-            _, _, stderr = self._data_access.copy(f"{from_dir}/{kind}.csv", to_dir)
-            if len(stderr.readlines()) != 0:
+            with self._timer(kind, "copy"):
+                _, _, stderr = self._data_access.copy(f"{from_dir}/{kind}.csv", to_dir)
+                stderr = stderr.readlines()
+            if len(stderr) != 0:
                 raise IOError(f"Failed to copy {kind}.csv on server")
 
     def _create_link_to_base_profile(self, kind):
@@ -493,20 +556,17 @@ class SimulationInput(object):
             raise IOError("Failed to create link to %s profile." % kind)
 
     def _prepare_transformed_profile(self, kind, profile):
-        """Loads, scales and writes on local machine a base profile.
+        """Loads and scales a base profile, then streams it to the temporary folder
+        on server.
 
         :param powersimdata.input.transform_profile.TransformProfile profile: a
             TransformProfile object.
         :param str kind: one of *'hydro'*, *'solar'*, *'wind'* or *'demand'*.
         """
-        profile = profile.get_profile(kind)
+        with self._timer(kind, "transform"):
+            profile = profile.get_profile(kind)
 
-        print(
-            f"Writing scaled {kind} profile in {server_setup.LOCAL_DIR} on local machine"
-        )
-        file_name = "%s_%s.csv" % (self._scenario_info["id"], kind)
-        profile.to_csv(os.path.join(server_setup.LOCAL_DIR, file_name))
-
-        self._data_access.move_to(
-            file_name, self.REL_TMP_DIR, change_name_to=f"{kind}.csv"
-        )
+        print(f"Writing scaled {kind} profile on server")
+        with self._timer(kind, "write"):
+            with self._data_access.open_to(self.REL_TMP_DIR, f"{kind}.csv") as f:
+                write_csv(profile, f)
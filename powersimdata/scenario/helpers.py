@@ -1,5 +1,4 @@
-import numpy as np
-import pandas as pd
+from powersimdata.input.bus_demand import BusDemand
 
 
 def check_interconnect(interconnect):
@@ -48,23 +47,16 @@ def interconnect2name(interconnect):
         return "usa"
 
 
-def calculate_bus_demand(bus, demand):
-    """Calculates bus-level demand from zone-level demand.
+def calculate_bus_demand(bus, demand, lazy=False):
+    """Calculates bus-level demand from zone-level demand. Buses in a zone whose
+    total Pd is zero get no demand.
 
     :param pandas.DataFrame bus: bus data frame.
     :param pandas.DataFrame demand: demand data frame.
+    :param bool lazy: return a :class:`powersimdata.input.bus_demand.BusDemand`
+        object computing values when accessed instead of a data frame.
     :return: (*pandas.DataFrame*) -- dataframe of (hour, bus) demand.
+    :raises ValueError: if zones of buses are missing from the demand profile.
     """
-    zone_demand = bus.groupby("zone_id").sum().Pd
-    bus_zone_share = bus.apply(lambda x: x.Pd / zone_demand.loc[x.zone_id], axis=1)
-    bus_to_zone = np.zeros((len(zone_demand), len(bus)))
-    bus_idx_lookup = {b: i for i, b in enumerate(bus.index)}
-    zone_idx_lookup = {z: i for i, z in enumerate(zone_demand.index)}
-    for b in bus.index:
-        bus_idx = bus_idx_lookup[b]
-        zone_idx = zone_idx_lookup[bus.loc[b, "zone_id"]]
-        bus_to_zone[zone_idx, bus_idx] = bus_zone_share.loc[b]
-    bus_demand = pd.DataFrame(
-        (demand.to_numpy() @ bus_to_zone), index=demand.index, columns=bus.index
-    )
-    return bus_demand
+    bus_demand = BusDemand(bus, demand)
+    return bus_demand if lazy else bus_demand.to_frame()
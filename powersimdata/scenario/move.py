@@ -1,5 +1,6 @@
 import posixpath
 
+from powersimdata.output.output_data import OutputData
 from powersimdata.scenario.helpers import interconnect2name
 from powersimdata.scenario.state import State
 from powersimdata.utility import server_setup
@@ -39,6 +40,7 @@ class Move(State):
         backup.copy_base_profile()
         backup.move_output_data()
         backup.move_temporary_folder()
+        OutputData.clear_cache(self._scenario_info["id"])
 
         self._execute_list_manager.update_execute_list("moved", self._scenario_info)
 
@@ -103,6 +105,15 @@ class BackUpDisk(object):
         self._data_access.copy(source, target, update=True)
         self._data_access.remove(source, recursive=True, force=True)
 
+        source = posixpath.join(
+            self.server_config.output_dir(),
+            "chunked",
+            self._scenario_info["id"] + "_*",
+        )
+        target = posixpath.join(self.backup_config.output_dir(), "chunked", "")
+        self._data_access.copy(source, target, recursive=True, update=True)
+        self._data_access.remove(source, recursive=True, force=True)
+
     def move_temporary_folder(self):
         """Moves temporary folder."""
         print("--> Moving temporary folder to backup disk")
@@ -0,0 +1,45 @@
+import os
+
+from powersimdata.data_access.data_access import LocalDataAccess
+from powersimdata.scenario.delete import Delete
+from powersimdata.utility import server_setup
+
+
+class MockListManager:
+    def delete_entry(self, scenario_info):
+        pass
+
+
+class MockScenario:
+    def __init__(self, root):
+        self.data_access = LocalDataAccess(root=root)
+
+
+def test_delete_scenario_removes_local_files(tmp_path, monkeypatch):
+    local_dir = tmp_path / "local"
+    monkeypatch.setattr(server_setup, "LOCAL_DIR", str(local_dir))
+    monkeypatch.setattr(server_setup, "DATA_ROOT_DIR", str(tmp_path / "data"))
+    input_dir = local_dir / server_setup.INPUT_DIR
+    output_dir = local_dir / server_setup.OUTPUT_DIR
+    paths = {
+        "grid": input_dir / "1_grid.mat",
+        "cache": input_dir / "cache" / "1_grid" / "FromREISE" / "bus.pkl",
+        "store": output_dir / "chunked" / "1_PG" / "header.pkl",
+        "file": output_dir / "binary" / "1_notes.txt",
+        "other": input_dir / "cache" / "2_grid" / "FromREISE" / "bus.pkl",
+    }
+    for path in paths.values():
+        os.makedirs(path.parent, exist_ok=True)
+        path.write_bytes(b"")
+
+    state = Delete(MockScenario(str(tmp_path / "data")))
+    state._scenario_list_manager = MockListManager()
+    state._execute_list_manager = MockListManager()
+    state._scenario_info = {"id": "1"}
+    state.delete_scenario()
+
+    assert not paths["grid"].exists()
+    assert not (input_dir / "cache" / "1_grid").exists()
+    assert not (output_dir / "chunked" / "1_PG").exists()
+    assert paths["file"].exists()
+    assert paths["other"].exists()
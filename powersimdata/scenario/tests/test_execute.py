@@ -0,0 +1,120 @@
+import os
+import posixpath
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from powersimdata.data_access.data_access import LocalDataAccess
+from powersimdata.input import transform_profile
+from powersimdata.input.grid import Grid
+from powersimdata.scenario import execute
+from powersimdata.scenario.execute import SimulationInput
+from powersimdata.utility import server_setup
+
+
+@pytest.fixture
+def simulation_input(tmp_path, monkeypatch):
+    monkeypatch.setattr(server_setup, "LOCAL_DIR", str(tmp_path / "local"))
+    os.makedirs(server_setup.LOCAL_DIR)
+    data_access = LocalDataAccess(root=str(tmp_path / "data"))
+    info = {"id": "1", "interconnect": "Texas"}
+    info.update({"base_%s" % k: "vTest" for k in ["demand", "hydro", "solar", "wind"]})
+    monkeypatch.setattr(server_setup, "DATA_ROOT_DIR", data_access.root)
+    si = SimulationInput(data_access, info, Grid(["Texas"]), {})
+    si.create_folder()
+    return si
+
+
+def test_prepare_inputs(simulation_input):
+    si = simulation_input
+    si.prepare_inputs()
+
+    files = sorted(os.listdir(si.TMP_DIR))
+    assert files == ["case.mat", "demand.csv", "hydro.csv", "solar.csv", "wind.csv"]
+    assert os.listdir(server_setup.LOCAL_DIR) == []
+    assert os.readlink(os.path.join(si.TMP_DIR, "wind.csv")).endswith(
+        "texas_wind_vTest.csv"
+    )
+    assert si.timings.keys() == {"demand", "hydro", "solar", "wind", "mpc", "all"}
+    assert si.timings["mpc"].keys() == {"build", "write", "upload"}
+    assert si.timings["wind"].keys() == {"link"}
+
+
+def test_prepare_inputs_raises_after_all_inputs(simulation_input, monkeypatch):
+    si = simulation_input
+
+    def prepare_profile(kind, profile_as=None):
+        raise IOError("Failed to copy %s.csv on server" % kind)
+
+    monkeypatch.setattr(si, "prepare_profile", prepare_profile)
+    with pytest.raises(IOError, match="Failed to copy"):
+        si.prepare_inputs(max_workers=2)
+    assert os.listdir(si.TMP_DIR) == ["case.mat"]
+
+
+def test_prepare_transformed_profile(simulation_input, monkeypatch):
+    si = simulation_input
+    wind = si.grid.plant.query("type == 'wind'")
+    profile = pd.DataFrame(
+        np.ones((24, len(wind))),
+        index=pd.date_range("2016-01-01", periods=24, freq="H", name="UTC"),
+        columns=wind.index,
+    )
+
+    class MockInputData:
+        def get_data(self, scenario_info, field_name):
+            return profile
+
+    opened = []
+    open_to = si._data_access.open_to
+
+    def record_open_to(to_dir, file_name):
+        opened.append(posixpath.join(to_dir, file_name))
+        return open_to(to_dir, file_name)
+
+    monkeypatch.setattr(transform_profile, "InputData", MockInputData)
+    monkeypatch.setattr(si._data_access, "open_to", record_open_to)
+    si.ct = {"wind": {"plant_id": {wind.index[0]: 2}}}
+    si.prepare_profile("wind")
+    assert opened == [posixpath.join(si.REL_TMP_DIR, "wind.csv")]
+
+    written = pd.read_csv(
+        os.path.join(si.TMP_DIR, "wind.csv"), index_col=0, parse_dates=True
+    )
+    assert written.iloc[:, 0].tolist() == [2.0] * 24
+    assert (written.iloc[:, 1:] == 1).all().all()
+    assert "1_wind.csv" not in os.listdir(server_setup.LOCAL_DIR)
+    assert si.timings["wind"].keys() == {"transform", "write"}
+
+
+def test_prepare_inputs_leaves_no_local_csv(simulation_input, monkeypatch):
+    si = simulation_input
+    solar = si.grid.plant.query("type == 'solar'")
+    profile = pd.DataFrame(
+        np.ones((24, len(solar))),
+        index=pd.date_range("2016-01-01", periods=24, freq="H", name="UTC"),
+        columns=solar.index,
+    )
+
+    class MockInputData:
+        def get_data(self, scenario_info, field_name):
+            return profile
+
+    monkeypatch.setattr(transform_profile, "InputData", MockInputData)
+    si.ct = {"solar": {"plant_id": {solar.index[0]: 3}}}
+    si.prepare_inputs()
+    assert "solar.csv" in os.listdir(si.TMP_DIR)
+    assert not any(f.endswith(".csv") for f in os.listdir(server_setup.LOCAL_DIR))
+
+    def write_csv(profile, f):
+        f.write(b"UTC,")
+        raise IOError("Connection lost")
+
+    os.remove(os.path.join(si.TMP_DIR, "solar.csv"))
+    monkeypatch.setattr(execute, "write_csv", write_csv)
+    with pytest.raises(IOError, match="Connection lost"):
+        si.prepare_profile("solar")
+    assert "solar.csv" not in os.listdir(si.TMP_DIR)
+    assert "solar.csv.tmp" not in os.listdir(si.TMP_DIR)
+    assert not any(f.endswith(".csv") for f in os.listdir(server_setup.LOCAL_DIR))
@@ -1,7 +1,13 @@
 import copy
+import hashlib
 import importlib
 import os
 import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
 
 
 class CommandBuilder:
@@ -49,13 +55,29 @@ class CommandBuilder:
 
 
 class MemoryCache:
-    """Wrapper around a dict object that exposes a cache interface. Users should
-    create a separate instance for each distinct use case.
+    """Wrapper around a dict object that exposes a cache interface. Entries are
+    evicted in least recently used order as soon as the number of entries or their
+    estimated size exceeds the limits. Users should create a separate instance for
+    each distinct use case. Instances can be shared between threads.
+
+    :param int max_entries: maximum number of entries. Unbounded if None.
+    :param int max_bytes: maximum estimated size of all entries, in bytes.
+        Unbounded if None.
+    :param bool copy: whether a deep copy of the cached value is returned. If
+        False, the cached value itself is returned and callers must not modify it.
     """
 
-    def __init__(self):
+    def __init__(self, max_entries=None, max_bytes=None, copy=True):
         """Constructor"""
-        self._cache = {}
+        self._cache = OrderedDict()
+        self._size = {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.copy = copy
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def put(self, key, obj):
         """Add or set the value for the given key.
@@ -63,7 +85,12 @@ class MemoryCache:
         :param tuple key: a tuple used to lookup the cached value
         :param Any obj: the object to cache
         """
-        self._cache[key] = obj
+        size = estimate_size(obj)
+        with self._lock:
+            self._cache[key] = obj
+            self._cache.move_to_end(key)
+            self._size[key] = size
+            self._evict()
 
     def get(self, key):
         """Retrieve the value associated with key if it exists.
@@ -71,18 +98,206 @@ class MemoryCache:
         :param tuple key: the cache key
         :return: (*Any* or *NoneType*) -- the cached value if found, or None
         """
-        if key in self._cache.keys():
-            return copy.deepcopy(self._cache[key])
+        with self._lock:
+            if key not in self._cache.keys():
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._cache.move_to_end(key)
+            obj = self._cache[key]
+        return copy.deepcopy(obj) if self.copy else obj
 
     def list_keys(self):
         """Return and print the current cache keys.
 
         :return: (*list*) -- the list of cache keys
         """
-        keys = list(self._cache.keys())
+        with self._lock:
+            keys = list(self._cache.keys())
         print(keys)
         return keys
 
+    def memory_usage(self):
+        """Return the estimated size of each cached value.
+
+        :return: (*dict*) -- keys are the cache keys and values the estimated sizes
+            in bytes, from least to most recently used.
+        """
+        with self._lock:
+            return {key: self._size[key] for key in self._cache}
+
+    def stats(self):
+        """Return usage statistics.
+
+        :return: (*dict*) -- number of hits, misses, evictions and entries along
+            with the estimated size of the cache in bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._cache),
+                "bytes": sum(self._size.values()),
+            }
+
+    def resize(self, max_entries=None, max_bytes=None):
+        """Set new limits and evict entries accordingly.
+
+        :param int max_entries: maximum number of entries. Unbounded if None.
+        :param int max_bytes: maximum estimated size of all entries, in bytes.
+            Unbounded if None.
+        """
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self, key=None):
+        """Remove one or all entries.
+
+        :param tuple key: the cache key to remove. All entries are removed if None.
+        """
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+                self._size.clear()
+            elif key in self._cache:
+                del self._cache[key]
+                del self._size[key]
+
+    def _evict(self):
+        """Remove least recently used entries until limits are satisfied."""
+        while self._cache and (
+            (self.max_entries is not None and len(self._cache) > self.max_entries)
+            or (
+                self.max_bytes is not None and sum(self._size.values()) > self.max_bytes
+            )
+        ):
+            key, _ = self._cache.popitem(last=False)
+            del self._size[key]
+            self.evictions += 1
+
+
+def estimate_size(obj, _seen=None):
+    """Estimates the memory footprint of an object, following data frames, arrays,
+    containers and instance attributes. Objects referenced several times are
+    counted once and the size of strings stored in data frames is extrapolated
+    from a sample.
+
+    :param Any obj: object.
+    :return: (*int*) -- estimated size in bytes.
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        size = obj.memory_usage(index=True, deep=False)
+        size = int(size.sum()) if isinstance(obj, pd.DataFrame) else int(size)
+        columns = obj.to_frame() if isinstance(obj, pd.Series) else obj
+        for _, column in columns.select_dtypes(include="object").items():
+            size += _estimate_object_size(column.to_numpy())
+        return size
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            estimate_size(k, seen) + estimate_size(v, seen) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set)):
+        return sys.getsizeof(obj) + sum(estimate_size(v, seen) for v in obj)
+    if hasattr(obj, "__dict__"):
+        return sys.getsizeof(obj) + estimate_size(vars(obj), seen)
+    return sys.getsizeof(obj)
+
+
+def _estimate_object_size(values, n_sample=1000):
+    """Estimates the size of the python objects referenced by an array.
+
+    :param numpy.ndarray values: array of python objects.
+    :param int n_sample: number of objects to measure.
+    :return: (*int*) -- estimated size in bytes.
+    """
+    if len(values) == 0:
+        return 0
+    sample = values[:: max(1, len(values) // n_sample)]
+    return int(np.mean([sys.getsizeof(v) for v in sample]) * len(values))
+
+
+def hash_data_frame(data_frame):
+    """Computes a content hash of a data frame or series, from its column names,
+    index and values.
+
+    :param pandas.DataFrame/pandas.Series data_frame: data frame.
+    :return: (*str*) -- hexadecimal digest.
+    """
+    digest = hashlib.sha1(type(data_frame).__name__.encode())
+    if isinstance(data_frame, pd.DataFrame):
+        digest.update(hash_object([str(c) for c in data_frame.columns]).encode())
+    digest.update(hash_object(list(data_frame.index.names)).encode())
+    digest.update(str(len(data_frame)).encode())
+    values = pd.util.hash_pandas_object(data_frame, index=True)
+    digest.update(values.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def hash_object(obj):
+    """Computes a stable content hash of an object made of nested dicts, lists,
+    tuples and sets of scalars, arrays and data frames, e.g. a change table. Dicts
+    and sets are hashed regardless of their order and numbers regardless of their
+    type, i.e. 2 and 2.0 have the same hash.
+
+    :param Any obj: object to hash.
+    :return: (*str*) -- hexadecimal digest.
+    :raises TypeError: if the object, or one of its elements, has an unsupported
+        type.
+    """
+    digest = hashlib.sha1()
+    _update_digest(digest, obj)
+    return digest.hexdigest()
+
+
+def _update_digest(digest, obj):
+    """Feeds a canonical representation of an object to a hash.
+
+    :param hashlib._Hash digest: hash object.
+    :param Any obj: object to hash.
+    :raises TypeError: if the object has an unsupported type.
+    """
+    if obj is None:
+        digest.update(b"N")
+    elif isinstance(obj, (bool, np.bool_)):
+        digest.update(b"b%d" % bool(obj))
+    elif isinstance(obj, (int, np.integer)):
+        digest.update(b"n%d" % int(obj))
+    elif isinstance(obj, (float, np.floating)):
+        if float(obj).is_integer():
+            digest.update(b"n%d" % int(obj))
+        else:
+            digest.update(b"n" + repr(float(obj)).encode())
+    elif isinstance(obj, str):
+        data = obj.encode()
+        digest.update(b"s%d:" % len(data) + data)
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        digest.update(b"p" + hash_data_frame(obj).encode())
+    elif isinstance(obj, np.ndarray):
+        digest.update(b"a" + hash_data_frame(pd.Series(obj.ravel())).encode())
+        digest.update(str(obj.shape).encode())
+    elif isinstance(obj, dict):
+        items = sorted((hash_object(k), hash_object(v)) for k, v in obj.items())
+        digest.update(b"d%d:" % len(items) + "".join(k + v for k, v in items).encode())
+    elif isinstance(obj, (set, frozenset)):
+        elements = sorted(hash_object(e) for e in obj)
+        digest.update(b"S%d:" % len(elements) + "".join(elements).encode())
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b"l%d:" % len(obj))
+        for element in obj:
+            _update_digest(digest, element)
+    else:
+        raise TypeError(f"unsupported type for hashing = {type(obj)}")
+
 
 def cache_key(*args):
     """Creates a cache key from the given args. The user should ensure that the
@@ -120,6 +335,10 @@ class CacheKeyBuilder:
             return arg
         if isinstance(arg, (list, set, tuple)):
             return tuple(self._build(a) for a in arg)
+        if isinstance(arg, dict):
+            return ("dict", hash_object(arg))
+        if hasattr(arg, "fingerprint"):
+            return (type(arg).__name__, arg.fingerprint())
         raise ValueError(f"unsupported type for cache key = {type(arg)}")
 
 
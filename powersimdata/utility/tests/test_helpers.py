@@ -1,3 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
 import pytest
 
 from powersimdata.utility.helpers import (
@@ -5,6 +9,9 @@ from powersimdata.utility.helpers import (
     MemoryCache,
     PrintManager,
     cache_key,
+    estimate_size,
+    hash_data_frame,
+    hash_object,
 )
 
 
@@ -52,6 +59,32 @@ def test_cache_key_distinct_types():
     assert cache_key(4) != cache_key("4")
 
 
+def test_cache_key_dict():
+    assert cache_key({"a": 1, "b": [2]}) == cache_key({"b": [2], "a": 1})
+    assert cache_key({"a": 1}) != cache_key({"a": 2})
+
+
+def test_hash_object():
+    ct = {"solar": {"zone_id": {301: 1.5, 302: 2}}, "storage": [{"bus_id": 1}]}
+    same = {"storage": [{"bus_id": 1}], "solar": {"zone_id": {302: 2.0, 301: 1.5}}}
+    assert hash_object(ct) == hash_object(same)
+    assert hash_object(ct) != hash_object({"solar": {"zone_id": {301: 1.5}}})
+    assert hash_object([1, 2]) != hash_object([2, 1])
+    assert hash_object("1") != hash_object(1)
+    assert hash_object(True) != hash_object(1)
+    with pytest.raises(TypeError):
+        hash_object(object())
+
+
+def test_hash_data_frame():
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}, index=[10, 20])
+    assert hash_data_frame(df) == hash_data_frame(df.copy())
+    assert hash_data_frame(df) == hash_data_frame(df.astype({"b": "category"}))
+    assert hash_data_frame(df) != hash_data_frame(df.rename(columns={"a": "c"}))
+    assert hash_data_frame(df) != hash_data_frame(df.set_axis([10, 30]))
+    assert hash_data_frame(df) != hash_data_frame(df.assign(a=[1, 3]))
+
+
 def test_mem_cache_put_dict():
     cache = MemoryCache()
     key = cache_key(["foo", "bar"], 4, "other")
@@ -68,6 +101,73 @@ def test_mem_cache_get_returns_copy():
     assert id(cache.get(key)) != id(obj)
 
 
+def test_mem_cache_get_without_copy():
+    cache = MemoryCache(copy=False)
+    obj = {"key1": 42}
+    cache.put("foo", obj)
+    assert cache.get("foo") is obj
+
+
+def test_mem_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert list(cache.memory_usage()) == ["a", "c"]
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_mem_cache_evicts_by_size():
+    df = pd.DataFrame({"x": np.arange(1000, dtype=float)})
+    cache = MemoryCache(max_bytes=int(1.5 * estimate_size(df)))
+    cache.put("a", df)
+    cache.put("b", df.copy())
+    assert cache.list_keys() == ["b"]
+    cache.resize(max_bytes=1)
+    assert cache.list_keys() == []
+    assert cache.stats()["evictions"] == 2
+
+
+def test_mem_cache_stats_and_clear():
+    cache = MemoryCache()
+    cache.put("a", {"df": pd.DataFrame({"x": ["foo", "bar"]})})
+    cache.put("b", [1, 2, 3])
+    cache.get("a")
+    cache.get("c")
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 2
+    assert stats["bytes"] == sum(cache.memory_usage().values())
+    cache.clear("a")
+    assert cache.list_keys() == ["b"]
+    cache.clear()
+    assert cache.stats()["bytes"] == 0
+
+
+def test_mem_cache_shared_between_threads():
+    cache = MemoryCache(max_entries=5, copy=False)
+
+    def use_cache(i):
+        cache.put(i % 10, [i])
+        cache.get((i + 1) % 10)
+        cache.stats()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(use_cache, range(2000)))
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 2000
+    assert stats["entries"] == 5
+    assert len(cache.memory_usage()) == 5
+
+
+def test_estimate_size_counts_shared_objects_once():
+    df = pd.DataFrame({"x": np.arange(1000, dtype=float)})
+    assert estimate_size([df, df]) < 2 * estimate_size(df)
+
+
 def test_copy_command():
     expected = r"\cp -p source dest"
     command = CommandBuilder.copy("source", "dest")